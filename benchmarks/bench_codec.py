@@ -0,0 +1,69 @@
+"""Compare memory record codecs on mixed Chinese/English chat records.
+
+Usage: PYTHONPATH=src python benchmarks/bench_codec.py [records]
+"""
+from __future__ import annotations
+
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from memory import codec as codec_module
+from memory.codec import JsonCodec, OrjsonCodec
+from memory.jsonl_store import JsonlMemoryStore
+
+_USER = ["明天首尔的天气怎么样？", "帮我把这段话翻译成英文：我们下周一开会。", "What's 17% of 2,340?", "总结一下上面的讨论"]
+_ASSISTANT = [
+    "明天首尔晴，最高气温 18°C，早晚偏凉，建议带一件外套。",
+    "Translation: \"We have a meeting next Monday.\" 需要更正式的语气吗？",
+    "17% of 2,340 is 397.8.",
+    "讨论要点：1) 发布时间推迟到周五；2) 由 Alice 负责回归测试；3) 文档需要补充 API 示例。",
+]
+
+
+def _records(count: int) -> list[dict]:
+    records = []
+    for i in range(count):
+        if i % 2 == 0:
+            records.append({"role": "user", "name": "user", "content": _USER[i // 2 % len(_USER)]})
+        else:
+            records.append({
+                "role": "assistant",
+                "name": "tilo",
+                "content": _ASSISTANT[i // 2 % len(_ASSISTANT)] * 3,
+                "metadata": {"tool_calls": [], "latency_ms": 812 + i % 97},
+            })
+    return records
+
+
+def _best_of(fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(count: int) -> None:
+    records = _records(count)
+    codecs = [JsonCodec()] + ([OrjsonCodec()] if codec_module.orjson is not None else [])
+    print(f"{count} records, {len(json.dumps(records, ensure_ascii=False).encode()) / 1e6:.1f} MB as JSON")
+    print(f"{'codec':>8} {'encode s':>9} {'decode/line s':>14} {'decode batch s':>15} {'store.load s':>13}")
+    for codec in codecs:
+        data = b"\n".join(codec.encode(record) for record in records) + b"\n"
+        encode = _best_of(lambda: [codec.encode(record) for record in records])
+        per_line = _best_of(lambda: [codec.decode(line) for line in data.splitlines() if line.strip()])
+        batch = _best_of(lambda: codec.decode_lines(data))
+        with tempfile.TemporaryDirectory() as tmp:
+            store = JsonlMemoryStore(Path(tmp), codec=codec)
+            store.append_many("s", records)
+            load = _best_of(lambda: store.load("s"))
+            assert store.load("s") == records
+        print(f"{codec.name:>8} {encode:>9.3f} {per_line:>14.3f} {batch:>15.3f} {load:>13.3f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
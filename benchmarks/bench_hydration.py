@@ -0,0 +1,68 @@
+"""Compare per-record and bulk memory hydration.
+
+Usage: PYTHONPATH=src python benchmarks/bench_hydration.py [sizes...]
+
+Without arguments, both paths run at 1k and 10k records and the bulk path
+alone at 100k: the per-record path is quadratic (each add scans memory for
+duplicates) and takes many minutes there. Sizes given explicitly run both.
+"""
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+from typing import Sequence
+
+from agentscope.memory import InMemoryMemory
+
+from agent.core import _add_history, _append_memory_entry, _history_entry_to_msg
+
+
+def _records(count: int) -> list[dict[str, str]]:
+    return [
+        {"role": "user" if i % 2 == 0 else "assistant", "content": f"message {i} " + "x" * 80}
+        for i in range(count)
+    ]
+
+
+async def _per_record(records: list[dict[str, str]]) -> int:
+    memory = InMemoryMemory()
+    for record in records:
+        await _append_memory_entry(memory, _history_entry_to_msg(record))
+    return await memory.size()
+
+
+async def _bulk(records: list[dict[str, str]]) -> int:
+    memory = InMemoryMemory()
+    await _add_history(memory, records)
+    return await memory.size()
+
+
+def _best_of(fn, records: list[dict[str, str]], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        size = asyncio.run(fn(records))
+        best = min(best, time.perf_counter() - start)
+        assert size == len(records)
+    return best
+
+
+def main(sizes: Sequence[int], bulk_only: Sequence[int] = ()) -> None:
+    print(f"{'records':>8} {'per-record s':>13} {'bulk s':>9} {'speedup':>8}")
+    for size in sizes:
+        records = _records(size)
+        repeat = 3 if size <= 10_000 else 1
+        slow = _best_of(_per_record, records, repeat)
+        fast = _best_of(_bulk, records, repeat)
+        print(f"{size:>8} {slow:>13.3f} {fast:>9.3f} {slow / fast:>7.1f}x")
+    for size in bulk_only:
+        fast = _best_of(_bulk, _records(size), 1)
+        print(f"{size:>8} {'-':>13} {fast:>9.3f} {'-':>8}")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:]:
+        main([int(arg) for arg in sys.argv[1:]])
+    else:
+        main([1_000, 10_000], bulk_only=[100_000])
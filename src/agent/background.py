@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Coroutine, TypeVar
+
+T = TypeVar("T")
+
+
+class BackgroundLoop:
+    """Event loop on a daemon thread for work that must outlive the caller's loop.
+
+    ``asyncio.run`` cancels every task still pending when its coroutine returns,
+    so background work scheduled on a per-call loop (``asyncio.run(run_once(...))``)
+    would die with the turn. Coroutines submitted here keep running until the
+    process exits. The thread starts on the first ``submit``.
+    """
+
+    def __init__(self, name: str = "tilo-background") -> None:
+        self._name = name
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def started(self) -> bool:
+        return self._loop is not None
+
+    def _running_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name=self._name, daemon=True).start()
+                self._loop = loop
+            return self._loop
+
+    def submit(self, coro: Coroutine[Any, Any, T]) -> Future[T]:
+        """Schedule ``coro`` on the background loop; thread-safe."""
+        return asyncio.run_coroutine_threadsafe(coro, self._running_loop())
+
+    async def run(self, coro: Coroutine[Any, Any, T]) -> T:
+        """Run ``coro`` on the background loop and await its result from the caller's loop."""
+        return await asyncio.wrap_future(self.submit(coro))
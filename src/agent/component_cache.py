@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Hashable, Mapping, Sequence
+
+from agentscope.tool import Toolkit
+
+from agent.prompt_files import FileStamp, file_stamp
+from skills.loader import SKILLS_DIR
+
+MODEL_ENV_KEYS = (
+    "AGENTSCOPE_MODEL",
+    "AGENTSCOPE_MODEL_NAME",
+    "AGENTSCOPE_API_KEY",
+    "AGENTSCOPE_BASE_URL",
+)
+
+def components_fingerprint(skill_dirs: Sequence[Path]) -> tuple[FileStamp, ...]:
+    """Cheap stat-only fingerprint of every file that feeds the built components.
+
+    Workspace prompt files are not part of it: the system prompt is composed
+    per turn through ``PromptCache``, so editing them never rebuilds the toolkit.
+    """
+    stamps = [file_stamp(SKILLS_DIR)]
+    stamps.extend(file_stamp(Path(skill_dir) / "SKILL.md") for skill_dir in skill_dirs)
+    return tuple(stamps)
+
+
+def components_key(
+    enabled_skills: Sequence[str] | None,
+    env: Mapping[str, str] | None = None,
+) -> Hashable:
+    """Key on what the components are built from; per-user state (the workspace) stays out."""
+    env = os.environ if env is None else env
+    skills_key = None if enabled_skills is None else tuple(enabled_skills)
+    model_env = tuple(env.get(name, "") for name in MODEL_ENV_KEYS)
+    return (skills_key, model_env)
+
+
+def clone_toolkit(prototype: Toolkit, target: Toolkit | None = None) -> Toolkit:
+    """Return a toolkit sharing the prototype's registrations but not its containers.
+
+    Per-turn registrations (MCP clients, structured-output helpers) land on the
+    clone, so the cached prototype is never mutated. When ``target`` already
+    holds registrations (e.g. MCP tools connected concurrently), those take
+    precedence over same-named prototype entries.
+    """
+    toolkit = Toolkit() if target is None else target
+    toolkit.tools = {**prototype.tools, **toolkit.tools}
+    toolkit.groups = {**prototype.groups, **toolkit.groups}
+    toolkit.skills = {**prototype.skills, **toolkit.skills}
+    toolkit._middlewares = [*prototype._middlewares, *toolkit._middlewares]
+    return toolkit
+
+
+@dataclass
+class AgentComponents:
+    """Reusable, read-only pieces of an agent built for one component key.
+
+    ``toolkit`` is a prototype and must be cloned before use. ``tool_list_text``
+    is the tool section of the system prompt. Models are kept per event loop
+    because provider clients hold loop-bound connection pools.
+    """
+
+    toolkit: Toolkit
+    tool_list_text: str
+    skill_dirs: list[Path]
+    model_factory: Callable[[], Any]
+    _models: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any] = field(
+        default_factory=weakref.WeakKeyDictionary
+    )
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def model(self, loop: asyncio.AbstractEventLoop | None = None) -> Any:
+        if loop is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return self.model_factory()
+        with self._lock:
+            model = self._models.get(loop)
+            if model is None:
+                model = self.model_factory()
+                self._models[loop] = model
+            return model
+
+
+@dataclass
+class _CacheEntry:
+    fingerprint: tuple[FileStamp, ...]
+    components: AgentComponents
+
+
+class ComponentCache:
+    """Bounded LRU of built agent components, invalidated by skill file fingerprints."""
+
+    def __init__(self, max_entries: int = 32) -> None:
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, _CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        key: Hashable,
+        build: Callable[[], AgentComponents],
+    ) -> AgentComponents:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                current = components_fingerprint(entry.components.skill_dirs)
+                if current == entry.fingerprint:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry.components
+            self.misses += 1
+            components = build()
+            fingerprint = components_fingerprint(components.skill_dirs)
+            self._entries[key] = _CacheEntry(fingerprint=fingerprint, components=components)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return components
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,22 +1,44 @@
 from __future__ import annotations
 
 import asyncio
+import atexit
 import inspect
 import json
-from typing import Any, AsyncGenerator, Callable, Mapping
+import threading
+from copy import deepcopy
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, AsyncGenerator, Awaitable, Callable, Iterable, Literal, Mapping, Sequence, overload
 
 from agentscope.agent import ReActAgent
 from agentscope.formatter import OpenAIChatFormatter
 from agentscope.message import Msg
-from agentscope.memory import InMemoryMemory
+from agentscope.memory import InMemoryMemory, MemoryBase
 from agentscope.tool import ToolResponse, Toolkit, view_text_file, write_text_file
 
-from agent.prompt_builder import build_sys_prompt
-from agent.prompt_files import compose_prompt_context
+from agent.background import BackgroundLoop
+from agent.component_cache import AgentComponents, ComponentCache, clone_toolkit, components_key
+from agent.prompt_files import PromptCache
+from agent.router import RouteResult, default_router
+from agent.session_pool import PooledSession, SessionAgentPool
 from agent.stream import StreamEvent, StreamingHook
+from agent.timing import StepTimer, TurnDeadline, TurnTimings
+from agent.tool_cache import ToolResultCache, file_args_key
+from agent.tool_concurrency import concurrency_limiter, offload_sync_tools, order_tool_results
 from llm.client import build_model_from_env
-from memory.jsonl_store import JsonlMemoryStore
-from mcp_support.registry import auto_register_mcp_clients
+from memory.retrieval import load_relevant_history
+from memory.store import MemoryStore, open_memory_store
+from memory.summarizer import (
+    SUMMARY_PROMPT,
+    RollingSummarizer,
+    format_transcript,
+    load_with_summary,
+    summary_record,
+)
+from memory.window import select_window
+from memory.writer import MemoryWriter, flush_interval_from_env
+from mcp_support.registry import MCPRegistrationManager, auto_register_mcp_clients
+from runtime.file_access import normalize_user_id
 from runtime.session import SessionContext
 from skills.loader import load_enabled_skills
 
@@ -45,6 +67,23 @@ async def _append_memory_entry(memory: object, entry: Any) -> None:
     raise AttributeError("Memory object must provide append() or add().")
 
 
+async def _add_history(memory: object, entries: Sequence[Msg | Mapping[str, Any]]) -> None:
+    """Add many history entries in one pass instead of one awaited add per entry."""
+    if isinstance(memory, InMemoryMemory):
+        # Messages built from decoded records belong to nobody else, so they go in
+        # as-is instead of through add()'s per-message deepcopy and duplicate scan.
+        memory.content.extend(
+            (deepcopy(entry) if isinstance(entry, Msg) else _history_entry_to_msg(entry), [])
+            for entry in entries
+        )
+        return
+    if isinstance(memory, MemoryBase):
+        await memory.add([_history_entry_to_msg(entry) for entry in entries])
+        return
+    for entry in entries:
+        await _append_memory_entry(memory, _history_entry_to_msg(entry))
+
+
 def _history_entry_to_msg(entry: Msg | Mapping[str, Any]) -> Msg:
     if isinstance(entry, Msg):
         return entry
@@ -74,41 +113,136 @@ def _normalize_response_text(content: Any) -> str:
     return str(content)
 
 
-def _build_agent_components(
-    ctx: SessionContext,
-) -> tuple[Toolkit, str, InMemoryMemory, Any]:
-    """Build the core agent components: toolkit, system prompt, memory, and model.
+_COMPONENT_CACHE = ComponentCache()
+_PROMPT_CACHE = PromptCache()
+_AGENT_POOL = SessionAgentPool()
+_MEMORY_WRITER = MemoryWriter(flush_interval=flush_interval_from_env())
+_MEMORY_STORES: dict[Path, tuple[tuple[Any, ...], MemoryStore]] = {}
+_MEMORY_STORES_LOCK = threading.Lock()
+_SUMMARIZERS: dict[tuple[int, int], RollingSummarizer] = {}
+# Summaries run here so they survive the per-call loop of ``asyncio.run(run_once(...))``.
+_SUMMARY_LOOP = BackgroundLoop("tilo-summaries")
+_FAST_PATH = default_router()
+_TOOL_CACHE = ToolResultCache()
+_TOOL_CACHE.mark_cacheable("view_text_file", file_args_key("file_path"))
 
-    This function extracts the synchronous component-building logic from run_once
-    to enable reuse in streaming contexts.
 
-    Args:
-        ctx: The session context containing configuration.
+async def _wait_for_summaries() -> None:
+    for summarizer in list(_SUMMARIZERS.values()):
+        await summarizer.wait()
+
 
-    Returns:
-        A tuple of (toolkit, sys_prompt, memory, model).
+def _shutdown_memory() -> None:
+    # Finish pending summaries and queued appends, then release pooled file handles / connections.
+    if _SUMMARY_LOOP.started:
+        _SUMMARY_LOOP.submit(_wait_for_summaries()).result()
+    _MEMORY_WRITER.close()
+    for _, store in list(_MEMORY_STORES.values()):
+        store.close()
+
+
+atexit.register(_shutdown_memory)
+
+
+def _memory_store(ctx: SessionContext) -> MemoryStore:
+    """The process-wide store of ``ctx.memory_dir``.
+
+    Exactly one store per directory: every store pools its own append handles,
+    so a second one on the same files would keep appending to session files
+    the first has already rotated into segments.
     """
+    memory_dir = Path(ctx.memory_dir).resolve()
+    options = (
+        ctx.memory_backend,
+        ctx.memory_durability,
+        ctx.memory_segment_bytes,
+        ctx.memory_compression,
+        ctx.memory_codec,
+        ctx.memory_search_index,
+    )
+    with _MEMORY_STORES_LOCK:
+        entry = _MEMORY_STORES.get(memory_dir)
+        if entry is None:
+            entry = _MEMORY_STORES[memory_dir] = (options, open_memory_store(memory_dir, *options))
+    if entry[0] != options:
+        raise ValueError(
+            f"Memory dir {memory_dir} is already open with different memory_* settings: {entry[0]!r}"
+        )
+    return entry[1]
+
+
+def _summarizer(ctx: SessionContext) -> RollingSummarizer | None:
+    if ctx.summarize_after is None:
+        return None
+    key = (ctx.summarize_after, ctx.summary_keep_recent)
+    summarizer = _SUMMARIZERS.get(key)
+    if summarizer is None:
+        summarizer = _SUMMARIZERS[key] = RollingSummarizer(*key)
+    return summarizer
+
+
+async def flush_memory_writes() -> None:
+    """Wait until every queued memory append and summary has been written (e.g. on shutdown)."""
+    if _SUMMARY_LOOP.started:
+        await _SUMMARY_LOOP.run(_wait_for_summaries())
+    await _MEMORY_WRITER.aflush()
+
+
+async def _summarize_with_model(model: Any, previous: str | None, records: list[dict[str, Any]]) -> str:
+    prompt = await OpenAIChatFormatter().format(
+        [
+            Msg(name="system", content=SUMMARY_PROMPT, role="system"),
+            Msg(name="user", content=format_transcript(previous, records), role="user"),
+        ]
+    )
+    response = await model(prompt)
+    if getattr(model, "stream", False):
+        last = None
+        async for chunk in response:
+            last = chunk
+        response = last
+    return _normalize_response_text(getattr(response, "content", ""))
+
+
+def _build_fresh_components(ctx: SessionContext) -> AgentComponents:
     _, skill_dirs = load_enabled_skills(ctx.enabled_skills)
     toolkit = Toolkit()
     tool_lines = _enable_builtin_file_tools(toolkit, ctx.project_root)
     for skill_dir in skill_dirs:
         toolkit.register_agent_skill(str(skill_dir))
+    offload_sync_tools(toolkit)
     tool_lines.append("(plus tool functions provided by registered AgentScope skills)")
-    prompt_context = compose_prompt_context(ctx.workspace_dir())
-    sys_prompt = build_sys_prompt(prompt_context, "\n".join(tool_lines))
-    memory = InMemoryMemory()
-    model = build_model_from_env()
-    return toolkit, sys_prompt, memory, model
-
-
-async def run_once(user_text: str, ctx: SessionContext) -> str:
-    toolkit, sys_prompt, memory, model = _build_agent_components(ctx)
-    mcp_manager = await auto_register_mcp_clients(toolkit)
-    memory_store = JsonlMemoryStore(ctx.memory_dir)
-    history = memory_store.load(ctx.session_id, user_id=ctx.user_id)
-    for entry in history:
-        await _append_memory_entry(memory, _history_entry_to_msg(entry))
-    agent = ReActAgent(
+    return AgentComponents(
+        toolkit=toolkit,
+        tool_list_text="\n".join(tool_lines),
+        skill_dirs=list(skill_dirs),
+        model_factory=lambda: build_model_from_env(),
+    )
+
+
+def _get_agent_components(ctx: SessionContext) -> AgentComponents:
+    key = components_key(ctx.enabled_skills)
+    return _COMPONENT_CACHE.get(key, lambda: _build_fresh_components(ctx))
+
+
+def _system_prompt(ctx: SessionContext, components: AgentComponents) -> str:
+    """Compose the workspace prompt files with the tool list; only stats the files when unchanged."""
+    return _PROMPT_CACHE.get(ctx.workspace_dir(), components.tool_list_text)
+
+
+def _load_components(ctx: SessionContext) -> tuple[AgentComponents, str]:
+    components = _get_agent_components(ctx)
+    return components, _system_prompt(ctx, components)
+
+
+def _session_key(ctx: SessionContext) -> tuple[str, str, str]:
+    return (str(Path(ctx.memory_dir).resolve()), normalize_user_id(ctx.user_id), ctx.session_id)
+
+
+def _new_agent(
+    sys_prompt: str, memory: InMemoryMemory, toolkit: Toolkit, model: Any, ctx: SessionContext
+) -> ReActAgent:
+    return ReActAgent(
         name="Tilo",
         sys_prompt=sys_prompt,
         model=model,
@@ -117,21 +251,471 @@ async def run_once(user_text: str, ctx: SessionContext) -> str:
         memory=memory,
         max_iters=ctx.max_iters,
     )
+
+
+def _checkout_session(ctx: SessionContext) -> PooledSession:
+    key = _session_key(ctx)
+    session = _AGENT_POOL.get(key)
+    if session is None:
+        session = PooledSession(memory=InMemoryMemory())
+        _AGENT_POOL.put(key, session)
+    return session
+
+
+def _bind_turn(
+    session: PooledSession,
+    components: AgentComponents,
+    sys_prompt: str,
+    toolkit: Toolkit,
+    ctx: SessionContext,
+) -> ReActAgent:
+    """Point a pooled agent at this turn's prompt, toolkit, model and limits; must hold the session lock."""
+    model = components.model()
+    if session.agent is None or session.components is not components:
+        # First turn, or skills changed: (re)build the agent around the warm memory.
+        session.agent = _new_agent(sys_prompt, session.memory, toolkit, model, ctx)
+        session.components = components
+    session.agent._sys_prompt = sys_prompt
+    if ctx.cache_tool_results:
+        toolkit.register_middleware(_TOOL_CACHE.middleware)
+    if ctx.tool_concurrency > 1:
+        toolkit.register_middleware(concurrency_limiter(ctx.tool_concurrency))
+    session.agent.parallel_tool_calls = ctx.tool_concurrency > 1
+    session.agent.toolkit = toolkit
+    session.agent.model = model
+    session.agent.max_iters = ctx.max_iters
+    session.toolkit = toolkit
+    return session.agent
+
+
+async def _prepare_turn(
+    ctx: SessionContext,
+    session: PooledSession,
+    memory_store: MemoryStore,
+    timer: StepTimer,
+    mcp_toolkit: Toolkit | None = None,
+    user_text: str = "",
+) -> tuple[AgentComponents, str, Toolkit, MCPRegistrationManager, list[dict[str, Any]] | None]:
+    """Run the independent setup steps of a turn concurrently.
+
+    Component build (skill registration, prompt files) and history load are
+    blocking file I/O and run in worker threads (history on the memory store's
+    own I/O pool); MCP clients connect on the event loop into an empty per-turn
+    toolkit that is merged with the cached prototype afterwards. Setup latency
+    is bounded by the slowest step instead of the sum.
+    When ``mcp_toolkit`` is given (batch runs), its already-connected MCP
+    registrations are reused and no clients are opened for this turn.
+    A warm pooled memory is kept only while the store's record count still
+    matches what it mirrors; in retrieval mode the history depends on
+    ``user_text`` and is reloaded every turn.
+    """
+    steps: dict[str, Awaitable[Any]] = {
+        "component_build": asyncio.to_thread(_load_components, ctx),
+    }
+    if mcp_toolkit is None:
+        toolkit = Toolkit()
+        steps["mcp_connect"] = auto_register_mcp_clients(toolkit)
+    else:
+        toolkit = clone_toolkit(mcp_toolkit)
+    if session.window != _history_window(ctx) or ctx.retrieval_top_k is not None:
+        session.hydrated = False
+    # On the store's I/O threads, ordered with the session's other store calls.
+    steps["history_load"] = memory_store.arun(
+        ctx.session_id,
+        ctx.user_id,
+        _sync_history,
+        memory_store,
+        ctx,
+        user_text,
+        session.stored_count if session.hydrated else None,
+    )
+    gathered = await asyncio.gather(
+        *(timer.run(name, step) for name, step in steps.items()), return_exceptions=True
+    )
+    results = dict(zip(steps, gathered))
+    mcp_manager = results.get("mcp_connect", MCPRegistrationManager(client_names=[], _stateful_clients=[]))
+    errors = [result for result in gathered if isinstance(result, BaseException)]
+    if errors:
+        if isinstance(mcp_manager, MCPRegistrationManager):
+            await mcp_manager.close()
+        raise errors[0]
+    components, sys_prompt = results["component_build"]
+    history, session.stored_count = results["history_load"]
+    if history is not None:
+        # The count is already the store's; until _hydrate_session applies ``history`` the
+        # memory is not, so a failure before then must force a reload next turn.
+        session.hydrated = False
+    return components, sys_prompt, clone_toolkit(components.toolkit, toolkit), mcp_manager, history
+
+
+def _history_window(ctx: SessionContext) -> tuple[int | None, int | None]:
+    return ctx.history_max_turns, ctx.history_max_tokens
+
+
+def _sync_history(
+    memory_store: MemoryStore, ctx: SessionContext, query: str, known_count: int | None
+) -> tuple[list[dict[str, Any]] | None, int]:
+    """(history, stored record count); history is None while the store still holds ``known_count`` records.
+
+    A pooled memory only mirrors what this process appended, so a count that
+    moved means another process (or store) wrote the session: reload it.
+    """
+    # Appends still queued in the background writer must be visible to the count and load.
+    _MEMORY_WRITER.flush()
+    count = memory_store.count(ctx.session_id, user_id=ctx.user_id)
+    if count == known_count:
+        return None, count
+    return _load_history(memory_store, ctx, query), count
+
+
+def _load_history(memory_store: MemoryStore, ctx: SessionContext, query: str = "") -> list[dict[str, Any]]:
+    if ctx.retrieval_top_k is not None:
+        if not hasattr(memory_store, "search"):
+            raise ValueError("Retrieval context needs a memory backend with search (memory_backend='jsonl').")
+        return load_relevant_history(
+            memory_store,
+            ctx.session_id,
+            query,
+            top_k=ctx.retrieval_top_k,
+            recent_turns=ctx.retrieval_recent_turns,
+            user_id=ctx.user_id,
+            cross_session=ctx.retrieval_cross_session,
+        )
+    max_turns, max_tokens = _history_window(ctx)
+    if ctx.summarize_after is not None:
+        summary, tail = load_with_summary(memory_store, ctx.session_id, user_id=ctx.user_id)
+        if max_turns is not None or max_tokens is not None:
+            tail = select_window(reversed(tail), max_turns=max_turns, max_tokens=max_tokens)
+        return tail if summary is None else [summary_record(summary), *tail]
+    if max_turns is None and max_tokens is None:
+        return memory_store.load(ctx.session_id, user_id=ctx.user_id)
+    return select_window(
+        memory_store.iter_recent(ctx.session_id, user_id=ctx.user_id),
+        max_turns=max_turns,
+        max_tokens=max_tokens,
+    )
+
+
+async def _hydrate_session(
+    session: PooledSession, history: list[dict[str, Any]] | None, ctx: SessionContext
+) -> None:
+    if history is None:
+        return
+    await session.memory.clear()
+    await _add_history(session.memory, history)
+    session.hydrated = True
+    session.window = _history_window(ctx)
+
+
+async def _apply_history_window(memory: InMemoryMemory, ctx: SessionContext) -> None:
+    """Keep a pooled memory inside the session's history window after a turn."""
+    max_turns, max_tokens = _history_window(ctx)
+    if max_turns is None and max_tokens is None:
+        return
+    # A leading summary message is not part of any turn and always stays.
+    msgs = [msg for msg in await memory.get_memory(prepend_summary=False) if msg.role != "system"]
+    kept = select_window(reversed(msgs), max_turns=max_turns, max_tokens=max_tokens)
+    dropped = msgs[: len(msgs) - len(kept)]
+    if dropped:
+        await memory.delete([msg.id for msg in dropped])
+
+
+async def _rewind_memory(memory: InMemoryMemory, size: int) -> None:
+    turn_msgs = (await memory.get_memory(prepend_summary=False))[size:]
+    if turn_msgs:
+        await memory.delete([msg.id for msg in turn_msgs])
+
+
+async def _commit_turn(memory: InMemoryMemory, size: int, records: list[dict[str, Any]]) -> None:
+    """Replace the turn's intermediate messages with exactly what was persisted.
+
+    Keeps a pooled memory identical to one freshly replayed from the JSONL store.
+    """
+    await _rewind_memory(memory, size)
+    await memory.add([_history_entry_to_msg(record) for record in records])
+
+
+_Hook = tuple[str, str, Callable[..., Any]]
+
+
+async def _run_turn(
+    user_text: str,
+    ctx: SessionContext,
+    hooks: Sequence[_Hook] = (),
+    mcp_toolkit: Toolkit | None = None,
+    timings: TurnTimings | None = None,
+) -> str:
+    """Run one turn on the pooled session agent.
+
+    ``hooks`` are (hook_name, hook_type, fn) triples registered on the agent for
+    this turn only. ``timings`` collects the latency breakdown of the turn.
+    ``ctx.timeout`` bounds the whole turn: on expiry the in-flight model, tool
+    and MCP calls are cancelled, MCP clients are closed, nothing is persisted
+    and ``TimeoutError`` is raised.
+    """
+    timings = TurnTimings() if timings is None else timings
+    deadline = TurnDeadline(ctx.timeout)
+    hooks = [
+        *hooks,
+        ("tool_order", "pre_reasoning", order_tool_results),
+        *(("timing", hook_type, fn) for hook_type, fn in timings.hooks().items()),
+    ]
+    session = _checkout_session(ctx)
+    memory_store = _memory_store(ctx)
+    # Fails before the turn starts if the summary settings were changed to invalid values.
+    _summarizer(ctx)
+
+    async def turn() -> str:
+        with timings.step("session_wait"):
+            await session.lock.acquire()
+        try:
+            routed = _FAST_PATH.route(user_text, ctx) if ctx.fast_path else None
+            if routed is not None:
+                return await _answer_locally(session, memory_store, user_text, ctx, routed, timings)
+            with timings.step("setup"):
+                components, sys_prompt, toolkit, mcp_manager, history = await _prepare_turn(
+                    ctx, session, memory_store, timings, mcp_toolkit, user_text
+                )
+            try:
+                agent = _bind_turn(session, components, sys_prompt, toolkit, ctx)
+                for hook in hooks:
+                    _register_hook(agent, hook)
+                try:
+                    return await _converse(
+                        agent, session, memory_store, user_text, ctx, history, timings, components, deadline
+                    )
+                finally:
+                    for hook in hooks:
+                        _remove_hook(agent, hook)
+            finally:
+                await mcp_manager.close()
+        finally:
+            session.lock.release()
+
+    with timings.step("total"):
+        return await deadline.run(turn())
+
+
+async def _answer_locally(
+    session: PooledSession,
+    memory_store: MemoryStore,
+    user_text: str,
+    ctx: SessionContext,
+    routed: RouteResult,
+    timings: TurnTimings,
+) -> str:
+    """Persist a fast-path answer like a model turn, skipping setup and the model."""
+    timings.path = f"fast:{routed.route}"
+    records = [
+        {"role": "user", "content": user_text},
+        {"role": "assistant", "content": routed.text},
+    ]
+    with timings.step("memory_persist"):
+        persisted = _MEMORY_WRITER.submit(memory_store, ctx.session_id, records, user_id=ctx.user_id)
+        if ctx.await_persist:
+            await asyncio.wrap_future(persisted)
+    if session.hydrated and session.window == _history_window(ctx):
+        # Keep a warm pooled memory in step; a cold one hydrates from the store next turn.
+        await _commit_turn(session.memory, await session.memory.size(), records)
+        await _apply_history_window(session.memory, ctx)
+        session.stored_count += len(records)
+    return routed.text
+
+
+def register_fast_path(name: str, route: Callable[[str, SessionContext], RouteResult | None]) -> None:
+    """Add a pre-model route used by turns with ``ctx.fast_path`` enabled."""
+    _FAST_PATH.register(name, route)
+
+
+def _register_hook(agent: ReActAgent, hook: _Hook) -> None:
+    name, hook_type, fn = hook
+    agent.register_instance_hook(hook_type, name, fn)
+
+
+def _remove_hook(agent: ReActAgent, hook: _Hook) -> None:
+    name, hook_type, _ = hook
+    agent.remove_instance_hook(hook_type, name)
+
+
+async def _converse(
+    agent: ReActAgent,
+    session: PooledSession,
+    memory_store: MemoryStore,
+    user_text: str,
+    ctx: SessionContext,
+    history: list[dict[str, Any]] | None,
+    timings: TurnTimings,
+    components: AgentComponents,
+    deadline: TurnDeadline,
+) -> str:
+    try:
+        await _hydrate_session(session, history, ctx)
+    except BaseException:
+        session.hydrated = False
+        raise
+    size_before = await session.memory.size()
     user_msg = Msg(name="user", content=user_text, role="user")
+    submitted = False
     try:
         response = await agent(user_msg)
+        if (response.metadata or {}).get("_is_interrupted"):
+            # The agent absorbed a cancellation (deadline or abandoned stream);
+            # its apology reply must not be persisted as a real answer.
+            deadline.check()
+            raise asyncio.CancelledError()
         assistant_text = _normalize_response_text(response.content)
-        memory_store.append(
-            ctx.session_id, {"role": "user", "content": user_text}, user_id=ctx.user_id
-        )
-        memory_store.append(
-            ctx.session_id,
+        records = [
+            {"role": "user", "content": user_text},
             {"role": "assistant", "content": assistant_text},
+        ]
+        with timings.step("memory_persist"):
+            persisted = _MEMORY_WRITER.submit(
+                memory_store, ctx.session_id, records, user_id=ctx.user_id
+            )
+            submitted = True
+            if ctx.await_persist:
+                await asyncio.wrap_future(persisted)
+    except BaseException:
+        await _rewind_memory(session.memory, size_before)
+        if submitted:
+            # The records may still land in the store; reload instead of guessing.
+            session.hydrated = False
+        raise
+    await _commit_turn(session.memory, size_before, records)
+    await _apply_history_window(session.memory, ctx)
+    session.stored_count += len(records)
+    _schedule_summary(session, memory_store, ctx, components, persisted)
+    return assistant_text
+
+
+def _schedule_summary(
+    session: PooledSession,
+    memory_store: MemoryStore,
+    ctx: SessionContext,
+    components: AgentComponents,
+    persisted: Any,
+) -> None:
+    """Fold old turns into the summary sidecar off the request path, on ``_SUMMARY_LOOP``."""
+    summarizer = _summarizer(ctx)
+    if summarizer is None:
+        return
+
+    def mark_stale() -> None:
+        # The next turn re-hydrates as summary + tail instead of the full history.
+        session.hydrated = False
+
+    async def schedule() -> None:
+        # Models are bound to the loop they were built on: resolve this loop's instance.
+        model = components.model()
+        summarizer.schedule(
+            memory_store,
+            ctx.session_id,
+            lambda previous, records: _summarize_with_model(model, previous, records),
             user_id=ctx.user_id,
+            after=asyncio.wrap_future(persisted),
+            on_done=mark_stale,
         )
-        return assistant_text
+
+    _SUMMARY_LOOP.submit(schedule())
+
+
+@overload
+async def run_once(user_text: str, ctx: SessionContext) -> str: ...
+
+
+@overload
+async def run_once(
+    user_text: str, ctx: SessionContext, *, with_timings: Literal[False]
+) -> str: ...
+
+
+@overload
+async def run_once(
+    user_text: str, ctx: SessionContext, *, with_timings: Literal[True]
+) -> tuple[str, TurnTimings]: ...
+
+
+async def run_once(
+    user_text: str, ctx: SessionContext, *, with_timings: bool = False
+) -> str | tuple[str, TurnTimings]:
+    """Run one turn; with ``with_timings=True`` also return its latency breakdown.
+
+    Summaries scheduled by the turn run on a background loop and may still be
+    in flight when it returns; ``flush_memory_writes()`` waits for them.
+    """
+    timings = TurnTimings()
+    text = await _run_turn(user_text, ctx, timings=timings)
+    if with_timings:
+        return text, timings
+    return text
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    """Outcome of one ``run_many`` item; exactly one of ``text``/``error`` is set."""
+
+    index: int
+    session_id: str
+    text: str | None = None
+    error: BaseException | None = None
+
+
+async def run_many(
+    items: Iterable[tuple[str, SessionContext]],
+    concurrency: int = 8,
+) -> AsyncGenerator[BatchResult, None]:
+    """Run many (user_text, ctx) pairs concurrently and yield results as they finish.
+
+    At most ``concurrency`` turns are in flight; ``items`` is consumed lazily so
+    arbitrarily long iterables are fine. Toolkit prototypes and models come from
+    the shared component cache, and MCP clients are connected once for the whole
+    batch instead of per turn. Turns on the same session still run one at a time.
+    A failing item is reported through ``BatchResult.error`` and does not stop
+    the batch.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be >= 1.")
+    pending = enumerate(items)
+    results: asyncio.Queue[BatchResult | None] = asyncio.Queue()
+    mcp_toolkit = Toolkit()
+    mcp_manager: MCPRegistrationManager | None = None
+    mcp_lock = asyncio.Lock()
+
+    async def shared_mcp_toolkit() -> Toolkit:
+        nonlocal mcp_manager
+        async with mcp_lock:
+            if mcp_manager is None:
+                mcp_manager = await auto_register_mcp_clients(mcp_toolkit)
+        return mcp_toolkit
+
+    async def worker() -> None:
+        try:
+            for index, (user_text, ctx) in pending:
+                try:
+                    text = await _run_turn(user_text, ctx, mcp_toolkit=await shared_mcp_toolkit())
+                    result = BatchResult(index=index, session_id=ctx.session_id, text=text)
+                except Exception as exc:
+                    result = BatchResult(index=index, session_id=ctx.session_id, error=exc)
+                await results.put(result)
+        finally:
+            await results.put(None)
+
+    workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+    try:
+        running = len(workers)
+        while running:
+            result = await results.get()
+            if result is None:
+                running -= 1
+                continue
+            yield result
+        await asyncio.gather(*workers)
     finally:
-        await mcp_manager.close()
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        if mcp_manager is not None:
+            await mcp_manager.close()
 
 
 async def chat_stream(
@@ -149,62 +733,36 @@ async def chat_stream(
     """
     queue: asyncio.Queue[StreamEvent | None] = asyncio.Queue()
     hook = StreamingHook(queue)
+    hooks = [
+        ("stream", "pre_reasoning", hook.pre_reasoning),
+        ("stream", "pre_acting", hook.pre_acting),
+    ]
+    timings = TurnTimings()
 
-    toolkit, sys_prompt, memory, model = _build_agent_components(ctx)
-    mcp_manager = await auto_register_mcp_clients(toolkit)
-
-    agent = ReActAgent(
-        name="Tilo",
-        sys_prompt=sys_prompt,
-        model=model,
-        formatter=OpenAIChatFormatter(),
-        toolkit=toolkit,
-        memory=memory,
-        max_iters=ctx.max_iters,
-    )
-
-    # 注册 hooks
-    agent.register_instance_hook("pre_reasoning", "stream", hook.pre_reasoning)
-    agent.register_instance_hook("pre_acting", "stream", hook.pre_acting)
-
-    # 加载历史记忆
-    memory_store = JsonlMemoryStore(ctx.memory_dir)
-    history = memory_store.load(ctx.session_id, user_id=ctx.user_id)
-    for entry in history:
-        await _append_memory_entry(memory, _history_entry_to_msg(entry))
-
-    # 在后台任务中运行 agent
+    # 在后台任务中运行 agent（复用会话池中的 agent 与记忆）
     async def run_agent() -> None:
         try:
-            user_msg = Msg(name="user", content=user_text, role="user")
-            response = await agent(user_msg)
-            text = _normalize_response_text(response.content)
+            text = await _run_turn(user_text, ctx, hooks, timings=timings)
             if text:
                 await queue.put(StreamEvent("text", text))
-
-            # 保存对话历史
-            memory_store.append(
-                ctx.session_id,
-                {"role": "user", "content": user_text},
-                user_id=ctx.user_id,
-            )
-            memory_store.append(
-                ctx.session_id,
-                {"role": "assistant", "content": text},
-                user_id=ctx.user_id,
-            )
         finally:
             await queue.put(None)
-            await mcp_manager.close()
 
     task = asyncio.create_task(run_agent())
 
-    # 消费队列，yield 事件
-    while True:
-        event = await queue.get()
-        if event is None:
-            break
-        yield event
-
-    yield StreamEvent("done", "")
-    await task  # 确保异常被传播
+    try:
+        # 消费队列，yield 事件
+        while True:
+            event = await queue.get()
+            if event is None:
+                break
+            yield event
+
+        await task  # 确保异常被传播
+    finally:
+        # 消费方提前停止（如 SSE 连接断开）时取消本轮，避免继续消耗模型与工具调用
+        if not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+    # done 事件携带本轮耗时明细
+    yield StreamEvent("done", "", metadata={"path": timings.path, "timings": timings.to_dict()})
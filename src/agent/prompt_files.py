@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import threading
+from collections import OrderedDict
 from pathlib import Path
 
+from agent.prompt_builder import build_sys_prompt
+
 PROMPT_FILE_NAMES = (
     "AGENTS.md",
     "SOUL.md",
@@ -12,6 +16,16 @@ PROMPT_FILE_NAMES = (
 
 _PROMPTS_DIR = Path(__file__).resolve().parents[1] / "prompts"
 
+FileStamp = tuple[str, int, int] | tuple[str, None, None]
+
+
+def file_stamp(path: Path) -> FileStamp:
+    try:
+        st = path.stat()
+    except OSError:
+        return (str(path), None, None)
+    return (str(path), st.st_mtime_ns, st.st_size)
+
 
 def ensure_prompt_files(workspace_dir: Path) -> list[Path]:
     workspace = workspace_dir.resolve()
@@ -35,3 +49,48 @@ def compose_prompt_context(workspace_dir: Path) -> str:
         body = (workspace / name).read_text(encoding="utf-8").strip()
         sections.append(f"### {name}\n{body}")
     return "\n\n".join(sections)
+
+
+class PromptCache:
+    """Composed system prompts keyed by (path, mtime_ns, size) of every prompt file.
+
+    A hit costs one ``stat`` per prompt file and no reads or writes; any change,
+    or a missing file, recomposes the prompt (creating missing files first).
+    """
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[str, str], tuple[tuple[FileStamp, ...], str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, workspace_dir: Path, tool_list_text: str = "") -> str:
+        key = (str(workspace_dir), tool_list_text)
+        stamps = _prompt_stamps(workspace_dir)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == stamps and all(st[1] is not None for st in stamps):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        prompt = build_sys_prompt(compose_prompt_context(workspace_dir), tool_list_text)
+        # Stamp after composing so files created by ensure_prompt_files are covered.
+        stamps = _prompt_stamps(workspace_dir)
+        with self._lock:
+            self._entries[key] = (stamps, prompt)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return prompt
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+def _prompt_stamps(workspace_dir: Path) -> tuple[FileStamp, ...]:
+    return tuple(file_stamp(workspace_dir / name) for name in PROMPT_FILE_NAMES)
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import importlib.util
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from types import ModuleType
+from typing import Callable
+
+from llm.client import detect_time_intent, extract_math_expression
+from runtime.session import SessionContext
+from skills.loader import SKILLS_DIR
+
+
+@dataclass(frozen=True)
+class RouteResult:
+    """A locally produced answer; ``route`` names the fast path that produced it."""
+
+    route: str
+    text: str
+
+
+Route = Callable[[str, SessionContext], "RouteResult | None"]
+
+_TIME_QUESTION = re.compile(
+    r"(what(?:'s| is) the (?:current )?time(?: now)?|what time is it(?: now)?|time now"
+    r"|现在几点(?:了|钟)?|几点了|现在(?:的)?时间(?:是)?(?:多少)?)",
+    re.IGNORECASE,
+)
+_MATH_FILLER = re.compile(
+    r"(what(?:'s| is)|calculate|compute|计算|算一下|等于多少|等于几|等于|=|多少)",
+    re.IGNORECASE,
+)
+# Dates and phone numbers that happen to parse as arithmetic ("2024-1-5", "555-1234").
+_DATE = re.compile(r"\d{4}[-/]\d{1,2}[-/]\d{1,2}")
+_HYPHENATED_DIGITS = re.compile(r"\d+(?:-\d+)+")
+_TRAILING = " \t?？!！.。:："
+
+
+@lru_cache(maxsize=None)
+def _skill_script(skill: str, script: str) -> ModuleType:
+    path = SKILLS_DIR / skill / "scripts" / f"{script}.py"
+    spec = importlib.util.spec_from_file_location(f"_tilo_skill_{skill}_{script}", path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Cannot load skill script {path}")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _skill_enabled(ctx: SessionContext, skill: str) -> bool:
+    if ctx.enabled_skills is not None and skill not in ctx.enabled_skills:
+        return False
+    return (Path(SKILLS_DIR) / skill / "SKILL.md").exists()
+
+
+def _has_cjk(text: str) -> bool:
+    return any("一" <= ch <= "鿿" for ch in text)
+
+
+def time_route(user_text: str, ctx: SessionContext) -> RouteResult | None:
+    """Bare "what time is it" questions, answered by ``time_skill`` ``now``."""
+    text = user_text.strip().rstrip(_TRAILING)
+    if not detect_time_intent(text) or not _TIME_QUESTION.fullmatch(text):
+        return None
+    if not _skill_enabled(ctx, "time_skill"):
+        return None
+    current = _skill_script("time_skill", "now").now(ctx.timezone)
+    if _has_cjk(text):
+        return RouteResult("time", f"现在时间（{current['timezone']}）：{current['iso']}")
+    return RouteResult("time", f"The current time ({current['timezone']}) is {current['iso']}.")
+
+
+def math_route(user_text: str, ctx: SessionContext) -> RouteResult | None:
+    """Messages that are only an arithmetic expression, answered by ``math_skill`` ``evaluate``."""
+    text = user_text.strip().rstrip(_TRAILING)
+    expression = extract_math_expression(text)
+    if expression is None or _DATE.fullmatch(expression):
+        return None
+    # A bare "555-1234" is a number, not a subtraction, unless the message asks for a result.
+    if _HYPHENATED_DIGITS.fullmatch(expression) and not _MATH_FILLER.search(text):
+        return None
+    rest = _MATH_FILLER.sub("", text.replace(expression, "", 1)).strip(_TRAILING)
+    if rest or not _skill_enabled(ctx, "math_skill"):
+        return None
+    outcome = _skill_script("math_skill", "calc").evaluate(expression)
+    if "error" in outcome:
+        return None
+    return RouteResult("math", f"{expression} = {outcome['result']}")
+
+
+class FastPathRouter:
+    """Ordered pre-model routes; the first one returning a result answers the turn.
+
+    Routes must only claim messages they can answer with high confidence and
+    return None otherwise, so the turn falls through to the model.
+    """
+
+    def __init__(self, routes: dict[str, Route] | None = None) -> None:
+        self.routes: dict[str, Route] = dict(routes or {})
+
+    def register(self, name: str, route: Route) -> None:
+        self.routes[name] = route
+
+    def unregister(self, name: str) -> None:
+        self.routes.pop(name, None)
+
+    def route(self, user_text: str, ctx: SessionContext) -> RouteResult | None:
+        for route in self.routes.values():
+            result = route(user_text, ctx)
+            if result is not None:
+                return result
+        return None
+
+
+def default_router() -> FastPathRouter:
+    return FastPathRouter({"time": time_route, "math": math_route})
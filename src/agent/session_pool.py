@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Hashable
+
+from agentscope.memory import InMemoryMemory
+from agentscope.tool import Toolkit
+
+from agent.component_cache import AgentComponents
+
+
+@dataclass
+class PooledSession:
+    """A live agent whose memory already mirrors the persisted session history.
+
+    The agent is bound lazily on the first turn, so a session can be checked out
+    (and locked) before its components have been built.
+    """
+
+    memory: InMemoryMemory
+    agent: Any | None = None
+    toolkit: Toolkit | None = None
+    components: AgentComponents | None = None
+    hydrated: bool = False
+    # Store record count the warm memory mirrors; another writer changes it.
+    stored_count: int = 0
+    window: tuple[int | None, int | None] = (None, None)
+    last_used: float = 0.0
+    _lock: asyncio.Lock | None = None
+    _loop: asyncio.AbstractEventLoop | None = field(default=None, repr=False)
+
+    @property
+    def lock(self) -> asyncio.Lock:
+        """Per-session turn lock, recreated when the session moves to another event loop."""
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._loop is not loop:
+            self._lock = asyncio.Lock()
+            self._loop = loop
+        return self._lock
+
+    @property
+    def busy(self) -> bool:
+        """A turn holds the session lock; evicting it would let a second agent run beside it."""
+        return self._lock is not None and self._lock.locked()
+
+
+class SessionAgentPool:
+    """LRU pool of live session agents with idle-TTL eviction.
+
+    Sessions in the middle of a turn (``busy``) are never evicted; the pool may
+    briefly exceed ``max_sessions`` while every older session is busy.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 256,
+        idle_ttl: float = 600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self._clock = clock
+        self._sessions: OrderedDict[Hashable, PooledSession] = OrderedDict()
+
+    def get(self, key: Hashable) -> PooledSession | None:
+        session = self._sessions.get(key)
+        if session is None:
+            return None
+        now = self._clock()
+        if self.idle_ttl > 0 and now - session.last_used > self.idle_ttl and not session.busy:
+            del self._sessions[key]
+            return None
+        session.last_used = now
+        self._sessions.move_to_end(key)
+        return session
+
+    def put(self, key: Hashable, session: PooledSession) -> None:
+        session.last_used = self._clock()
+        self._sessions[key] = session
+        self._sessions.move_to_end(key)
+        self.evict_idle()
+        excess = len(self._sessions) - self.max_sessions
+        if excess > 0:
+            idle = [k for k, s in self._sessions.items() if k != key and not s.busy]
+            for old_key in idle[:excess]:
+                del self._sessions[old_key]
+
+    def discard(self, key: Hashable) -> None:
+        self._sessions.pop(key, None)
+
+    def evict_idle(self) -> int:
+        if self.idle_ttl <= 0:
+            return 0
+        deadline = self._clock() - self.idle_ttl
+        expired = [
+            key
+            for key, session in self._sessions.items()
+            if session.last_used < deadline and not session.busy
+        ]
+        for key in expired:
+            del self._sessions[key]
+        return len(expired)
+
+    def clear(self) -> None:
+        self._sessions.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._sessions
+
+    def __len__(self) -> int:
+        return len(self._sessions)
@@ -3,7 +3,7 @@ from __future__ import annotations
 
 import asyncio
 from dataclasses import dataclass
-from typing import Any, Literal
+from typing import Any, Literal, Mapping
 
 
 @dataclass(frozen=True)
@@ -11,6 +11,7 @@ class StreamEvent:
     """流式输出事件"""
     type: Literal["thinking", "tool_call", "text", "done"]
     data: str
+    metadata: Mapping[str, Any] | None = None  # done 事件附带 {"timings": ...}
 
 
 class StreamingHook:
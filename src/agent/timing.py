@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+
+class StepTimer:
+    """Records wall-clock duration (seconds) of named turn steps."""
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter) -> None:
+        self._clock = clock
+        self.steps: dict[str, float] = {}
+
+    @contextmanager
+    def step(self, name: str) -> Iterator[None]:
+        start = self._clock()
+        try:
+            yield
+        finally:
+            self.steps[name] = self._clock() - start
+
+    async def run(self, name: str, awaitable: Awaitable[T]) -> T:
+        with self.step(name):
+            return await awaitable
+
+
+class TurnTimings(StepTimer):
+    """Latency breakdown of one turn.
+
+    Scalar steps (``component_build``, ``mcp_connect``, ``history_load``,
+    ``memory_persist``, ...) live in ``steps``; every reasoning step (model call)
+    and tool call is appended in order as it finishes. The ``pre_*``/``post_*``
+    methods are agent instance hooks and are registered by ``agent.core``.
+    ``path`` is "model", or "fast:<route>" when a fast-path route answered.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter) -> None:
+        super().__init__(clock)
+        self.path = "model"
+        self.model_calls: list[float] = []
+        self.tool_calls: list[dict[str, Any]] = []
+        self._reasoning_start: float | None = None
+        self._tool_starts: dict[str, tuple[str, float]] = {}
+
+    def pre_reasoning(self, agent: Any, kwargs: dict[str, Any]) -> None:
+        self._reasoning_start = self._clock()
+
+    def post_reasoning(self, agent: Any, kwargs: dict[str, Any], output: Any) -> None:
+        if self._reasoning_start is not None:
+            self.model_calls.append(self._clock() - self._reasoning_start)
+            self._reasoning_start = None
+
+    def pre_acting(self, agent: Any, kwargs: dict[str, Any]) -> None:
+        tool_call = kwargs.get("tool_call") or {}
+        call_id = str(tool_call.get("id") or len(self._tool_starts))
+        self._tool_starts[call_id] = (str(tool_call.get("name", "unknown")), self._clock())
+
+    def post_acting(self, agent: Any, kwargs: dict[str, Any], output: Any) -> None:
+        tool_call = kwargs.get("tool_call") or {}
+        started = self._tool_starts.pop(str(tool_call.get("id")), None)
+        if started is not None:
+            name, start = started
+            self.tool_calls.append({"name": name, "seconds": self._clock() - start})
+
+    def hooks(self) -> dict[str, Callable[..., Any]]:
+        return {
+            "pre_reasoning": self.pre_reasoning,
+            "post_reasoning": self.post_reasoning,
+            "pre_acting": self.pre_acting,
+            "post_acting": self.post_acting,
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "path": self.path,
+            "steps": dict(self.steps),
+            "model_calls": list(self.model_calls),
+            "tool_calls": [dict(call) for call in self.tool_calls],
+        }
+
+
+class TurnDeadline:
+    """Wall-clock budget of one turn; ``timeout=None`` means unlimited."""
+
+    def __init__(self, timeout: float | None, clock: Callable[[], float] = time.monotonic) -> None:
+        if timeout is not None and timeout <= 0:
+            raise ValueError("timeout must be > 0.")
+        self.timeout = timeout
+        self._clock = clock
+        self.expires_at = None if timeout is None else clock() + timeout
+
+    def remaining(self) -> float | None:
+        if self.expires_at is None:
+            return None
+        return max(self.expires_at - self._clock(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        return self.expires_at is not None and self._clock() >= self.expires_at
+
+    def check(self) -> None:
+        if self.expired:
+            raise TimeoutError(f"Turn exceeded its {self.timeout}s budget.")
+
+    async def run(self, awaitable: Awaitable[T]) -> T:
+        """Await within the budget; on expiry cancel it, let it clean up, raise TimeoutError."""
+        remaining = self.remaining()
+        if remaining is None:
+            return await awaitable
+        task = asyncio.ensure_future(awaitable)
+        try:
+            done, _ = await asyncio.wait({task}, timeout=remaining)
+        except asyncio.CancelledError:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            raise
+        if task not in done:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            raise TimeoutError(f"Turn exceeded its {self.timeout}s budget.")
+        return task.result()
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from copy import deepcopy
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, Callable, Hashable, Mapping
+
+from agentscope.tool import ToolResponse
+
+ArgsKey = Callable[[Mapping[str, Any]], Hashable | None]
+
+
+def args_key(args: Mapping[str, Any]) -> Hashable:
+    """Key for pure tools: the canonical JSON form of the call arguments."""
+    return json.dumps(args, sort_keys=True, ensure_ascii=False, default=str)
+
+
+def file_args_key(path_arg: str = "file_path") -> ArgsKey:
+    """Key for file readers: arguments plus the file's mtime and size.
+
+    Returns None (do not cache) when the file cannot be stat'ed.
+    """
+
+    def key(args: Mapping[str, Any]) -> Hashable | None:
+        try:
+            st = os.stat(str(args[path_arg]))
+        except (KeyError, OSError):
+            return None
+        return (args_key(args), st.st_mtime_ns, st.st_size)
+
+    return key
+
+
+@dataclass(frozen=True)
+class _Policy:
+    key: ArgsKey
+    ttl: float | None
+
+
+@dataclass
+class _Entry:
+    response: ToolResponse
+    expires_at: float | None
+
+
+class ToolResultCache:
+    """Bounded LRU + TTL cache of final tool responses, shared across sessions.
+
+    Only tools marked with ``mark_cacheable`` are cached; install ``middleware``
+    on a toolkit with ``register_middleware``. Interrupted calls are never stored.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: float | None = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._policies: dict[str, _Policy] = {}
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def mark_cacheable(self, tool_name: str, key: ArgsKey = args_key, ttl: float | None = None) -> None:
+        self._policies[tool_name] = _Policy(key=key, ttl=self.ttl if ttl is None else ttl)
+
+    def is_cacheable(self, tool_name: str) -> bool:
+        return tool_name in self._policies
+
+    def _cache_key(self, tool_call: Mapping[str, Any]) -> tuple[Hashable, _Policy] | None:
+        policy = self._policies.get(str(tool_call.get("name")))
+        if policy is None:
+            return None
+        args_part = policy.key(tool_call.get("input") or {})
+        if args_part is None:
+            return None
+        return (tool_call["name"], args_part), policy
+
+    def get(self, key: Hashable) -> ToolResponse | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at is not None and entry.expires_at <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return deepcopy(entry.response)
+
+    def put(self, key: Hashable, response: ToolResponse, ttl: float | None) -> None:
+        expires_at = None if ttl is None else self._clock() + ttl
+        with self._lock:
+            self._entries[key] = _Entry(deepcopy(response), expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def middleware(
+        self, kwargs: dict[str, Any], next_handler: Callable[..., Any]
+    ) -> AsyncGenerator[ToolResponse, None]:
+        found = self._cache_key(kwargs["tool_call"])
+        if found is None:
+            async for response in await next_handler(**kwargs):
+                yield response
+            return
+        key, policy = found
+        cached = self.get(key)
+        if cached is not None:
+            self.hits += 1
+            yield cached
+            return
+        self.misses += 1
+        last: ToolResponse | None = None
+        async for response in await next_handler(**kwargs):
+            last = response
+            yield response
+        # Chunks are accumulative, so the last one is the complete result.
+        if last is not None and not last.is_interrupted:
+            self.put(key, last, policy.ttl)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
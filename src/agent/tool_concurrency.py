@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import inspect
+from dataclasses import replace
+from typing import Any, AsyncGenerator, Callable
+
+from agentscope.memory import InMemoryMemory
+from agentscope.tool import ToolResponse, Toolkit
+
+
+def _offloaded(fn: Callable[..., Any]) -> Callable[..., Any]:
+    @functools.wraps(fn)
+    async def run_in_thread(**kwargs: Any) -> Any:
+        return await asyncio.to_thread(fn, **kwargs)
+
+    return run_in_thread
+
+
+def offload_sync_tools(toolkit: Toolkit) -> None:
+    """Run plain sync tool functions in worker threads instead of on the event loop.
+
+    Without this a blocking tool stalls every other tool call gathered in the
+    same acting step. Generator tools are left alone.
+    """
+    for name, tool in list(toolkit.tools.items()):
+        fn = tool.original_func
+        if inspect.iscoroutinefunction(fn) or inspect.isgeneratorfunction(fn) or inspect.isasyncgenfunction(fn):
+            continue
+        toolkit.tools[name] = replace(tool, original_func=_offloaded(fn))
+
+
+def concurrency_limiter(limit: int) -> Callable[..., AsyncGenerator[ToolResponse, None]]:
+    """Toolkit middleware allowing at most ``limit`` tool calls to run at once."""
+    if limit < 1:
+        raise ValueError("limit must be >= 1.")
+    semaphore = asyncio.Semaphore(limit)
+
+    async def limit_tool_calls(
+        kwargs: dict[str, Any], next_handler: Callable[..., Any]
+    ) -> AsyncGenerator[ToolResponse, None]:
+        async with semaphore:
+            async for response in await next_handler(**kwargs):
+                yield response
+
+    return limit_tool_calls
+
+
+def order_tool_results(agent: Any, kwargs: dict[str, Any]) -> None:
+    """pre_reasoning hook: put concurrently finished tool results back in call order.
+
+    Parallel acting records each result as it completes; the next reasoning step
+    should see them in the order the model issued the calls.
+    """
+    memory = getattr(agent, "memory", None)
+    if not isinstance(memory, InMemoryMemory):
+        return
+    content = memory.content
+    end = len(content)
+    start = end
+    while start > 0 and _tool_result_id(content[start - 1][0]) is not None:
+        start -= 1
+    if end - start < 2 or start == 0:
+        return
+    call_ids = [
+        block.get("id")
+        for block in content[start - 1][0].get_content_blocks("tool_use")
+    ]
+    position = {call_id: index for index, call_id in enumerate(call_ids)}
+    content[start:end] = sorted(
+        content[start:end],
+        key=lambda item: position.get(_tool_result_id(item[0]), len(position)),
+    )
+
+
+def _tool_result_id(msg: Any) -> str | None:
+    if not isinstance(msg.content, list):
+        return None
+    blocks = [block for block in msg.content if isinstance(block, dict)]
+    if len(blocks) == 1 and blocks[0].get("type") == "tool_result":
+        return blocks[0].get("id")
+    return None
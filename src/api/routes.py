@@ -2,22 +2,33 @@
 from __future__ import annotations
 
 import json
-from typing import Any
+from contextlib import aclosing, asynccontextmanager
+from typing import Any, AsyncIterator
 
 from fastapi import FastAPI
 from fastapi.responses import StreamingResponse
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
-from agent.core import chat_stream
+from agent.core import chat_stream, flush_memory_writes
 from runtime.session import SessionContext
 
-app = FastAPI(title="Tilo Agent API")
+
+@asynccontextmanager
+async def _lifespan(_: FastAPI) -> AsyncIterator[None]:
+    yield
+    # 关闭前落盘后台写入队列中的对话记录
+    await flush_memory_writes()
+
+
+app = FastAPI(title="Tilo Agent API", lifespan=_lifespan)
 
 
 class ChatRequest(BaseModel):
     message: str
     session_id: str
     skills: list[str] | None = None
+    # 整轮超时（秒），必须为正数
+    timeout: float | None = Field(default=None, gt=0)
 
 
 @app.post("/chat/stream")
@@ -26,12 +37,17 @@ async def chat_stream_endpoint(request: ChatRequest) -> StreamingResponse:
     ctx = SessionContext(
         session_id=request.session_id,
         enabled_skills=request.skills,
+        timeout=request.timeout,
     )
 
     async def sse_generator() -> Any:
-        async for event in chat_stream(request.message, ctx):
-            payload = {"type": event.type, "data": event.data}
-            yield f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+        # 客户端断开时显式关闭 chat_stream，立即取消进行中的本轮
+        async with aclosing(chat_stream(request.message, ctx)) as events:
+            async for event in events:
+                payload: dict[str, Any] = {"type": event.type, "data": event.data}
+                if event.metadata:
+                    payload["metadata"] = event.metadata
+                yield f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
 
     return StreamingResponse(
         sse_generator(),
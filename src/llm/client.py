@@ -32,6 +32,22 @@ class BaseModel(Protocol):
         ...
 
 
+def detect_time_intent(text: str) -> bool:
+    lowered = text.lower()
+    keywords = ["time", "几点", "时间", "date", "today", "now", "current"]
+    return any(keyword in lowered for keyword in keywords)
+
+
+def extract_math_expression(text: str) -> str | None:
+    candidate = re.search(r"([0-9. ()+-/*]+[+\-*/][0-9. ()+-/*]+)", text)
+    if not candidate:
+        return None
+    expression = candidate.group(1).strip()
+    if expression:
+        return expression
+    return None
+
+
 class MockModel:
     stream = False
 
@@ -55,18 +71,10 @@ class MockModel:
         return ""
 
     def _detect_time_intent(self, text: str) -> bool:
-        lowered = text.lower()
-        keywords = ["time", "几点", "时间", "date", "today", "now", "current"]
-        return any(keyword in lowered for keyword in keywords)
+        return detect_time_intent(text)
 
     def _extract_math_expression(self, text: str) -> str | None:
-        candidate = re.search(r"([0-9. ()+-/*]+[+\-*/][0-9. ()+-/*]+)", text)
-        if not candidate:
-            return None
-        expression = candidate.group(1).strip()
-        if expression:
-            return expression
-        return None
+        return extract_math_expression(text)
 
     def _build_tool_use(self, name: str, args: Mapping[str, Any]) -> ToolUseBlock:
         return {
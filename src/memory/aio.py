@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Hashable, Iterable, TypeVar
+
+from runtime.file_access import normalize_user_id
+
+T = TypeVar("T")
+
+_IO_LOCK = threading.Lock()
+
+
+class OrderedExecutor:
+    """Thread pool where calls sharing a key run one at a time, in submission order.
+
+    Different keys run in parallel on up to ``max_workers`` threads. A worker
+    drains its key's backlog before picking up other work, so a call never
+    overtakes an earlier call with the same key.
+    """
+
+    def __init__(self, max_workers: int = 4, thread_name_prefix: str = "tilo-memory-io") -> None:
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+        self._lock = threading.Lock()
+        self._backlog: dict[Hashable, deque[tuple[Future[Any], Callable[[], Any]]]] = {}
+        self._closed = False
+
+    def submit(self, key: Hashable, fn: Callable[..., T], *args: Any) -> Future[T]:
+        future: Future[T] = Future()
+        job = (future, functools.partial(fn, *args))
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("OrderedExecutor is shut down.")
+            backlog = self._backlog.get(key)
+            if backlog is not None:
+                backlog.append(job)
+                return future
+            self._backlog[key] = deque()
+        self._pool.submit(self._drain, key, job)
+        return future
+
+    def _drain(self, key: Hashable, job: tuple[Future[Any], Callable[[], Any]]) -> None:
+        while True:
+            future, call = job
+            # Skips calls whose awaiting coroutine was cancelled before they started.
+            if future.set_running_or_notify_cancel():
+                try:
+                    result = call()
+                except BaseException as exc:
+                    future.set_exception(exc)
+                else:
+                    future.set_result(result)
+            with self._lock:
+                backlog = self._backlog[key]
+                if not backlog:
+                    del self._backlog[key]
+                    return
+                job = backlog.popleft()
+
+    def shutdown(self) -> None:
+        """Run everything already submitted, then stop the worker threads."""
+        with self._lock:
+            self._closed = True
+        self._pool.shutdown(wait=True)
+
+
+class AsyncStoreMixin:
+    """Coroutine variants of the blocking memory store calls.
+
+    They run on the store's own I/O threads (``io_workers``), so disk waits
+    never block the event loop or queue behind other ``asyncio.to_thread``
+    work. Calls for one session run in the order they were made: an ``aload``
+    sees every earlier ``aappend`` of that session.
+    """
+
+    io_workers = 4
+    _io: OrderedExecutor | None = None
+
+    def _io_executor(self) -> OrderedExecutor:
+        with _IO_LOCK:
+            if self._io is None:
+                self._io = OrderedExecutor(self.io_workers)
+            return self._io
+
+    def _close_io(self) -> None:
+        """Finish queued calls; a later call starts a fresh pool."""
+        with _IO_LOCK:
+            io, self._io = self._io, None
+        if io is not None:
+            io.shutdown()
+
+    async def arun(self, session_id: str, user_id: str, fn: Callable[..., T], *args: Any) -> T:
+        """Run ``fn(*args)`` in order with the session's other store calls."""
+        key = (normalize_user_id(user_id), session_id)
+        return await asyncio.wrap_future(self._io_executor().submit(key, fn, *args))
+
+    async def aload(
+        self,
+        session_id: str,
+        user_id: str = "default",
+        start: int | None = None,
+        stop: int | None = None,
+    ) -> list[dict[str, Any]]:
+        return await self.arun(session_id, user_id, self.load, session_id, user_id, start, stop)
+
+    async def aappend(self, session_id: str, record: dict[str, Any], user_id: str = "default") -> None:
+        await self.arun(session_id, user_id, self.append, session_id, record, user_id)
+
+    async def aappend_many(
+        self, session_id: str, records: Iterable[dict[str, Any]], user_id: str = "default"
+    ) -> None:
+        # Materialized here: a lazy iterable must not be consumed on another thread.
+        await self.arun(session_id, user_id, self.append_many, session_id, list(records), user_id)
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Protocol
+
+try:
+    import orjson
+except (ImportError, ModuleNotFoundError):
+    orjson = None
+
+CODEC_NAMES = ("json", "orjson", "auto")
+
+
+class RecordCodec(Protocol):
+    """Turns memory records into single-line UTF-8 JSON and back."""
+
+    name: str
+
+    def encode(self, record: dict[str, Any]) -> bytes:
+        """One record, without the trailing newline."""
+        ...
+
+    def decode(self, line: bytes) -> dict[str, Any]:
+        ...
+
+    def decode_lines(self, data: bytes) -> list[dict[str, Any]]:
+        """Every record in a newline-separated buffer; blank lines are skipped."""
+        ...
+
+
+def _as_array(data: bytes) -> bytes:
+    # Encoded records never contain a raw newline, so the buffer becomes one JSON array.
+    return b"[" + data.strip().replace(b"\n", b",") + b"]"
+
+
+class JsonCodec:
+    """Stdlib ``json`` with ``ensure_ascii=False``; the on-disk format the store always wrote."""
+
+    name = "json"
+
+    def encode(self, record: dict[str, Any]) -> bytes:
+        return json.dumps(record, ensure_ascii=False).encode("utf-8")
+
+    def decode(self, line: bytes) -> dict[str, Any]:
+        return json.loads(line)
+
+    def decode_lines(self, data: bytes) -> list[dict[str, Any]]:
+        if not data.strip():
+            return []
+        try:
+            return json.loads(_as_array(data))
+        except ValueError:
+            # Blank or whitespace-only lines break the array form; decode line by line.
+            return [json.loads(line) for line in data.splitlines() if line.strip()]
+
+
+class OrjsonCodec:
+    """``orjson``: compact separators, non-ASCII kept as UTF-8, str keys only."""
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        if orjson is None:
+            raise ValueError("The 'orjson' codec needs the orjson package (pip install orjson).")
+
+    def encode(self, record: dict[str, Any]) -> bytes:
+        return orjson.dumps(record)
+
+    def decode(self, line: bytes) -> dict[str, Any]:
+        return orjson.loads(line)
+
+    def decode_lines(self, data: bytes) -> list[dict[str, Any]]:
+        if not data.strip():
+            return []
+        try:
+            return orjson.loads(_as_array(data))
+        except ValueError:
+            return [orjson.loads(line) for line in data.splitlines() if line.strip()]
+
+
+def resolve_codec(codec: str | RecordCodec = "json") -> RecordCodec:
+    """Codec by name; ``"auto"`` picks orjson when it is installed and json otherwise."""
+    if not isinstance(codec, str):
+        return codec
+    if codec == "json":
+        return JsonCodec()
+    if codec == "orjson":
+        return OrjsonCodec()
+    if codec == "auto":
+        return JsonCodec() if orjson is None else OrjsonCodec()
+    raise ValueError(f"Unknown record codec: {codec!r} (expected one of {CODEC_NAMES})")
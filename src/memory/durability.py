@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Literal
+
+DurabilityMode = Literal["none", "per_append", "group"]
+
+_GROUP_RE = re.compile(r"group(?:\((\d+(?:\.\d+)?)\))?")
+
+
+@dataclass(frozen=True)
+class Durability:
+    """When appended records are fsynced.
+
+    ``none`` leaves it to the OS, ``per_append`` fsyncs before each append
+    returns, ``group`` fsyncs dirty files together every ``interval_ms`` on a
+    background thread (a crash may lose at most that window).
+    """
+
+    mode: DurabilityMode = "none"
+    interval_ms: float = 50.0
+
+    @classmethod
+    def parse(cls, value: str | Durability) -> Durability:
+        """Accept ``none``, ``per_append``, ``group`` or ``group(<interval_ms>)``."""
+        if isinstance(value, Durability):
+            return value
+        text = value.strip().lower()
+        if text in ("none", "per_append"):
+            return cls(mode=text)  # type: ignore[arg-type]
+        match = _GROUP_RE.fullmatch(text)
+        if match is None:
+            raise ValueError(f"Unknown durability policy: {value!r}")
+        interval = float(match.group(1)) if match.group(1) else cls.interval_ms
+        if interval <= 0:
+            raise ValueError("group interval must be > 0 ms.")
+        return cls(mode="group", interval_ms=interval)
+
+
+class FsyncStats:
+    """Count and latency of fsync calls."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.total_seconds += seconds
+            self.max_seconds = max(self.max_seconds, seconds)
+
+    def to_dict(self) -> dict[str, Any]:
+        with self._lock:
+            mean = self.total_seconds / self.count if self.count else 0.0
+            return {
+                "count": self.count,
+                "total_seconds": self.total_seconds,
+                "mean_seconds": mean,
+                "max_seconds": self.max_seconds,
+            }
+
+
+def timed_fsync(fd: int, stats: FsyncStats) -> None:
+    start = time.perf_counter()
+    os.fsync(fd)
+    stats.record(time.perf_counter() - start)
+
+
+def fsync_path(path: Path, stats: FsyncStats) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        timed_fsync(fd, stats)
+    finally:
+        os.close(fd)
+
+
+class GroupFlusher:
+    """Background thread that fsyncs every file marked dirty once per interval."""
+
+    def __init__(self, interval: float, stats: FsyncStats) -> None:
+        self.interval = interval
+        self.stats = stats
+        self._dirty: set[Path] = set()
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+
+    def mark_dirty(self, path: Path) -> None:
+        with self._cond:
+            self._dirty.add(path)
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(target=self._run, name="tilo-memory-fsync", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def flush(self) -> None:
+        """fsync everything dirty now, in the calling thread."""
+        with self._cond:
+            dirty, self._dirty = self._dirty, set()
+        for path in dirty:
+            try:
+                fsync_path(path, self.stats)
+            except FileNotFoundError:
+                continue
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            thread = self._thread
+            self._cond.notify()
+        if thread is not None:
+            thread.join()
+        self.flush()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._dirty and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                # Collect everything that turns dirty within one interval into one round.
+                deadline = time.monotonic() + self.interval
+                while not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(timeout=remaining)
+                if self._closed:
+                    return
+            self.flush()
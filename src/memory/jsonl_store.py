@@ -1,16 +1,277 @@
 from __future__ import annotations
 
+import gzip
 import json
+import logging
+import lzma
+import os
+import re
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from array import array
+from itertools import islice
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO, Callable, Iterable, Iterator
 
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, rely on one store per directory
+    fcntl = None
+
+from memory.aio import AsyncStoreMixin, OrderedExecutor
+from memory.codec import RecordCodec, resolve_codec
+from memory.durability import Durability, FsyncStats, GroupFlusher, fsync_path, timed_fsync
+from memory.search import SearchHit, SearchIndex
 from runtime.file_access import normalize_user_id
 
+_logger = logging.getLogger(__name__)
+
+
+_OFFSET_SIZE = array("Q").itemsize
+# Windows opens descriptors in text mode unless asked not to.
+_O_BINARY = getattr(os, "O_BINARY", 0)
+
+
+def _same_file(fd: int, path: Path) -> bool:
+    """Whether ``fd`` is still the file at ``path`` (not rotated, replaced or removed since)."""
+    try:
+        current = os.stat(path)
+    except FileNotFoundError:
+        return False
+    opened = os.fstat(fd)
+    return (opened.st_ino, opened.st_dev) == (current.st_ino, current.st_dev)
+
+
+class _HandlePool:
+    """LRU of open descriptors keyed by path; callers hold the store lock."""
+
+    def __init__(
+        self, max_open: int, idle_seconds: float, clock: Callable[[], float], flags: int
+    ) -> None:
+        if max_open < 1:
+            raise ValueError("max_open_handles must be >= 1.")
+        self.max_open = max_open
+        self.idle_seconds = idle_seconds
+        self.flags = flags
+        self._clock = clock
+        self._fds: OrderedDict[Path, tuple[int, float]] = OrderedDict()
+
+    def acquire(self, path: Path) -> int:
+        now = self._clock()
+        self._evict_idle(now)
+        entry = self._fds.pop(path, None)
+        if entry is not None and not _same_file(entry[0], path):
+            # Another store or process moved the file away since it was opened.
+            os.close(entry[0])
+            entry = None
+        if entry is None:
+            if self.flags & os.O_CREAT:
+                path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(path, self.flags, 0o644)
+        else:
+            fd = entry[0]
+        self._fds[path] = (fd, now)
+        while len(self._fds) > self.max_open:
+            _, (old_fd, _) = self._fds.popitem(last=False)
+            os.close(old_fd)
+        return fd
+
+    def holds(self, path: Path, fd: int) -> bool:
+        entry = self._fds.get(path)
+        return entry is not None and entry[0] == fd
+
+    def discard(self, path: Path) -> None:
+        entry = self._fds.pop(path, None)
+        if entry is not None:
+            os.close(entry[0])
+
+    def _evict_idle(self, now: float) -> None:
+        while self._fds:
+            path, (fd, last_used) = next(iter(self._fds.items()))
+            if now - last_used < self.idle_seconds:
+                return
+            del self._fds[path]
+            os.close(fd)
+
+    def close_all(self) -> None:
+        while self._fds:
+            _, (fd, _) = self._fds.popitem(last=False)
+            os.close(fd)
+
+    def __len__(self) -> int:
+        return len(self._fds)
+
+
+_TAIL_BLOCK_SIZE = 64 * 1024
+
+# Sealed segment ``<end>.seg[.gz|.xz]`` holds the records before index ``end``.
+_SEGMENT_NAME = re.compile(r"^(\d+)\.seg(\.gz|\.xz)?$")
+_COMPRESSORS: dict[str, tuple[str, Callable[..., BinaryIO]]] = {
+    "gzip": (".gz", gzip.open),
+    "lzma": (".xz", lzma.open),
+}
+_OPENERS: dict[str, Callable[..., BinaryIO]] = {".gz": gzip.open, ".xz": lzma.open}
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    written = os.write(fd, data)
+    while written < len(data):
+        written += os.write(fd, data[written:])
+
+
+def _open_segment(path: Path) -> BinaryIO:
+    """Open a sealed segment for reading; compressed ones decompress as they are read."""
+    candidates = [path]
+    if path.suffix == ".seg":
+        # Compressed (and the plain copy removed) after it was listed.
+        candidates += [path.with_name(path.name + suffix) for suffix in _OPENERS]
+    for candidate in candidates:
+        try:
+            return _OPENERS.get(candidate.suffix, open)(candidate, "rb")
+        except FileNotFoundError:
+            continue
+    raise FileNotFoundError(path)
 
-class JsonlMemoryStore:
-    def __init__(self, base_dir: Path | None = None) -> None:
+
+def _segment_lines(path: Path) -> Iterator[bytes]:
+    """Stream the non-blank lines of a sealed segment."""
+    with _open_segment(path) as fh:
+        for line in fh:
+            if line.strip():
+                yield line
+
+
+def _reversed_lines(fh: BinaryIO, block_size: int = _TAIL_BLOCK_SIZE) -> Iterator[bytes]:
+    """Yield the non-blank lines of an open file last-first, reading fixed-size blocks from the end."""
+    with fh:
+        position = fh.seek(0, os.SEEK_END)
+        partial = b""
+        while position > 0:
+            step = min(block_size, position)
+            position -= step
+            fh.seek(position)
+            lines = (fh.read(step) + partial).split(b"\n")
+            # The first piece may continue in the previous block.
+            partial = lines.pop(0)
+            for line in reversed(lines):
+                if line.strip():
+                    yield line
+        if partial.strip():
+            yield partial
+
+
+def _log_compression_failure(future: Future[None]) -> None:
+    # The plain segment stays in place and readable.
+    if future.exception() is not None:
+        _logger.error("Failed to compress sealed segment", exc_info=future.exception())
+
+
+class JsonlMemoryStore(AsyncStoreMixin):
+    """One JSONL file per session, plus a ``.idx`` sidecar of record byte offsets.
+
+    The sidecar is a native ``uint64`` array: the data file size it covers,
+    followed by the start offset of every record. Appends extend it; a missing
+    or stale sidecar (covered size != file size) is rebuilt on the next read.
+    ``durability`` controls fsync of session files (see ``Durability``); the
+    sidecar is never fsynced since it can always be rebuilt.
+
+    Append descriptors stay open in a bounded LRU (``max_open_handles``); a
+    background thread, running only while descriptors are open, closes those
+    unused for ``handle_idle_seconds`` (checked once per that period, so within
+    twice the limit). ``close()`` (or leaving a ``with`` block) releases them all. A closed store reopens handles lazily.
+    Appends and rotations hold an advisory ``flock`` on the session file, and
+    a pooled descriptor whose file was rotated or replaced is reopened, so
+    other stores or processes appending to the same directory lose nothing.
+
+    With ``segment_max_bytes`` set, a session file that reaches that size is
+    sealed into ``<session>.segments/<end>.seg`` (``end`` = records so far) and
+    compressed on a background thread with ``compression`` ("gzip", "lzma" or
+    None); appends continue in a fresh ``<session>.jsonl``. Reads span all
+    segments, and older segments are only decompressed when a read actually
+    reaches them.
+
+    ``codec`` ("json", "orjson", "auto" or a ``RecordCodec``) encodes and decodes
+    record lines; all codecs write single-line UTF-8 JSON, so files stay
+    readable whichever codec wrote them.
+
+    ``search()`` answers from a per-user inverted index in
+    ``<base_dir>/.search/<user>.sqlite3``. With ``search_index=True`` appends
+    update it as they land; either way a search first indexes whatever records
+    it has not seen yet.
+    """
+
+    def __init__(
+        self,
+        base_dir: Path | None = None,
+        durability: str | Durability = "none",
+        max_open_handles: int = 64,
+        handle_idle_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+        segment_max_bytes: int | None = None,
+        compression: str | None = "gzip",
+        codec: str | RecordCodec = "json",
+        search_index: bool = False,
+    ) -> None:
+        if segment_max_bytes is not None and segment_max_bytes < 1:
+            raise ValueError("segment_max_bytes must be >= 1.")
+        if compression is not None and compression not in _COMPRESSORS:
+            raise ValueError(f"Unknown compression: {compression!r} (expected 'gzip', 'lzma' or None)")
         self.base_dir = (base_dir or Path.cwd() / "data").resolve()
         self.base_dir.mkdir(parents=True, exist_ok=True)
+        self.durability = Durability.parse(durability)
+        self.segment_max_bytes = segment_max_bytes
+        self.compression = compression
+        self.codec = resolve_codec(codec)
+        self.search_index = search_index
+        self._search_indexes: dict[str, SearchIndex] = {}
+        self.fsync_stats = FsyncStats()
+        self._flusher = self._new_flusher()
+        self._handles = _HandlePool(
+            max_open_handles, handle_idle_seconds, clock, os.O_WRONLY | os.O_APPEND | os.O_CREAT | _O_BINARY
+        )
+        # Index sidecars are patched in place on every append, so keep those open too.
+        self._index_handles = _HandlePool(
+            max_open_handles, handle_idle_seconds, clock, os.O_RDWR | _O_BINARY
+        )
+        self._clock = clock
+        self._reaper: threading.Thread | None = None
+        self._reaper_stop = threading.Event()
+        self._compressor: OrderedExecutor | None = None
+        # Reentrant: reads snapshot the segment layout under it and may rebuild an index.
+        self._lock = threading.RLock()
+
+    def _new_flusher(self) -> GroupFlusher | None:
+        if self.durability.mode != "group":
+            return None
+        return GroupFlusher(self.durability.interval_ms / 1000, self.fsync_stats)
+
+    def close(self) -> None:
+        """Close pooled append handles and fsync anything the group flusher still owes."""
+        # Queued async calls finish first; they may still need the handles.
+        self._close_io()
+        with self._lock:
+            self._handles.close_all()
+            self._index_handles.close_all()
+            self._reaper_stop.set()
+            self._reaper = None
+            flusher, self._flusher = self._flusher, self._new_flusher()
+            indexes, self._search_indexes = self._search_indexes, {}
+            compressor, self._compressor = self._compressor, None
+        if compressor is not None:
+            compressor.shutdown()
+        for index in indexes.values():
+            index.close()
+        if flusher is not None:
+            flusher.close()
+
+    def __enter__(self) -> JsonlMemoryStore:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
 
     def _path(self, session_id: str, user_id: str = "default") -> Path:
         safe_user_id = normalize_user_id(user_id)
@@ -21,14 +282,280 @@ class JsonlMemoryStore:
     def _legacy_path(self, session_id: str) -> Path:
         return self.base_dir / f"{session_id}.jsonl"
 
+    def _fsync_dir(self, directory: Path) -> None:
+        # Makes a newly created session file's directory entry durable too.
+        if os.name == "nt":
+            return  # directories cannot be opened (or fsynced) on Windows
+        fd = os.open(directory, os.O_RDONLY)
+        try:
+            timed_fsync(fd, self.fsync_stats)
+        finally:
+            os.close(fd)
+
+    def sync(self) -> None:
+        """fsync files still waiting for the group flusher (no-op for other policies)."""
+        if self._flusher is not None:
+            self._flusher.flush()
+
+    @staticmethod
+    def _index_path(path: Path) -> Path:
+        return path.with_suffix(".idx")
+
+    @staticmethod
+    def _segments_dir(path: Path) -> Path:
+        return path.with_suffix(".segments")
+
+    def _sealed_segments(self, path: Path) -> list[tuple[int, Path]]:
+        """``(end, path)`` of each sealed segment, oldest first."""
+        try:
+            names = os.listdir(self._segments_dir(path))
+        except FileNotFoundError:
+            return []
+        found: dict[int, Path] = {}
+        for name in names:
+            match = _SEGMENT_NAME.match(name)
+            if match is None:
+                continue
+            end = int(match.group(1))
+            # Mid-compression both copies exist; the compressed one is complete once visible.
+            if end not in found or match.group(2):
+                found[end] = self._segments_dir(path) / name
+        return sorted(found.items())
+
     def append(self, session_id: str, record: dict[str, Any], user_id: str = "default") -> None:
+        self._write_records(session_id, user_id, [record])
+
+    def append_many(
+        self, session_id: str, records: Iterable[dict[str, Any]], user_id: str = "default"
+    ) -> None:
+        """Append records with a single ``write`` of one buffer, so a batch lands whole."""
+        self._write_records(session_id, user_id, list(records))
+
+    def _write_records(self, session_id: str, user_id: str, records: list[dict[str, Any]]) -> None:
         path = self._path(session_id, user_id=user_id)
-        path.parent.mkdir(parents=True, exist_ok=True)
-        with path.open("a", encoding="utf-8") as fh:
-            fh.write(json.dumps(record, ensure_ascii=False))
-            fh.write("\n")
+        encode = self.codec.encode
+        lines = [encode(record) + b"\n" for record in records]
+        if not lines:
+            return
+        buffer = b"".join(lines)
+        with self._lock:
+            fd = self._lock_log(path)
+            self._watch_idle_handles()
+            try:
+                try:
+                    _write_all(fd, buffer)
+                    # With O_APPEND the write lands at the current end; derive where it started.
+                    old_size = os.lseek(fd, 0, os.SEEK_CUR) - len(buffer)
+                    if self.durability.mode == "per_append":
+                        timed_fsync(fd, self.fsync_stats)
+                        if old_size == 0:
+                            self._fsync_dir(path.parent)
+                except BaseException:
+                    self._handles.discard(path)
+                    raise
+                if self._flusher is not None:
+                    self._flusher.mark_dirty(path)
+                offsets = array("Q")
+                position = old_size
+                for line in lines:
+                    offsets.append(position)
+                    position += len(line)
+                self._extend_index(path, old_size, position, offsets)
+                first = None
+                if self.search_index:
+                    sealed = self._sealed_segments(path)
+                    first = (sealed[-1][0] if sealed else 0) + self._active_count(path) - len(records)
+                sealed = None
+                if self.segment_max_bytes is not None and position >= self.segment_max_bytes:
+                    sealed = self._rotate(path, fd)
+            finally:
+                # A discarded descriptor (error, rotation) released its lock when it closed.
+                if fcntl is not None and self._handles.holds(path, fd):
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+        if sealed is not None and self.compression is not None:
+            self._compress_in_background(sealed)
+        if first is not None:
+            try:
+                self._search(user_id).add(session_id, first, records)
+            except Exception:
+                # The records are on disk; the next search() indexes them instead.
+                _logger.exception("Failed to index records for session %s", session_id)
+
+    def _watch_idle_handles(self) -> None:
+        """Start the idle-descriptor reaper unless it is running; store lock held."""
+        if self._reaper is not None or self._handles.idle_seconds <= 0:
+            return
+        stop = self._reaper_stop = threading.Event()
+        self._reaper = threading.Thread(
+            target=self._reap_idle_handles, args=(stop,), name="tilo-memory-reaper", daemon=True
+        )
+        self._reaper.start()
+
+    def _reap_idle_handles(self, stop: threading.Event) -> None:
+        while not stop.wait(self._handles.idle_seconds):
+            with self._lock:
+                if stop.is_set():
+                    return
+                now = self._clock()
+                self._handles._evict_idle(now)
+                self._index_handles._evict_idle(now)
+                if not self._handles and not self._index_handles:
+                    # Nothing left to watch; the next append starts a new reaper.
+                    self._reaper = None
+                    return
+
+    def _lock_log(self, path: Path) -> int:
+        """Pooled append descriptor of ``path``, holding its ``flock``; store lock held.
+
+        If another store rotated the file while we waited for the lock, the
+        descriptor now points at the sealed segment and is reopened.
+        """
+        while True:
+            fd = self._handles.acquire(path)
+            if fcntl is None:
+                return fd
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            if _same_file(fd, path):
+                return fd
+            self._handles.discard(path)
+
+    def _rotate(self, path: Path, fd: int) -> Path:
+        """Seal the active file as the next segment and start an empty one; locks held."""
+        if self.durability.mode != "none":
+            timed_fsync(fd, self.fsync_stats)
+        sealed = self._sealed_segments(path)
+        end = (sealed[-1][0] if sealed else 0) + self._active_count(path)
+        directory = self._segments_dir(path)
+        directory.mkdir(exist_ok=True)
+        target = directory / f"{end:012d}.seg"
+        os.replace(path, target)
+        self._index_path(path).unlink(missing_ok=True)
+        # Keep the session visible to directory scans (e.g. migrate_jsonl).
+        path.touch()
+        # Closing drops the flock only now, so waiting writers find the fresh file.
+        self._handles.discard(path)
+        self._index_handles.discard(self._index_path(path))
+        if self.durability.mode == "per_append":
+            self._fsync_dir(directory)
+            self._fsync_dir(path.parent)
+        return target
+
+    def _compress_in_background(self, sealed: Path) -> None:
+        """Queue ``sealed`` for compression so appends never wait on gzip/lzma.
+
+        Readers fall back to the plain copy until the compressed one replaces it;
+        ``close()`` waits for queued compressions.
+        """
+        with self._lock:
+            if self._compressor is None:
+                self._compressor = OrderedExecutor(max_workers=1, thread_name_prefix="tilo-memory-compress")
+            future = self._compressor.submit(sealed.parent, self._compress_segment, sealed)
+        future.add_done_callback(_log_compression_failure)
+
+    def _compress_segment(self, sealed: Path) -> None:
+        suffix, opener = _COMPRESSORS[self.compression]
+        target = sealed.with_name(sealed.name + suffix)
+        tmp_path = target.with_name(target.name + ".tmp")
+        with sealed.open("rb") as src, opener(tmp_path, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        if self.durability.mode != "none":
+            fsync_path(tmp_path, self.fsync_stats)
+        os.replace(tmp_path, target)
+        sealed.unlink()
+
+    def _extend_index(self, path: Path, old_size: int, new_size: int, offsets: array) -> None:
+        index_path = self._index_path(path)
+        if old_size == 0:
+            self._write_index(path, new_size, offsets)
+            return
+        try:
+            fd = self._index_handles.acquire(index_path)
+        except FileNotFoundError:
+            return
+        try:
+            header = array("Q")
+            os.lseek(fd, 0, os.SEEK_SET)
+            header.frombytes(os.read(fd, _OFFSET_SIZE))
+            if header[0] != old_size:
+                return  # stale already; rebuilt lazily on the next read
+            os.lseek(fd, 0, os.SEEK_END)
+            _write_all(fd, offsets.tobytes())
+            # Header last: a crash in between leaves a detectably stale index.
+            os.lseek(fd, 0, os.SEEK_SET)
+            _write_all(fd, array("Q", [new_size]).tobytes())
+        except (IndexError, OSError):
+            self._index_handles.discard(index_path)
+
+    def _write_index(self, path: Path, size: int, offsets: array) -> None:
+        index_path = self._index_path(path)
+        tmp_path = index_path.with_name(index_path.name + ".tmp")
+        tmp_path.write_bytes(array("Q", [size]).tobytes() + offsets.tobytes())
+        os.replace(tmp_path, index_path)
+        # A pooled descriptor would still point at the replaced file.
+        self._index_handles.discard(index_path)
+
+    def _rebuild_index(self, path: Path) -> int:
+        offsets = array("Q")
+        position = 0
+        with path.open("rb") as fh:
+            for line in fh:
+                if line.strip():
+                    offsets.append(position)
+                position += len(line)
+        self._write_index(path, position, offsets)
+        return position
+
+    def _valid_index(self, path: Path) -> int:
+        """Return the data size, making sure the sidecar covers exactly that size."""
+        size = path.stat().st_size
+        try:
+            with self._index_path(path).open("rb") as fh:
+                header = array("Q")
+                header.frombytes(fh.read(_OFFSET_SIZE))
+            if header[0] == size:
+                return size
+        except (FileNotFoundError, IndexError, ValueError):
+            pass
+        with self._lock:
+            return self._rebuild_index(path)
+
+    def _read_offsets(self, path: Path, start: int, stop: int) -> array:
+        offsets = array("Q")
+        with self._index_path(path).open("rb") as fh:
+            fh.seek(_OFFSET_SIZE * (1 + start))
+            offsets.frombytes(fh.read(_OFFSET_SIZE * (stop - start)))
+        return offsets
+
+    def _active_count(self, path: Path) -> int:
+        try:
+            self._valid_index(path)
+        except FileNotFoundError:
+            return 0
+        return self._index_path(path).stat().st_size // _OFFSET_SIZE - 1
+
+    def _open_active(self, path: Path) -> BinaryIO | None:
+        try:
+            return path.open("rb")
+        except FileNotFoundError:
+            return None
+
+    def count(self, session_id: str, user_id: str = "default") -> int:
+        """Number of records, from segment names and the index size alone."""
+        path = self._resolve_read_path(session_id, user_id=user_id)
+        if path is None:
+            return 0
+        with self._lock:
+            sealed = self._sealed_segments(path)
+            return (sealed[-1][0] if sealed else 0) + self._active_count(path)
 
-    def load(self, session_id: str, user_id: str = "default") -> list[dict[str, Any]]:
+    def get(self, session_id: str, index: int, user_id: str = "default") -> dict[str, Any]:
+        """Record ``index`` (negative counts from the end); raises IndexError."""
+        records = self.load(session_id, user_id=user_id, start=index, stop=index + 1 or None)
+        if not records:
+            raise IndexError("record index out of range")
+        return records[0]
+
+    def _resolve_read_path(self, session_id: str, user_id: str = "default") -> Path | None:
         path = self._path(session_id, user_id=user_id)
         if not path.exists():
             safe_user_id = normalize_user_id(user_id)
@@ -37,6 +564,145 @@ class JsonlMemoryStore:
                 if legacy_path.exists():
                     path = legacy_path
         if not path.exists():
+            return None
+        return path
+
+    def load(
+        self,
+        session_id: str,
+        user_id: str = "default",
+        start: int | None = None,
+        stop: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """Load records, or only the ``records[start:stop]`` slice via segment names and the offset index."""
+        path = self._resolve_read_path(session_id, user_id=user_id)
+        if path is None:
+            return []
+        if start is None and stop is None:
+            # Snapshot under the lock: a rotation moves the active file into a segment.
+            with self._lock:
+                sealed = self._sealed_segments(path)
+                active = self._open_active(path)
+            records: list[dict[str, Any]] = []
+            # Whole buffers go to the codec at once instead of one decode call per line.
+            for _, segment in sealed:
+                with _open_segment(segment) as fh:
+                    records.extend(self.codec.decode_lines(fh.read()))
+            if active is not None:
+                with active:
+                    records.extend(self.codec.decode_lines(active.read()))
+            return records
+        with self._lock:
+            sealed = self._sealed_segments(path)
+            base = sealed[-1][0] if sealed else 0
+            active_total = self._active_count(path)
+            selected = range(base + active_total)[start:stop]
+            if not selected:
+                return []
+            first, last = selected[0], selected[-1] + 1
+            chunk = b""
+            if last > base:
+                chunk = self._read_active_slice(path, max(first - base, 0), last - base, active_total)
+        records = self._read_sealed_slice(sealed, first, min(last, base)) if first < base else []
+        records.extend(self.codec.decode_lines(chunk))
+        return records
+
+    def _read_active_slice(self, path: Path, first: int, last: int, total: int) -> bytes:
+        offsets = self._read_offsets(path, first, min(last + 1, total))
+        end = offsets[-1] if last < total else self._valid_index(path)
+        with path.open("rb") as fh:
+            fh.seek(offsets[0])
+            return fh.read(end - offsets[0])
+
+    def _read_sealed_slice(self, sealed: list[tuple[int, Path]], first: int, last: int) -> list[dict[str, Any]]:
+        records: list[dict[str, Any]] = []
+        segment_start = 0
+        for end, segment in sealed:
+            # Segments wholly outside [first, last) are never opened, let alone decompressed.
+            if end > first and segment_start < last:
+                lines = islice(_segment_lines(segment), max(first - segment_start, 0), min(last, end) - segment_start)
+                records.extend(self.codec.decode_lines(b"".join(lines)))
+            segment_start = end
+        return records
+
+    def _recent_lines(self, session_id: str, user_id: str = "default") -> Iterator[bytes]:
+        path = self._resolve_read_path(session_id, user_id=user_id)
+        if path is None:
+            return
+        with self._lock:
+            sealed = self._sealed_segments(path)
+            active = self._open_active(path)
+        if active is not None:
+            yield from _reversed_lines(active)
+        for _, segment in reversed(sealed):
+            # Compressed streams only read forwards; one segment is decoded at a time.
+            yield from reversed(list(_segment_lines(segment)))
+
+    def iter_recent(self, session_id: str, user_id: str = "default") -> Iterator[dict[str, Any]]:
+        """Yield records newest first, reading and decoding only as far back as requested."""
+        for line in self._recent_lines(session_id, user_id=user_id):
+            yield self.codec.decode(line)
+
+    def load_tail(self, session_id: str, n: int, user_id: str = "default") -> list[dict[str, Any]]:
+        """Last ``n`` records in file order, read backwards in blocks without the index."""
+        if n <= 0:
             return []
-        with path.open("r", encoding="utf-8") as fh:
-            return [json.loads(line) for line in fh if line.strip()]
+        tail = list(islice(self._recent_lines(session_id, user_id=user_id), n))
+        tail.reverse()
+        # Segment lines keep their newline, active-file lines do not.
+        return self.codec.decode_lines(b"\n".join(line.rstrip() for line in tail))
+
+    def _search(self, user_id: str) -> SearchIndex:
+        safe_user_id = normalize_user_id(user_id)
+        with self._lock:
+            index = self._search_indexes.get(safe_user_id)
+            if index is None:
+                path = self.base_dir / ".search" / f"{safe_user_id}.sqlite3"
+                index = self._search_indexes[safe_user_id] = SearchIndex(path)
+            return index
+
+    def _session_ids(self, user_id: str) -> list[str]:
+        safe_user_id = normalize_user_id(user_id)
+        directory = self.base_dir if safe_user_id == "default" else self.base_dir / safe_user_id
+        return sorted(path.stem for path in directory.glob("*.jsonl"))
+
+    def _catch_up(self, index: SearchIndex, session_id: str, user_id: str) -> None:
+        total = self.count(session_id, user_id=user_id)
+        indexed = index.indexed(session_id)
+        if total < indexed:
+            # The log was replaced behind the index's back; start over.
+            index.drop(session_id)
+            indexed = 0
+        if total > indexed:
+            index.add(session_id, indexed, self.load(session_id, user_id=user_id, start=indexed))
+
+    def search(
+        self, user_id: str, query: str, limit: int = 10, session_id: str | None = None
+    ) -> list[SearchHit]:
+        """Records of the user's sessions (or only ``session_id``) ranked by BM25 against ``query``.
+
+        Only sessions stored under the user's own directory are searched.
+        """
+        index = self._search(user_id)
+        for searched in self._session_ids(user_id) if session_id is None else [session_id]:
+            self._catch_up(index, searched, user_id)
+        return [
+            SearchHit(hit_session, seq, score, self.get(hit_session, seq, user_id=user_id))
+            for hit_session, seq, score in index.search(query, limit, session_id=session_id)
+        ]
+
+    def _summary_path(self, session_id: str, user_id: str = "default") -> Path:
+        return self._path(session_id, user_id=user_id).with_suffix(".summary.json")
+
+    def load_summary(self, session_id: str, user_id: str = "default") -> dict[str, Any] | None:
+        path = self._summary_path(session_id, user_id=user_id)
+        if not path.exists():
+            return None
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def save_summary(self, session_id: str, summary: dict[str, Any], user_id: str = "default") -> None:
+        path = self._summary_path(session_id, user_id=user_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text(json.dumps(summary, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, path)
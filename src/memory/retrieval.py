@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from memory.window import select_window
+
+if TYPE_CHECKING:
+    from memory.jsonl_store import JsonlMemoryStore
+
+# Hits fetched per requested turn; several hits often fall into the same turn.
+_HITS_PER_TURN = 4
+
+
+def retrieval_record(count: int) -> dict[str, Any]:
+    """History record introducing the retrieved turns that follow it."""
+    return {
+        "role": "system",
+        "name": "retrieval",
+        "content": (
+            f"The next {count} earlier turn(s) were retrieved because they look relevant to the "
+            "current message; they are excerpts, not a contiguous conversation."
+        ),
+    }
+
+
+def _turn_at(
+    store: JsonlMemoryStore, session_id: str, index: int, user_id: str
+) -> tuple[int, list[dict[str, Any]]]:
+    """(start, records) of the user/assistant turn containing record ``index``."""
+    first = max(index - 1, 0)
+    around = store.load(session_id, user_id=user_id, start=first, stop=index + 2)
+    offset = index - first
+    if around[offset].get("role") == "user":
+        if offset + 1 < len(around) and around[offset + 1].get("role") == "assistant":
+            return index, around[offset : offset + 2]
+        return index, around[offset : offset + 1]
+    if offset and around[offset - 1].get("role") == "user":
+        return index - 1, around[offset - 1 : offset + 1]
+    return index, around[offset : offset + 1]
+
+
+def load_relevant_history(
+    store: JsonlMemoryStore,
+    session_id: str,
+    query: str,
+    top_k: int,
+    recent_turns: int = 2,
+    user_id: str = "default",
+    cross_session: bool = False,
+) -> list[dict[str, Any]]:
+    """Last ``recent_turns`` turns, preceded by the ``top_k`` older turns most relevant to ``query``.
+
+    Relevance is BM25 over the store's search index, within the session or,
+    with ``cross_session``, over all of the user's sessions. Retrieved turns
+    from other sessions come first, then this session's in order.
+    """
+    recent = select_window(store.iter_recent(session_id, user_id=user_id), max_turns=recent_turns)
+    recent_start = store.count(session_id, user_id=user_id) - len(recent)
+    hits = []
+    if top_k > 0:
+        scope = None if cross_session else session_id
+        hits = store.search(user_id, query, limit=top_k * _HITS_PER_TURN, session_id=scope)
+    turns: dict[tuple[str, int], list[dict[str, Any]]] = {}
+    for hit in hits:
+        if len(turns) == top_k:
+            break
+        if hit.session_id == session_id and hit.index >= recent_start:
+            continue  # already part of the recent window
+        start, records = _turn_at(store, hit.session_id, hit.index, user_id)
+        turns.setdefault((hit.session_id, start), records)
+    if not turns:
+        return recent
+    ordered = sorted(turns, key=lambda key: (key[0] == session_id, key))
+    retrieved = [record for key in ordered for record in turns[key]]
+    return [retrieval_record(len(turns)), *retrieved, *recent]
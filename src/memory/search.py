@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import heapq
+import math
+import re
+import sqlite3
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable
+
+# Runs of Han, kana and Hangul (which are split into n-grams), or any other Unicode words.
+_CJK = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uac00-\ud7af"
+_TOKEN = re.compile(rf"[{_CJK}]+|[^\W{_CJK}]+")
+_CJK_RUN = re.compile(rf"[{_CJK}]")
+# Bumped whenever tokenize() changes; an index built by another version is rebuilt.
+_TOKENIZER_VERSION = 2
+
+# Okapi BM25 parameters (the usual defaults).
+_K1 = 1.2
+_B = 0.75
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    doc INTEGER PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    UNIQUE (session_id, seq)
+);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    doc INTEGER NOT NULL,
+    tf INTEGER NOT NULL,
+    PRIMARY KEY (term, doc)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    indexed INTEGER NOT NULL
+);
+"""
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercased words; CJK runs become single characters plus overlapping bigrams."""
+    tokens: list[str] = []
+    for match in _TOKEN.finditer(text.lower()):
+        run = match.group()
+        if not _CJK_RUN.match(run):
+            tokens.append(run)
+            continue
+        tokens.extend(run)
+        tokens.extend(run[i : i + 2] for i in range(len(run) - 1))
+    return tokens
+
+
+def record_text(record: dict[str, Any]) -> str:
+    """Searchable text of a record: string content, or the text blocks of block content."""
+    content = record.get("content", "")
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "\n".join(
+            str(block.get("text", "")) for block in content if isinstance(block, dict) and block.get("type") == "text"
+        )
+    return ""
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    session_id: str
+    index: int
+    score: float
+    record: dict[str, Any]
+
+
+class SearchIndex:
+    """Inverted index over one user's records, kept in a SQLite file.
+
+    ``sessions.indexed`` is how many leading records of each session are
+    indexed; ``add`` only ever extends that prefix, so overlapping or
+    out-of-order calls are harmless and any gap is filled by a later catch-up.
+    The file is derived data: synchronous writes are off and deleting it just
+    means the next search re-indexes.
+    """
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=OFF")
+        if self._db.execute("PRAGMA user_version").fetchone()[0] != _TOKENIZER_VERSION:
+            # Terms from another tokenizer would never match; search() re-indexes from scratch.
+            self._db.executescript(
+                "DROP TABLE IF EXISTS docs; DROP TABLE IF EXISTS postings; DROP TABLE IF EXISTS sessions;"
+            )
+            self._db.execute(f"PRAGMA user_version = {_TOKENIZER_VERSION}")
+        self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def indexed(self, session_id: str) -> int:
+        with self._lock:
+            row = self._db.execute("SELECT indexed FROM sessions WHERE session_id = ?", (session_id,)).fetchone()
+        return row[0] if row else 0
+
+    def add(self, session_id: str, first: int, records: Iterable[dict[str, Any]]) -> int:
+        """Index records ``first, first + 1, ...`` of a session; returns how many were new."""
+        records = list(records)
+        with self._lock:
+            db = self._db
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                row = db.execute("SELECT indexed FROM sessions WHERE session_id = ?", (session_id,)).fetchone()
+                indexed = row[0] if row else 0
+                if first > indexed:
+                    db.execute("COMMIT")
+                    return 0  # a gap: left for the next catch-up
+                fresh = records[indexed - first :]
+                for seq, record in enumerate(fresh, start=indexed):
+                    terms = Counter(tokenize(record_text(record)))
+                    doc = db.execute(
+                        "INSERT INTO docs (session_id, seq, length) VALUES (?, ?, ?)",
+                        (session_id, seq, sum(terms.values())),
+                    ).lastrowid
+                    db.executemany(
+                        "INSERT INTO postings (term, doc, tf) VALUES (?, ?, ?)",
+                        [(term, doc, tf) for term, tf in terms.items()],
+                    )
+                if fresh:
+                    db.execute(
+                        "INSERT INTO sessions (session_id, indexed) VALUES (?, ?)"
+                        " ON CONFLICT(session_id) DO UPDATE SET indexed = excluded.indexed",
+                        (session_id, indexed + len(fresh)),
+                    )
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+        return len(fresh)
+
+    def drop(self, session_id: str) -> None:
+        """Forget a session, e.g. when its log turned out shorter than the index."""
+        with self._lock:
+            db = self._db
+            db.execute("BEGIN IMMEDIATE")
+            db.execute(
+                "DELETE FROM postings WHERE doc IN (SELECT doc FROM docs WHERE session_id = ?)", (session_id,)
+            )
+            db.execute("DELETE FROM docs WHERE session_id = ?", (session_id,))
+            db.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+            db.execute("COMMIT")
+
+    def search(
+        self, query: str, limit: int = 10, session_id: str | None = None
+    ) -> list[tuple[str, int, float]]:
+        """``(session_id, seq, score)`` of the best BM25 matches, newest first among equal scores.
+
+        Collection statistics (document count, average length, document
+        frequencies) are taken over ``session_id`` alone when it is given.
+        """
+        terms = sorted(set(tokenize(query)))
+        if not terms or limit <= 0:
+            return []
+        scope, scope_params = ("", ()) if session_id is None else (" AND d.session_id = ?", (session_id,))
+        placeholders = ",".join("?" * len(terms))
+        with self._lock:
+            total, avg_length = self._db.execute(
+                "SELECT COUNT(*), AVG(length) FROM docs d WHERE 1 = 1" + scope, scope_params
+            ).fetchone()
+            rows = self._db.execute(
+                "SELECT p.doc, d.session_id, d.seq, d.length, p.term, p.tf FROM postings p"
+                " JOIN docs d ON d.doc = p.doc"
+                f" WHERE p.term IN ({placeholders})" + scope,
+                (*terms, *scope_params),
+            ).fetchall()
+        if not rows:
+            return []
+        doc_freq = Counter(term for _, _, _, _, term, _ in rows)
+        idf = {term: math.log(1 + (total - df + 0.5) / (df + 0.5)) for term, df in doc_freq.items()}
+        scores: dict[int, float] = {}
+        docs: dict[int, tuple[str, int]] = {}
+        for doc, doc_session, seq, length, term, tf in rows:
+            norm = _K1 * (1 - _B + _B * length / (avg_length or 1))
+            scores[doc] = scores.get(doc, 0.0) + idf[term] * tf * (_K1 + 1) / (tf + norm)
+            docs[doc] = (doc_session, seq)
+        best = heapq.nlargest(limit, scores, key=lambda doc: (scores[doc], doc))
+        return [(*docs[doc], scores[doc]) for doc in best]
@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from memory.aio import AsyncStoreMixin
+from memory.durability import Durability
+from runtime.file_access import normalize_user_id
+
+# SQLite does its own syncing; map each policy onto the closest synchronous level.
+_SYNCHRONOUS = {"none": "OFF", "group": "NORMAL", "per_append": "FULL"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    id INTEGER PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    body TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS records_session_seq ON records (user_id, session_id, seq);
+CREATE TABLE IF NOT EXISTS summaries (
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    body TEXT NOT NULL,
+    PRIMARY KEY (user_id, session_id)
+);
+"""
+
+
+class SqliteMemoryStore(AsyncStoreMixin):
+    """Session records in one SQLite database, with the JsonlMemoryStore interface.
+
+    WAL mode lets several API workers read while one writes; each thread keeps
+    its own connection. Records get a per-session ``seq`` so slices and tails
+    are index range scans on (user_id, session_id, seq). As with the JSONL
+    store, a named user without records for a session falls back to the
+    session's ``default`` user records (data written before per-user storage).
+    ``durability`` maps onto ``PRAGMA synchronous`` (none=OFF, group=NORMAL,
+    per_append=FULL); the group interval does not apply.
+    """
+
+    def __init__(
+        self,
+        db_path: Path | None = None,
+        timeout: float = 30.0,
+        durability: str | Durability = "group",
+    ) -> None:
+        self.db_path = (db_path or Path.cwd() / "data" / "memory.sqlite3").resolve()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.timeout = timeout
+        self.durability = Durability.parse(durability)
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._conn().executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.db_path, timeout=self.timeout, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(f"PRAGMA synchronous={_SYNCHRONOUS[self.durability.mode]}")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def close(self) -> None:
+        """Close every pooled connection; the store reconnects lazily if used again."""
+        self._close_io()
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+    def __enter__(self) -> SqliteMemoryStore:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def append(self, session_id: str, record: dict[str, Any], user_id: str = "default") -> None:
+        self.append_many(session_id, [record], user_id=user_id)
+
+    def append_many(
+        self, session_id: str, records: Iterable[dict[str, Any]], user_id: str = "default"
+    ) -> None:
+        """Append records in one transaction."""
+        safe_user_id = normalize_user_id(user_id)
+        bodies = [json.dumps(record, ensure_ascii=False) for record in records]
+        if not bodies:
+            return
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            (next_seq,) = conn.execute(
+                "SELECT COALESCE(MAX(seq) + 1, 0) FROM records WHERE user_id = ? AND session_id = ?",
+                (safe_user_id, session_id),
+            ).fetchone()
+            conn.executemany(
+                "INSERT INTO records (user_id, session_id, seq, body) VALUES (?, ?, ?, ?)",
+                [(safe_user_id, session_id, next_seq + i, body) for i, body in enumerate(bodies)],
+            )
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _read_user(self, session_id: str, user_id: str) -> str:
+        safe_user_id = normalize_user_id(user_id)
+        if safe_user_id == "default":
+            return safe_user_id
+        row = self._conn().execute(
+            "SELECT 1 FROM records WHERE user_id = ? AND session_id = ? LIMIT 1",
+            (safe_user_id, session_id),
+        ).fetchone()
+        return safe_user_id if row is not None else "default"
+
+    def count(self, session_id: str, user_id: str = "default") -> int:
+        owner = self._read_user(session_id, user_id)
+        (total,) = self._conn().execute(
+            "SELECT COALESCE(MAX(seq) + 1, 0) FROM records WHERE user_id = ? AND session_id = ?",
+            (owner, session_id),
+        ).fetchone()
+        return total
+
+    def load(
+        self,
+        session_id: str,
+        user_id: str = "default",
+        start: int | None = None,
+        stop: int | None = None,
+    ) -> list[dict[str, Any]]:
+        owner = self._read_user(session_id, user_id)
+        if start is None and stop is None:
+            first, last = 0, None
+        else:
+            selected = range(self.count(session_id, user_id=owner))[start:stop]
+            if not selected:
+                return []
+            first, last = selected[0], selected[-1] + 1
+        rows = self._conn().execute(
+            "SELECT body FROM records WHERE user_id = ? AND session_id = ? AND seq >= ?"
+            " AND (? IS NULL OR seq < ?) ORDER BY seq",
+            (owner, session_id, first, last, last),
+        )
+        return [json.loads(body) for (body,) in rows]
+
+    def get(self, session_id: str, index: int, user_id: str = "default") -> dict[str, Any]:
+        records = self.load(session_id, user_id=user_id, start=index, stop=index + 1 or None)
+        if not records:
+            raise IndexError("record index out of range")
+        return records[0]
+
+    def iter_recent(self, session_id: str, user_id: str = "default") -> Iterator[dict[str, Any]]:
+        """Yield records newest first, fetching rows only as they are consumed."""
+        owner = self._read_user(session_id, user_id)
+        rows = self._conn().execute(
+            "SELECT body FROM records WHERE user_id = ? AND session_id = ? ORDER BY seq DESC",
+            (owner, session_id),
+        )
+        for (body,) in rows:
+            yield json.loads(body)
+
+    def load_tail(self, session_id: str, n: int, user_id: str = "default") -> list[dict[str, Any]]:
+        if n <= 0:
+            return []
+        owner = self._read_user(session_id, user_id)
+        rows = self._conn().execute(
+            "SELECT body FROM records WHERE user_id = ? AND session_id = ? ORDER BY seq DESC LIMIT ?",
+            (owner, session_id, n),
+        ).fetchall()
+        return [json.loads(body) for (body,) in reversed(rows)]
+
+    def load_summary(self, session_id: str, user_id: str = "default") -> dict[str, Any] | None:
+        row = self._conn().execute(
+            "SELECT body FROM summaries WHERE user_id = ? AND session_id = ?",
+            (normalize_user_id(user_id), session_id),
+        ).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def save_summary(self, session_id: str, summary: dict[str, Any], user_id: str = "default") -> None:
+        self._conn().execute(
+            "INSERT OR REPLACE INTO summaries (user_id, session_id, body) VALUES (?, ?, ?)",
+            (normalize_user_id(user_id), session_id, json.dumps(summary, ensure_ascii=False)),
+        )
+
+
+def migrate_jsonl(jsonl_dir: Path, store: SqliteMemoryStore) -> dict[str, int]:
+    """Copy a JsonlMemoryStore directory into ``store``.
+
+    ``<dir>/<session>.jsonl`` belongs to the default user and
+    ``<dir>/<user>/<session>.jsonl`` to ``user``; summary sidecars come along.
+    Sessions that already have records in the database are skipped, so an
+    interrupted migration can simply be re-run.
+    """
+    from memory.jsonl_store import JsonlMemoryStore
+
+    source = JsonlMemoryStore(jsonl_dir)
+    stats = {"sessions": 0, "records": 0, "skipped": 0}
+    for path in sorted(source.base_dir.rglob("*.jsonl")):
+        relative = path.relative_to(source.base_dir)
+        if len(relative.parts) > 2:
+            continue
+        user_id = relative.parts[0] if len(relative.parts) == 2 else "default"
+        session_id = path.stem
+        if store.count(session_id, user_id=user_id) and store._read_user(session_id, user_id) == user_id:
+            stats["skipped"] += 1
+            continue
+        records = source.load(session_id, user_id=user_id)
+        store.append_many(session_id, records, user_id=user_id)
+        summary = source.load_summary(session_id, user_id=user_id)
+        if summary is not None:
+            store.save_summary(session_id, summary, user_id=user_id)
+        stats["sessions"] += 1
+        stats["records"] += len(records)
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Migrate a JSONL memory directory into SQLite.")
+    parser.add_argument("jsonl_dir", type=Path, help="JsonlMemoryStore base directory")
+    parser.add_argument("--db", type=Path, default=None, help="SQLite file (default: <jsonl_dir>/memory.sqlite3)")
+    args = parser.parse_args()
+    target = SqliteMemoryStore(args.db or args.jsonl_dir / "memory.sqlite3")
+    print(json.dumps(migrate_jsonl(args.jsonl_dir, target)))
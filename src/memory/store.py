@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Protocol, TypeVar
+
+from memory.codec import RecordCodec
+from memory.durability import Durability
+from memory.jsonl_store import JsonlMemoryStore
+from memory.sqlite_store import SqliteMemoryStore
+
+MEMORY_BACKENDS = ("jsonl", "sqlite")
+
+T = TypeVar("T")
+
+
+class MemoryStore(Protocol):
+    """Session record storage shared by the JSONL and SQLite backends.
+
+    The ``a*`` coroutines (see ``AsyncStoreMixin``) run the blocking calls on
+    the store's I/O threads, in order per session.
+    """
+
+    def append(self, session_id: str, record: dict[str, Any], user_id: str = "default") -> None:
+        ...
+
+    def append_many(
+        self, session_id: str, records: Iterable[dict[str, Any]], user_id: str = "default"
+    ) -> None:
+        ...
+
+    def load(
+        self,
+        session_id: str,
+        user_id: str = "default",
+        start: int | None = None,
+        stop: int | None = None,
+    ) -> list[dict[str, Any]]:
+        ...
+
+    def count(self, session_id: str, user_id: str = "default") -> int:
+        ...
+
+    def iter_recent(self, session_id: str, user_id: str = "default") -> Iterator[dict[str, Any]]:
+        ...
+
+    def load_tail(self, session_id: str, n: int, user_id: str = "default") -> list[dict[str, Any]]:
+        ...
+
+    def load_summary(self, session_id: str, user_id: str = "default") -> dict[str, Any] | None:
+        ...
+
+    def save_summary(self, session_id: str, summary: dict[str, Any], user_id: str = "default") -> None:
+        ...
+
+    async def arun(self, session_id: str, user_id: str, fn: Callable[..., T], *args: Any) -> T:
+        ...
+
+    async def aload(
+        self,
+        session_id: str,
+        user_id: str = "default",
+        start: int | None = None,
+        stop: int | None = None,
+    ) -> list[dict[str, Any]]:
+        ...
+
+    async def aappend(self, session_id: str, record: dict[str, Any], user_id: str = "default") -> None:
+        ...
+
+    async def aappend_many(
+        self, session_id: str, records: Iterable[dict[str, Any]], user_id: str = "default"
+    ) -> None:
+        ...
+
+    def close(self) -> None:
+        ...
+
+
+def open_memory_store(
+    memory_dir: Path,
+    backend: str = "jsonl",
+    durability: str | Durability | None = None,
+    segment_max_bytes: int | None = None,
+    compression: str | None = "gzip",
+    codec: str | RecordCodec = "json",
+    search_index: bool = False,
+) -> MemoryStore:
+    """Open a backend; ``durability=None`` keeps the backend's default policy.
+
+    Segment rotation, compression, the record codec and the search index apply
+    to the JSONL backend only.
+    """
+    options = {} if durability is None else {"durability": durability}
+    if backend == "jsonl":
+        return JsonlMemoryStore(
+            memory_dir,
+            segment_max_bytes=segment_max_bytes,
+            compression=compression,
+            codec=codec,
+            search_index=search_index,
+            **options,
+        )
+    if backend == "sqlite":
+        return SqliteMemoryStore(Path(memory_dir) / "memory.sqlite3", **options)
+    raise ValueError(f"Unknown memory backend: {backend!r} (expected one of {MEMORY_BACKENDS})")
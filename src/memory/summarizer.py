@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Hashable
+
+if TYPE_CHECKING:
+    from memory.store import MemoryStore
+
+_logger = logging.getLogger(__name__)
+
+SummarizeFn = Callable[[str | None, list[dict[str, Any]]], Awaitable[str]]
+
+SUMMARY_PROMPT = (
+    "You maintain a running summary of a conversation between a user and the Tilo agent.\n"
+    "Merge the previous summary (if any) with the new turns below into one concise summary.\n"
+    "Keep facts, names, preferences, decisions and open questions; drop small talk.\n"
+    "Answer with the summary text only, in the language the user writes in."
+)
+
+
+def summary_record(summary: dict[str, Any]) -> dict[str, Any]:
+    """History record standing in for every turn the summary covers."""
+    return {
+        "role": "system",
+        "name": "summary",
+        "content": f"Summary of the earlier conversation:\n{summary['content']}",
+    }
+
+
+def format_transcript(previous: str | None, records: list[dict[str, Any]]) -> str:
+    lines = []
+    if previous:
+        lines.append(f"Previous summary:\n{previous}\n")
+    lines.append("New turns:")
+    for record in records:
+        lines.append(f"{record.get('role', 'assistant')}: {record.get('content', '')}")
+    return "\n".join(lines)
+
+
+def load_with_summary(
+    store: MemoryStore, session_id: str, user_id: str = "default"
+) -> tuple[dict[str, Any] | None, list[dict[str, Any]]]:
+    """Return (summary, records not covered by it)."""
+    summary = store.load_summary(session_id, user_id=user_id)
+    if summary is None:
+        return None, store.load(session_id, user_id=user_id)
+    return summary, store.load(session_id, user_id=user_id, start=int(summary.get("upto", 0)))
+
+
+class RollingSummarizer:
+    """Condenses old turns into a summary sidecar in background tasks.
+
+    Once more than ``threshold`` records sit outside the current summary, every
+    record except the newest ``keep_recent`` is folded into a new summary by
+    ``summarize``. At most one summarization runs per session at a time.
+    """
+
+    def __init__(self, threshold: int = 40, keep_recent: int = 8) -> None:
+        if keep_recent < 0 or threshold <= keep_recent:
+            raise ValueError("threshold must be greater than keep_recent >= 0.")
+        self.threshold = threshold
+        self.keep_recent = keep_recent
+        self.summaries_written = 0
+        self._running: dict[Hashable, asyncio.Task[bool]] = {}
+
+    def schedule(
+        self,
+        store: MemoryStore,
+        session_id: str,
+        summarize: SummarizeFn,
+        user_id: str = "default",
+        after: Awaitable[Any] | None = None,
+        on_done: Callable[[], None] | None = None,
+    ) -> asyncio.Task[bool] | None:
+        """Start a background summarization check unless one is already running.
+
+        ``after`` is awaited first (e.g. the pending persist of the current turn);
+        ``on_done`` runs only when a new summary has been written.
+        """
+        key = (id(store), user_id, session_id)
+        if key in self._running:
+            return None
+
+        async def run() -> bool:
+            try:
+                if after is not None:
+                    await after
+                written = await self.summarize_if_needed(store, session_id, summarize, user_id)
+                if written and on_done is not None:
+                    on_done()
+                return written
+            except Exception:
+                _logger.exception("Summarization failed for session %s", session_id)
+                return False
+            finally:
+                self._running.pop(key, None)
+
+        task = asyncio.get_running_loop().create_task(run())
+        self._running[key] = task
+        return task
+
+    async def summarize_if_needed(
+        self,
+        store: MemoryStore,
+        session_id: str,
+        summarize: SummarizeFn,
+        user_id: str = "default",
+    ) -> bool:
+        summary, pending = await store.arun(session_id, user_id, load_with_summary, store, session_id, user_id)
+        if len(pending) <= self.threshold:
+            return False
+        fold = pending[: len(pending) - self.keep_recent]
+        previous = summary["content"] if summary else None
+        text = await summarize(previous, fold)
+        upto = (int(summary.get("upto", 0)) if summary else 0) + len(fold)
+        await store.arun(
+            session_id, user_id, store.save_summary, session_id, {"upto": upto, "content": text}, user_id
+        )
+        self.summaries_written += 1
+        return True
+
+    async def wait(self) -> None:
+        """Wait for every summarization scheduled on the running loop."""
+        loop = asyncio.get_running_loop()
+        while True:
+            tasks = [task for task in self._running.values() if task.get_loop() is loop]
+            if not tasks:
+                return
+            await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import json
+import unicodedata
+from typing import Any, Callable, Iterable, Mapping, TypeVar
+
+T = TypeVar("T")
+
+# Rough per-message framing cost of chat formats (role markers, separators).
+_MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def _is_cjk(ch: str) -> bool:
+    return unicodedata.east_asian_width(ch) in ("W", "F")
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap, dependency-free token estimate: one per CJK char, ~4 other chars per token."""
+    wide = sum(1 for ch in text if _is_cjk(ch))
+    narrow = len(text) - wide
+    return wide + (narrow + 3) // 4
+
+
+def _content_text(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+    return json.dumps(content, ensure_ascii=False)
+
+
+def _record_fields(item: Any) -> tuple[str, Any]:
+    if isinstance(item, Mapping):
+        return str(item.get("role") or ""), item.get("content", "")
+    return str(getattr(item, "role", "") or ""), getattr(item, "content", "")
+
+
+def select_window(
+    newest_first: Iterable[T],
+    max_turns: int | None = None,
+    max_tokens: int | None = None,
+    fields: Callable[[T], tuple[str, Any]] = _record_fields,
+) -> list[T]:
+    """Pick the most recent history items that fit the policy, in chronological order.
+
+    ``newest_first`` is consumed lazily, so a reverse reader stops decoding as soon
+    as the window is full. A turn starts at a ``user`` record; ``max_turns`` keeps
+    the last N turns and ``max_tokens`` caps the estimated prompt size. The window
+    never starts mid-turn: leading non-user records are dropped.
+    """
+    selected: list[T] = []
+    turns = 0
+    tokens = 0
+    for item in newest_first:
+        role, content = fields(item)
+        cost = estimate_tokens(_content_text(content)) + _MESSAGE_OVERHEAD_TOKENS
+        if max_tokens is not None and tokens + cost > max_tokens:
+            break
+        if role == "user":
+            if max_turns is not None and turns >= max_turns:
+                break
+            turns += 1
+        tokens += cost
+        selected.append(item)
+    selected.reverse()
+    start = next(
+        (index for index, item in enumerate(selected) if fields(item)[0] == "user"), len(selected)
+    )
+    return selected[start:]
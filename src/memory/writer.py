@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Hashable, Iterable, Mapping, Union
+
+from runtime.file_access import normalize_user_id
+
+if TYPE_CHECKING:
+    from memory.jsonl_store import JsonlMemoryStore
+    from memory.sqlite_store import SqliteMemoryStore
+
+    MemoryStore = Union[JsonlMemoryStore, SqliteMemoryStore]
+
+_logger = logging.getLogger(__name__)
+
+_FLUSH_INTERVAL_ENV = "AGENTSCOPE_MEMORY_FLUSH_INTERVAL"
+
+
+def flush_interval_from_env(env: Mapping[str, str] | None = None) -> float:
+    """Writer linger in seconds from ``AGENTSCOPE_MEMORY_FLUSH_INTERVAL`` (unset: 0)."""
+    env = os.environ if env is None else env
+    raw = env.get(_FLUSH_INTERVAL_ENV, "").strip()
+    if not raw:
+        return 0.0
+    try:
+        interval = float(raw)
+    except ValueError:
+        interval = -1.0
+    if not interval >= 0:
+        raise ValueError(f"`{_FLUSH_INTERVAL_ENV}` must be a non-negative number of seconds, got {raw!r}.")
+    return interval
+
+
+@dataclass
+class _Append:
+    store: MemoryStore
+    session_id: str
+    user_id: str
+    key: Hashable
+    records: list[dict[str, Any]]
+    future: Future[None]
+
+
+@dataclass
+class _Barrier:
+    future: Future[None]
+
+
+_STOP = object()
+
+
+@dataclass
+class _Group:
+    store: MemoryStore
+    session_id: str
+    user_id: str
+    records: list[dict[str, Any]] = field(default_factory=list)
+    futures: list[Future[None]] = field(default_factory=list)
+
+
+class MemoryWriter:
+    """Background thread that group-commits memory appends across sessions.
+
+    ``submit`` returns immediately with a ``concurrent.futures.Future`` that
+    resolves once the records are written; await it (``asyncio.wrap_future``)
+    only when durability matters. The thread commits as soon as the queue is
+    drained: appends that queued up while it was busy are committed together
+    with one file open per session, in submission order. ``flush_interval`` > 0
+    additionally lingers that long for more appends, trading latency for
+    larger batches.
+    """
+
+    def __init__(self, flush_interval: float = 0.0, max_batch: int = 512) -> None:
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.batches = 0
+        self.records_written = 0
+        self._queue: queue.SimpleQueue[Any] = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def submit(
+        self,
+        store: MemoryStore,
+        session_id: str,
+        records: Iterable[dict[str, Any]],
+        user_id: str = "default",
+    ) -> Future[None]:
+        # Validate here so a bad user_id fails the caller, not the writer thread.
+        key = (id(store), normalize_user_id(user_id), session_id)
+        future: Future[None] = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("MemoryWriter is closed.")
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="tilo-memory-writer", daemon=True
+                )
+                self._thread.start()
+            self._queue.put(_Append(store, session_id, user_id, key, list(records), future))
+        return future
+
+    def barrier(self) -> Future[None]:
+        """Future resolved once every append submitted before this call is written."""
+        future: Future[None] = Future()
+        with self._lock:
+            if self._thread is None or self._closed:
+                future.set_result(None)
+                return future
+            self._queue.put(_Barrier(future))
+        return future
+
+    def flush(self, timeout: float | None = None) -> None:
+        self.barrier().result(timeout)
+
+    async def aflush(self) -> None:
+        await asyncio.wrap_future(self.barrier())
+
+    def close(self, timeout: float | None = None) -> None:
+        """Flush everything still queued and stop the writer thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+            if thread is not None:
+                self._queue.put(_STOP)
+        if thread is not None:
+            thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.max_batch and isinstance(batch[-1], _Append):
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining > 0:
+                        batch.append(self._queue.get(timeout=remaining))
+                    else:
+                        batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._commit(batch)
+            if batch[-1] is _STOP:
+                return
+
+    def _commit(self, batch: list[Any]) -> None:
+        groups: OrderedDict[Hashable, _Group] = OrderedDict()
+        for item in batch:
+            if not isinstance(item, _Append):
+                continue
+            group = groups.get(item.key)
+            if group is None:
+                group = groups[item.key] = _Group(item.store, item.session_id, item.user_id)
+            group.records.extend(item.records)
+            group.futures.append(item.future)
+        for group in groups.values():
+            try:
+                group.store.append_many(group.session_id, group.records, user_id=group.user_id)
+            except Exception as exc:
+                _logger.exception("Failed to persist memory for session %s", group.session_id)
+                for future in group.futures:
+                    future.set_exception(exc)
+                continue
+            self.records_written += len(group.records)
+            for future in group.futures:
+                future.set_result(None)
+        if groups:
+            self.batches += 1
+        for item in batch:
+            if isinstance(item, _Barrier):
+                item.future.set_result(None)
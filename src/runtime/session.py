@@ -21,6 +21,47 @@ class SessionContext:
     workspace_base_dir: Path = Path("./workspaces")
     max_iters: int = 6
     project_root: Path = Path.cwd().resolve()
+    # History window sent to the model: last N turns and/or an estimated token budget.
+    history_max_turns: int | None = None
+    history_max_tokens: int | None = None
+    # False lets a turn return before its records hit disk (batch/backfill throughput).
+    await_persist: bool = True
+    # "jsonl" (one file per session under memory_dir) or "sqlite" (memory_dir/memory.sqlite3).
+    memory_backend: str = "jsonl"
+    # fsync policy: "none", "per_append" or "group(<interval_ms>)"; None keeps the backend default.
+    memory_durability: str | None = None
+    # JSONL only: roll a session file over into a compressed segment ("gzip"/"lzma"/None) past this size.
+    memory_segment_bytes: int | None = None
+    memory_compression: str | None = "gzip"
+    # JSONL only: record codec, "json" (stdlib), "orjson" or "auto" (orjson when installed).
+    memory_codec: str = "json"
+    # JSONL only: keep the per-user full-text search index current on every append.
+    memory_search_index: bool = False
+    # Fold older turns into a summary once more than N records sit outside it;
+    # the newest summary_keep_recent records always stay verbatim.
+    summarize_after: int | None = None
+    summary_keep_recent: int = 8
+    # Retrieval context instead of history replay: the last retrieval_recent_turns turns plus the
+    # retrieval_top_k older turns ranked highest by BM25 against the user message (JSONL backend;
+    # takes precedence over the history window and summaries). Cross-session searches all the user's sessions.
+    retrieval_top_k: int | None = None
+    retrieval_recent_turns: int = 2
+    retrieval_cross_session: bool = False
+    # Serve repeated calls of cacheable tools from the shared tool result cache.
+    cache_tool_results: bool = False
+    # Tool calls from one reasoning step run concurrently, at most this many at once. Opt-in:
+    # the default 1 keeps them sequential, since tools with side effects may depend on call order.
+    tool_concurrency: int = 1
+    # Wall-clock budget (seconds) for a whole turn: model, tool and MCP calls included.
+    timeout: float | None = None
+    # Answer trivial intents (bare time questions, plain arithmetic) via skills without the model.
+    fast_path: bool = False
+
+    def __post_init__(self) -> None:
+        if self.summarize_after is not None and not (
+            0 <= self.summary_keep_recent < self.summarize_after
+        ):
+            raise ValueError("summarize_after must be greater than summary_keep_recent >= 0.")
 
     def workspace_dir(self) -> Path:
         return resolve_user_workspace(self.workspace_base_dir, self.user_id)
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import unittest
+from pathlib import Path
+from typing import Any
+
+from agent.core import _AGENT_POOL
+from agent.prompt_files import PROMPT_FILE_NAMES
+from runtime.session import SessionContext
+
+
+def seed_workspace(base: Path, user_id: str = "default", suffix: str = "") -> Path:
+    """Write every prompt file into ``base/<user_id>`` so tests never copy the packaged templates."""
+    workspace = base / user_id
+    workspace.mkdir(parents=True, exist_ok=True)
+    for name in PROMPT_FILE_NAMES:
+        (workspace / name).write_text(f"{name}{suffix}", encoding="utf-8")
+    return workspace
+
+
+def make_ctx(tmp: Path, session_id: str, **kwargs: Any) -> SessionContext:
+    """Context with seeded prompt files under ``tmp/ws`` and memory under ``tmp/data``."""
+    kwargs.setdefault("enabled_skills", [])
+    kwargs.setdefault("memory_dir", tmp / "data")
+    kwargs.setdefault("workspace_base_dir", tmp / "ws")
+    seed_workspace(Path(kwargs["workspace_base_dir"]), kwargs.get("user_id", "default"))
+    return SessionContext(session_id=session_id, **kwargs)
+
+
+class PooledAgentTestCase(unittest.TestCase):
+    """Starts every test with an empty process-wide agent pool."""
+
+    def setUp(self) -> None:
+        _AGENT_POOL.clear()
@@ -2,24 +2,27 @@ from __future__ import annotations
 
 import asyncio
 import json
+import tempfile
 import unittest
 from pathlib import Path
 import sys
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
 
-from agentscope.memory import InMemoryMemory
 from agentscope.message import Msg
 from agentscope.tool import Toolkit
 
 from agent.core import (
     _append_memory_entry,
-    _build_agent_components,
+    _get_agent_components,
     _history_entry_to_msg,
     _normalize_response_text,
+    _system_prompt,
 )
 from runtime.session import SessionContext
 
+from helpers import seed_workspace
+
 
 class _AsyncAddMemory:
     def __init__(self) -> None:
@@ -58,13 +61,15 @@ class AgentCoreTests(unittest.TestCase):
 
 
 class BuildAgentComponentsTests(unittest.TestCase):
-    def test_build_agent_components_returns_tuple(self) -> None:
-        ctx = SessionContext(session_id="test", enabled_skills=["time_skill"])
-        toolkit, sys_prompt, memory, model = _build_agent_components(ctx)
-        self.assertIsNotNone(toolkit)
+    def test_get_agent_components_builds_toolkit_prompt_and_model(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            seed_workspace(Path(tmp))
+            ctx = SessionContext(session_id="test", enabled_skills=["time_skill"], workspace_base_dir=Path(tmp))
+            components = _get_agent_components(ctx)
+            sys_prompt = _system_prompt(ctx, components)
+        self.assertIsNotNone(components.toolkit)
         self.assertIsInstance(sys_prompt, str)
-        self.assertIsNotNone(memory)
-        self.assertIsNotNone(model)
+        self.assertIsNotNone(components.model())
 
 
 if __name__ == "__main__":
@@ -54,6 +54,16 @@ class SSERoutesTests(unittest.TestCase):
                 self.assertIn("type", payload)
                 self.assertIn("data", payload)
 
+    @patch("api.routes.chat_stream", _mock_chat_stream)
+    def test_non_positive_timeout_is_rejected(self) -> None:
+        for timeout in (0, -1):
+            response = self.client.post(
+                "/chat/stream",
+                json={"message": "hello", "session_id": "test-timeout", "timeout": timeout},
+            )
+            self.assertEqual(response.status_code, 422)
+        self.assertEqual(ChatRequest(message="hi", session_id="s", timeout=1.5).timeout, 1.5)
+
 
 if __name__ == "__main__":
     unittest.main()
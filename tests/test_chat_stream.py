@@ -12,16 +12,20 @@ from agent.stream import StreamEvent
 from llm.client import MockModel
 from runtime.session import SessionContext
 
+from helpers import seed_workspace
+
 
 class ChatStreamTests(unittest.TestCase):
     @patch("agent.core.build_model_from_env")
     def test_chat_stream_yields_events(self, mock_build_model: object) -> None:
         mock_build_model.return_value = MockModel()
         with tempfile.TemporaryDirectory() as tmpdir:
+            seed_workspace(Path(tmpdir) / "ws")
             ctx = SessionContext(
                 session_id="test-stream",
                 enabled_skills=["time_skill"],
                 memory_dir=Path(tmpdir),
+                workspace_base_dir=Path(tmpdir) / "ws",
             )
 
             async def collect_events() -> list[StreamEvent]:
@@ -43,10 +47,12 @@ class ChatStreamTests(unittest.TestCase):
     def test_chat_stream_text_event_has_content(self, mock_build_model: object) -> None:
         mock_build_model.return_value = MockModel()
         with tempfile.TemporaryDirectory() as tmpdir:
+            seed_workspace(Path(tmpdir) / "ws")
             ctx = SessionContext(
                 session_id="test-stream-2",
                 enabled_skills=["time_skill"],
                 memory_dir=Path(tmpdir),
+                workspace_base_dir=Path(tmpdir) / "ws",
             )
 
             async def collect_events() -> list[StreamEvent]:
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from agent.component_cache import ComponentCache, clone_toolkit, components_key
+from agent.core import _COMPONENT_CACHE, _PROMPT_CACHE, _build_fresh_components, _get_agent_components, _system_prompt
+from llm.client import MockModel
+from runtime.session import SessionContext
+
+from helpers import seed_workspace
+
+
+class ComponentCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        _COMPONENT_CACHE.clear()
+        _PROMPT_CACHE.clear()
+
+    def test_repeated_builds_reuse_components_and_prompt(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            seed_workspace(Path(tmp), suffix=" v1")
+            ctx = SessionContext(
+                session_id="s1", enabled_skills=["time_skill"], workspace_base_dir=Path(tmp)
+            )
+            components_a = _get_agent_components(ctx)
+            prompt_a = _system_prompt(ctx, components_a)
+            components_b = _get_agent_components(ctx)
+            prompt_b = _system_prompt(ctx, components_b)
+
+            self.assertEqual(_COMPONENT_CACHE.misses, 1)
+            self.assertEqual(_COMPONENT_CACHE.hits, 1)
+            self.assertEqual((_PROMPT_CACHE.hits, _PROMPT_CACHE.misses), (1, 1))
+            self.assertIs(components_a, components_b)
+            self.assertIs(prompt_a, prompt_b)
+
+    def test_prompt_file_change_recomposes_prompt_only(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            workspace = seed_workspace(Path(tmp), suffix=" v1")
+            ctx = SessionContext(
+                session_id="s1", enabled_skills=["time_skill"], workspace_base_dir=Path(tmp)
+            )
+            prompt_before = _system_prompt(ctx, _get_agent_components(ctx))
+            target = workspace / "SOUL.md"
+            target.write_text("SOUL.md v2 with more text", encoding="utf-8")
+            stat = target.stat()
+            os.utime(target, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+            prompt_after = _system_prompt(ctx, _get_agent_components(ctx))
+            self.assertEqual((_COMPONENT_CACHE.hits, _COMPONENT_CACHE.misses), (1, 1))
+            self.assertEqual(_PROMPT_CACHE.misses, 2)
+            self.assertNotIn("SOUL.md v2", prompt_before)
+            self.assertIn("SOUL.md v2", prompt_after)
+
+    def test_users_share_components_but_not_prompts(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            seed_workspace(Path(tmp), "alice", suffix=" alice")
+            seed_workspace(Path(tmp), "bob", suffix=" bob")
+            alice, bob = (
+                SessionContext(
+                    session_id="s1", user_id=user, enabled_skills=["time_skill"], workspace_base_dir=Path(tmp)
+                )
+                for user in ("alice", "bob")
+            )
+            components_alice = _get_agent_components(alice)
+            components_bob = _get_agent_components(bob)
+
+            self.assertIs(components_alice, components_bob)
+            self.assertEqual((_COMPONENT_CACHE.hits, _COMPONENT_CACHE.misses), (1, 1))
+            self.assertIn("SOUL.md alice", _system_prompt(alice, components_alice))
+            self.assertIn("SOUL.md bob", _system_prompt(bob, components_bob))
+
+    def test_key_separates_skills_and_model_env(self) -> None:
+        base = components_key(["time_skill"], env={})
+        self.assertEqual(base, components_key(["time_skill"], env={}))
+        self.assertNotEqual(base, components_key(["math_skill"], env={}))
+        self.assertNotEqual(base, components_key(["time_skill"], env={"AGENTSCOPE_MODEL": "openai"}))
+
+    @patch("agent.core.build_model_from_env")
+    def test_model_is_reused_within_one_event_loop(self, mock_build_model: object) -> None:
+        mock_build_model.side_effect = MockModel
+        with tempfile.TemporaryDirectory() as tmp:
+            seed_workspace(Path(tmp), suffix=" v1")
+            ctx = SessionContext(
+                session_id="s1", enabled_skills=["time_skill"], workspace_base_dir=Path(tmp)
+            )
+
+            async def build_twice() -> tuple[object, object]:
+                return _get_agent_components(ctx).model(), _get_agent_components(ctx).model()
+
+            first, second = asyncio.run(build_twice())
+            self.assertIs(first, second)
+            self.assertEqual(mock_build_model.call_count, 1)
+
+    def test_lru_bound_evicts_oldest(self) -> None:
+        cache = ComponentCache(max_entries=1)
+        with tempfile.TemporaryDirectory() as tmp:
+            ctx = SessionContext(session_id="s1", enabled_skills=[], workspace_base_dir=Path(tmp))
+            cache.get("a", lambda: _build_fresh_components(ctx))
+            cache.get("b", lambda: _build_fresh_components(ctx))
+            self.assertEqual(len(cache), 1)
+
+    def test_clone_toolkit_isolates_registrations(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            seed_workspace(Path(tmp), suffix=" v1")
+            ctx = SessionContext(session_id="s1", enabled_skills=[], workspace_base_dir=Path(tmp))
+            toolkit = _get_agent_components(ctx).toolkit
+            clone = clone_toolkit(toolkit)
+            clone.tools.pop(next(iter(clone.tools)))
+            self.assertEqual(len(toolkit.tools), len(clone.tools) + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import asyncio
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from memory.aio import OrderedExecutor
+from memory.jsonl_store import JsonlMemoryStore
+from memory.sqlite_store import SqliteMemoryStore
+
+
+class OrderedExecutorTests(unittest.TestCase):
+    def test_same_key_runs_in_order_and_other_keys_in_parallel(self) -> None:
+        executor = OrderedExecutor(max_workers=4)
+        order: list[int] = []
+
+        def slow_then_fast(i: int) -> int:
+            time.sleep(0.02 * (3 - i))
+            order.append(i)
+            return i
+
+        futures = [executor.submit("a", slow_then_fast, i) for i in range(3)]
+        # Would deadlock (and time out) if different keys were serialized too.
+        barrier = threading.Barrier(2, timeout=2)
+        parallel = [executor.submit(key, barrier.wait) for key in ("b", "c")]
+        self.assertEqual([f.result(timeout=2) for f in futures], [0, 1, 2])
+        self.assertEqual(order, [0, 1, 2])
+        for future in parallel:
+            future.result(timeout=2)
+        executor.shutdown()
+        with self.assertRaises(RuntimeError):
+            executor.submit("a", order.append, 3)
+
+    def test_errors_reach_the_caller_and_the_lane_keeps_going(self) -> None:
+        executor = OrderedExecutor(max_workers=1)
+        failing = executor.submit("a", int, "not a number")
+        ok = executor.submit("a", int, "7")
+        with self.assertRaises(ValueError):
+            failing.result(timeout=2)
+        self.assertEqual(ok.result(timeout=2), 7)
+        executor.shutdown()
+
+
+class AsyncStoreTests(unittest.TestCase):
+    def test_async_calls_round_trip_off_the_loop_for_both_backends(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            for store in (JsonlMemoryStore(Path(tmp)), SqliteMemoryStore(Path(tmp) / "m.sqlite3")):
+                with self.subTest(store=type(store).__name__):
+
+                    async def scenario() -> tuple[list, str]:
+                        await store.aappend("s", {"n": 0}, user_id="alice")
+                        await store.aappend_many("s", ({"n": i} for i in range(1, 4)), user_id="alice")
+                        thread = await store.arun("s", "alice", lambda: threading.current_thread().name)
+                        return await store.aload("s", user_id="alice", start=1, stop=3), thread
+
+                    records, thread = asyncio.run(scenario())
+                    self.assertEqual(records, [{"n": 1}, {"n": 2}])
+                    self.assertTrue(thread.startswith("tilo-memory-io"))
+                    store.close()
+                    self.assertEqual(asyncio.run(store.aload("s", user_id="alice")), [{"n": i} for i in range(4)])
+                    store.close()
+
+    def test_slow_read_does_not_stall_the_event_loop_or_other_sessions(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = JsonlMemoryStore(Path(tmp))
+            store.append("slow", {"n": 1})
+            store.append("fast", {"n": 2})
+            real_load = JsonlMemoryStore.load
+
+            def load(self: JsonlMemoryStore, session_id: str, *args: object) -> list:
+                if session_id == "slow":
+                    time.sleep(0.3)
+                return real_load(self, session_id, *args)
+
+            async def scenario() -> tuple[int, list, float]:
+                ticks = 0
+
+                async def heartbeat() -> None:
+                    nonlocal ticks
+                    while True:
+                        await asyncio.sleep(0.01)
+                        ticks += 1
+
+                beat = asyncio.create_task(heartbeat())
+                slow = asyncio.create_task(store.aload("slow"))
+                await asyncio.sleep(0.01)
+                started = time.perf_counter()
+                fast = await store.aload("fast")
+                fast_latency = time.perf_counter() - started
+                await slow
+                beat.cancel()
+                return ticks, fast, fast_latency
+
+            with patch.object(JsonlMemoryStore, "load", load):
+                ticks, fast, fast_latency = asyncio.run(scenario())
+            self.assertEqual(fast, [{"n": 2}])
+            self.assertLess(fast_latency, 0.2)
+            self.assertGreater(ticks, 10)
+            store.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from memory import codec as codec_module
+from memory.codec import JsonCodec, OrjsonCodec, resolve_codec
+from memory.jsonl_store import JsonlMemoryStore
+
+RECORDS = [
+    {"role": "user", "content": "你好，明天首尔天气怎么样？"},
+    {"role": "assistant", "content": "Tomorrow: sunny, 18°C.\nBring a jacket.", "meta": {"tokens": 12}},
+]
+
+
+class CodecTests(unittest.TestCase):
+    def _codecs(self) -> list:
+        codecs = [JsonCodec()]
+        if codec_module.orjson is not None:
+            codecs.append(OrjsonCodec())
+        return codecs
+
+    def test_round_trip_keeps_non_ascii_on_one_line(self) -> None:
+        for codec in self._codecs():
+            with self.subTest(codec=codec.name):
+                encoded = [codec.encode(record) for record in RECORDS]
+                self.assertTrue(all(b"\n" not in line for line in encoded))
+                self.assertIn("你好".encode("utf-8"), encoded[0])
+                self.assertEqual([codec.decode(line) for line in encoded], RECORDS)
+                self.assertEqual(codec.decode_lines(b"\n".join(encoded) + b"\n"), RECORDS)
+
+    def test_decode_lines_skips_blank_lines(self) -> None:
+        for codec in self._codecs():
+            with self.subTest(codec=codec.name):
+                data = b'\n{"n": 1}\n  \n\n{"n": 2}\r\n'
+                self.assertEqual(codec.decode_lines(data), [{"n": 1}, {"n": 2}])
+                self.assertEqual(codec.decode_lines(b" \n"), [])
+                with self.assertRaises(ValueError):
+                    codec.decode_lines(b'{"n": 1}\n{"n": ')
+
+    def test_resolve_codec(self) -> None:
+        self.assertEqual(resolve_codec().name, "json")
+        custom = JsonCodec()
+        self.assertIs(resolve_codec(custom), custom)
+        with patch.object(codec_module, "orjson", None):
+            self.assertEqual(resolve_codec("auto").name, "json")
+            with self.assertRaises(ValueError):
+                resolve_codec("orjson")
+        with self.assertRaises(ValueError):
+            resolve_codec("pickle")
+
+    def test_store_reads_files_written_by_another_codec(self) -> None:
+        if codec_module.orjson is None:
+            self.skipTest("orjson is not installed")
+        with tempfile.TemporaryDirectory() as tmp:
+            JsonlMemoryStore(Path(tmp), codec="json").append_many("s", RECORDS[:1])
+            fast = JsonlMemoryStore(Path(tmp), codec="orjson")
+            fast.append_many("s", RECORDS[1:])
+            for store in (fast, JsonlMemoryStore(Path(tmp))):
+                self.assertEqual(store.load("s"), RECORDS)
+                self.assertEqual(store.load("s", start=1), RECORDS[1:])
+                self.assertEqual(store.load_tail("s", 2), RECORDS)
+                self.assertEqual(list(store.iter_recent("s")), RECORDS[::-1])
+
+
+if __name__ == "__main__":
+    unittest.main()
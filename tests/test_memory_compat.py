@@ -8,7 +8,10 @@ import sys
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
 
-from agent.core import _append_memory_entry
+from agentscope.memory import InMemoryMemory
+from agentscope.message import Msg
+
+from agent.core import _add_history, _append_memory_entry
 
 
 class _AddOnlyMemory:
@@ -52,5 +55,22 @@ class MemoryCompatTests(unittest.TestCase):
         self.assertEqual(memory.records, [{"role": "user", "content": "async"}])
 
 
+class BulkHistoryTests(unittest.TestCase):
+    def test_bulk_add_builds_messages_in_order(self) -> None:
+        memory = InMemoryMemory()
+        existing = Msg(name="user", content="kept", role="user")
+        records = [{"role": "user", "content": f"q{i}"} for i in range(3)]
+        asyncio.run(_add_history(memory, [*records, existing]))
+        msgs = asyncio.run(memory.get_memory())
+        self.assertEqual([m.content for m in msgs], ["q0", "q1", "q2", "kept"])
+        self.assertIsNot(msgs[-1], existing)
+        self.assertEqual(msgs[-1].id, existing.id)
+
+    def test_bulk_add_falls_back_per_entry_for_legacy_memory(self) -> None:
+        memory = _AsyncAddMemory()
+        asyncio.run(_add_history(memory, [{"role": "user", "content": "a"}, {"role": "assistant", "content": "b"}]))
+        self.assertEqual([m.content for m in memory.records], ["a", "b"])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from agent.core import _memory_store
+from memory.durability import Durability, FsyncStats, GroupFlusher
+from memory.jsonl_store import JsonlMemoryStore
+from memory.sqlite_store import SqliteMemoryStore
+from runtime.session import SessionContext
+
+
+class DurabilityParseTests(unittest.TestCase):
+    def test_parses_policies(self) -> None:
+        self.assertEqual(Durability.parse("none"), Durability("none"))
+        self.assertEqual(Durability.parse("per_append"), Durability("per_append"))
+        self.assertEqual(Durability.parse("group"), Durability("group", 50.0))
+        self.assertEqual(Durability.parse("group(5)"), Durability("group", 5.0))
+        for bad in ("always", "group(0)", "group(x)"):
+            with self.assertRaises(ValueError):
+                Durability.parse(bad)
+
+
+class JsonlDurabilityTests(unittest.TestCase):
+    def test_none_never_fsyncs(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = JsonlMemoryStore(Path(tmp))
+            store.append("s", {"n": 1})
+            self.assertEqual(store.fsync_stats.count, 0)
+
+    def test_per_append_fsyncs_every_append_and_new_directories(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = JsonlMemoryStore(Path(tmp), durability="per_append")
+            store.append("s", {"n": 1})
+            store.append_many("s", [{"n": 2}, {"n": 3}])
+            stats = store.fsync_stats.to_dict()
+            self.assertEqual(stats["count"], 3)
+            self.assertGreaterEqual(stats["max_seconds"], stats["mean_seconds"])
+            self.assertEqual(store.count("s"), 3)
+
+    def test_group_fsyncs_dirty_files_together(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = JsonlMemoryStore(Path(tmp), durability="group(200)")
+            for i in range(20):
+                store.append("a", {"n": i})
+                store.append("b", {"n": i}, user_id="alice")
+            self.assertEqual(store.fsync_stats.count, 0)
+            deadline = time.monotonic() + 5
+            while store.fsync_stats.count < 2 and time.monotonic() < deadline:
+                time.sleep(0.02)
+            self.assertEqual(store.fsync_stats.count, 2)
+            store.append("a", {"n": 20})
+            store.sync()
+            self.assertEqual(store.fsync_stats.count, 3)
+
+
+class GroupFlusherTests(unittest.TestCase):
+    def test_close_flushes_pending_files(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "f"
+            path.write_text("x", encoding="utf-8")
+            stats = FsyncStats()
+            flusher = GroupFlusher(interval=60, stats=stats)
+            flusher.mark_dirty(path)
+            flusher.mark_dirty(path)
+            flusher.close()
+            self.assertEqual(stats.count, 1)
+
+
+class SqliteDurabilityTests(unittest.TestCase):
+    def test_policy_maps_to_synchronous_pragma(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            for policy, expected in (("none", 0), ("group", 1), ("per_append", 2)):
+                store = SqliteMemoryStore(Path(tmp) / f"{policy}.sqlite3", durability=policy)
+                level = store._conn().execute("PRAGMA synchronous").fetchone()[0]
+                store.close()
+                self.assertEqual(level, expected)
+
+
+class SharedStoreTests(unittest.TestCase):
+    def test_one_store_per_memory_dir(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            ctx = SessionContext(session_id="a", memory_dir=Path(tmp), memory_durability="group")
+            store = _memory_store(ctx)
+            self.addCleanup(store.close)
+            other_session = SessionContext(session_id="b", memory_dir=Path(tmp) / ".", memory_durability="group")
+            self.assertIs(_memory_store(other_session), store)
+            with self.assertRaisesRegex(ValueError, "different memory_"):
+                _memory_store(SessionContext(session_id="a", memory_dir=Path(tmp), memory_durability="none"))
+
+
+if __name__ == "__main__":
+    unittest.main()
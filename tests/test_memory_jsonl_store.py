@@ -1,14 +1,19 @@
 from __future__ import annotations
 
 import json
+import os
 import tempfile
+import threading
+import time
 import unittest
 from pathlib import Path
 import sys
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
 
-from memory.jsonl_store import JsonlMemoryStore
+from unittest.mock import patch
+
+from memory.jsonl_store import JsonlMemoryStore, _reversed_lines
 
 
 class JsonlMemoryStoreTests(unittest.TestCase):
@@ -140,5 +145,281 @@ class JsonlMemoryStoreTests(unittest.TestCase):
             self.assertEqual(loaded, [{"role": "user", "content": "legacy"}])
 
 
+def _records(count: int) -> list[dict[str, object]]:
+    return [{"role": "user", "content": f"message {i} 你好"} for i in range(count)]
+
+
+class JsonlAppendManyTests(unittest.TestCase):
+    def test_append_many_writes_the_batch_in_one_write(self) -> None:
+        """Verify a user/assistant pair is written by a single os.write call."""
+        with tempfile.TemporaryDirectory() as tmp:
+            store = JsonlMemoryStore(Path(tmp))
+            pair = [{"role": "user", "content": "hi"}, {"role": "assistant", "content": "你好"}]
+            real_write = os.write
+            with patch("memory.jsonl_store.os.write", side_effect=real_write) as write:
+                store.append_many("s", pair, user_id="alice")
+            self.assertEqual(write.call_count, 1)
+            self.assertEqual(store.load("s", user_id="alice"), pair)
+            store.append_many("s", [], user_id="alice")
+            self.assertEqual(store.count("s", user_id="alice"), 2)
+
+
+class JsonlHandlePoolTests(unittest.TestCase):
+    def test_handles_are_reused_bounded_and_evicted_when_idle(self) -> None:
+        """Verify append descriptors are pooled per session with LRU and idle limits."""
+        with tempfile.TemporaryDirectory() as tmp:
+            now = [0.0]
+            store = JsonlMemoryStore(Path(tmp), max_open_handles=2, handle_idle_seconds=10, clock=lambda: now[0])
+            real_open = os.open
+            with patch("memory.jsonl_store.os.open", side_effect=real_open) as opened:
+                for i in range(3):
+                    store.append("a", {"n": i})
+                self.assertEqual(opened.call_count, 2)  # log + index sidecar
+                store.append("b", {"n": 0})
+                store.append("c", {"n": 0})
+                self.assertEqual(len(store._handles), 2)
+                self.assertEqual(len(store._index_handles), 1)
+                store.append("a", {"n": 3})
+                self.assertEqual(opened.call_count, 5)
+                now[0] = 20.0
+                store.append("c", {"n": 1})
+                self.assertEqual(len(store._handles), 1)
+            self.assertEqual([r["n"] for r in store.load("a")], [0, 1, 2, 3])
+
+    def test_idle_handles_close_without_further_appends(self) -> None:
+        """Verify the reaper thread closes idle descriptors even when the store sees no more calls."""
+        with tempfile.TemporaryDirectory() as tmp:
+            store = JsonlMemoryStore(Path(tmp), handle_idle_seconds=0.05)
+            store.append_many("s", [{"n": 0}, {"n": 1}])
+            store.append("s", {"n": 2})
+            self.assertEqual((len(store._handles), len(store._index_handles)), (1, 1))
+            deadline = time.monotonic() + 2
+            while store._reaper is not None and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertEqual((len(store._handles), len(store._index_handles)), (0, 0))
+            store.append("s", {"n": 3})
+            self.assertEqual(len(store._handles), 1)
+            store.close()
+            self.assertEqual([r["n"] for r in store.load("s")], [0, 1, 2, 3])
+
+    def test_close_and_context_manager_release_handles(self) -> None:
+        """Verify close() releases descriptors and the store keeps working afterwards."""
+        with tempfile.TemporaryDirectory() as tmp:
+            with JsonlMemoryStore(Path(tmp), durability="group(60000)") as store:
+                store.append("s", {"n": 1})
+                self.assertEqual(len(store._handles), 1)
+            self.assertEqual(len(store._handles), 0)
+            self.assertEqual(store.fsync_stats.count, 1)
+            store.append("s", {"n": 2})
+            store.close()
+            self.assertEqual(store.load("s"), [{"n": 1}, {"n": 2}])
+            self.assertEqual(store.fsync_stats.count, 2)
+
+
+class JsonlIndexTests(unittest.TestCase):
+    def test_count_get_and_slices_use_the_index(self) -> None:
+        """Verify count/get/load slices read through the offset sidecar."""
+        with tempfile.TemporaryDirectory() as tmp:
+            store = JsonlMemoryStore(Path(tmp))
+            records = _records(10)
+            store.append("s", records[0])
+            store.append_many("s", records[1:])
+            self.assertTrue((Path(tmp) / "s.idx").exists())
+            with patch.object(JsonlMemoryStore, "_rebuild_index", side_effect=AssertionError("rebuilt")):
+                self.assertEqual(store.count("s"), 10)
+                self.assertEqual(store.get("s", 3), records[3])
+                self.assertEqual(store.get("s", -1), records[-1])
+                self.assertEqual(store.load("s", start=7), records[7:])
+                self.assertEqual(store.load("s", start=-3, stop=-1), records[-3:-1])
+                self.assertEqual(store.load("s", start=2, stop=5), records[2:5])
+                self.assertEqual(store.load("s", start=20), [])
+            with self.assertRaises(IndexError):
+                store.get("s", 10)
+            self.assertEqual(store.count("missing"), 0)
+
+    def test_index_updates_without_positional_io(self) -> None:
+        """Verify appends extend the sidecar without os.pread/os.pwrite (absent on Windows)."""
+        with tempfile.TemporaryDirectory() as tmp:
+            store = JsonlMemoryStore(Path(tmp))
+            records = _records(5)
+            store.append("s", records[0])
+            unavailable = AssertionError("positional I/O used")
+            with patch.object(os, "pread", side_effect=unavailable), patch.object(os, "pwrite", side_effect=unavailable):
+                for record in records[1:]:
+                    store.append("s", record)
+            with patch.object(JsonlMemoryStore, "_rebuild_index", side_effect=AssertionError("rebuilt")):
+                self.assertEqual(store.load("s", start=1), records[1:])
+            store.close()
+
+    def test_missing_or_stale_index_is_rebuilt(self) -> None:
+        """Verify a deleted or outdated sidecar is rebuilt from the data file."""
+        with tempfile.TemporaryDirectory() as tmp:
+            store = JsonlMemoryStore(Path(tmp))
+            records = _records(4)
+            store.append_many("s", records[:2])
+            (Path(tmp) / "s.idx").unlink()
+            store.append("s", records[2])
+            self.assertEqual(store.load("s", start=-1), [records[2]])
+
+            with (Path(tmp) / "s.jsonl").open("a", encoding="utf-8") as fh:
+                fh.write("\n" + json.dumps(records[3], ensure_ascii=False) + "\n")
+            self.assertEqual(store.count("s"), 4)
+            self.assertEqual(store.get("s", 3), records[3])
+            store.append("s", {"role": "assistant", "content": "tail"})
+            self.assertEqual(store.load("s", start=-2), [records[3], {"role": "assistant", "content": "tail"}])
+
+    def test_index_follows_legacy_fallback(self) -> None:
+        """Verify slices work for legacy files read on behalf of a named user."""
+        with tempfile.TemporaryDirectory() as tmp:
+            store = JsonlMemoryStore(Path(tmp))
+            store.append_many("legacy", _records(3))
+            self.assertEqual(store.count("legacy", user_id="alice"), 3)
+            self.assertEqual(store.load("legacy", user_id="alice", start=1), _records(3)[1:])
+
+
+class JsonlTailTests(unittest.TestCase):
+    def test_load_tail_returns_last_records_in_order(self) -> None:
+        """Verify load_tail() decodes only the last n records, oldest first."""
+        with tempfile.TemporaryDirectory() as tmp:
+            store = JsonlMemoryStore(Path(tmp))
+            records = _records(50)
+            store.append_many("s", records)
+            self.assertEqual(store.load_tail("s", 3), records[-3:])
+            self.assertEqual(store.load_tail("s", 500), records)
+            self.assertEqual(store.load_tail("s", 0), [])
+            self.assertEqual(store.load_tail("missing", 3), [])
+
+    def test_reversed_lines_handles_block_boundaries_and_blank_lines(self) -> None:
+        """Verify records split across tiny read blocks come back whole."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "s.jsonl"
+            lines = [json.dumps(r, ensure_ascii=False) for r in _records(5)]
+            path.write_text("\n".join(lines[:3]) + "\n\n" + "\n".join(lines[3:]), encoding="utf-8")
+            for block_size in (1, 7, 64, 4096):
+                got = [line.decode("utf-8") for line in _reversed_lines(path.open("rb"), block_size)]
+                self.assertEqual(got, list(reversed(lines)))
+
+    def test_load_tail_follows_legacy_fallback(self) -> None:
+        """Verify load_tail() reads base_dir/session.jsonl for a named user."""
+        with tempfile.TemporaryDirectory() as tmp:
+            store = JsonlMemoryStore(Path(tmp))
+            store.append_many("legacy", _records(4))
+            self.assertEqual(store.load_tail("legacy", 2, user_id="alice"), _records(4)[-2:])
+
+
+class JsonlSegmentTests(unittest.TestCase):
+    def _rotated_store(self, tmp: str, compression: str | None) -> tuple[JsonlMemoryStore, list[dict]]:
+        store = JsonlMemoryStore(Path(tmp), segment_max_bytes=200, compression=compression)
+        records = [{"n": i, "text": "记录" * 5} for i in range(40)]
+        for i in range(0, 40, 3):
+            store.append_many("s", records[i : i + 3], user_id="alice")
+        store.close()  # waits for the background compressions
+        return store, records
+
+    def test_reads_span_compressed_segments(self) -> None:
+        """Verify rotated sessions read the same as one file for every read API."""
+        for compression, suffix in (("gzip", ".seg.gz"), ("lzma", ".seg.xz"), (None, ".seg")):
+            with self.subTest(compression=compression), tempfile.TemporaryDirectory() as tmp:
+                store, records = self._rotated_store(tmp, compression)
+                segments = sorted((Path(tmp) / "alice" / "s.segments").iterdir())
+                self.assertGreater(len(segments), 3)
+                self.assertTrue(all(p.name.endswith(suffix) for p in segments))
+                self.assertLess(Path(tmp, "alice", "s.jsonl").stat().st_size, 200)
+                self.assertEqual(store.load("s", user_id="alice"), records)
+                self.assertEqual(store.count("s", user_id="alice"), 40)
+                self.assertEqual(store.load("s", user_id="alice", start=5, stop=33), records[5:33])
+                self.assertEqual(store.load("s", user_id="alice", start=-7), records[-7:])
+                self.assertEqual(store.get("s", 0, user_id="alice"), records[0])
+                self.assertEqual(store.load_tail("s", 25, user_id="alice"), records[-25:])
+                self.assertEqual(list(store.iter_recent("s", user_id="alice")), records[::-1])
+
+    def test_recent_reads_do_not_decompress_old_segments(self) -> None:
+        """Verify slices and tails inside the active file never open sealed segments."""
+        with tempfile.TemporaryDirectory() as tmp:
+            store, records = self._rotated_store(tmp, "gzip")
+            records.append({"n": 40})
+            store.append("s", records[-1], user_id="alice")
+            with patch("memory.jsonl_store._open_segment", side_effect=AssertionError("decompressed")):
+                self.assertEqual(store.load("s", user_id="alice", start=-1), records[-1:])
+                self.assertEqual(store.load_tail("s", 1, user_id="alice"), records[-1:])
+                self.assertEqual(next(store.iter_recent("s", user_id="alice")), records[-1])
+
+    def test_rotation_releases_pooled_handles_and_keeps_appending(self) -> None:
+        """Verify the sealed file's descriptors are closed and new appends start a fresh file."""
+        with tempfile.TemporaryDirectory() as tmp:
+            store = JsonlMemoryStore(Path(tmp), segment_max_bytes=5)
+            store.append("s", {"n": 0})
+            self.assertEqual(len(store._handles), 0)
+            self.assertEqual(Path(tmp, "s.jsonl").stat().st_size, 0)
+            store.append("s", {"n": 1})
+            self.assertEqual(store.load("s"), [{"n": 0}, {"n": 1}])
+            store.close()
+            self.assertEqual(sorted(p.name for p in Path(tmp, "s.segments").iterdir()), ["000000000001.seg.gz", "000000000002.seg.gz"])
+
+    def test_compression_runs_off_the_appending_thread(self) -> None:
+        """Verify a rotating append returns before its segment is compressed and reads still work."""
+        with tempfile.TemporaryDirectory() as tmp:
+            store = JsonlMemoryStore(Path(tmp), segment_max_bytes=5, compression="lzma")
+            release = threading.Event()
+            real_compress = JsonlMemoryStore._compress_segment
+
+            def blocked_compress(self: JsonlMemoryStore, sealed: Path) -> None:
+                release.wait(timeout=5)
+                real_compress(self, sealed)
+
+            with patch.object(JsonlMemoryStore, "_compress_segment", blocked_compress):
+                store.append("s", {"n": 0})
+                self.assertEqual([p.name for p in Path(tmp, "s.segments").iterdir()], ["000000000001.seg"])
+                self.assertEqual(store.load("s"), [{"n": 0}])
+                release.set()
+                store.close()
+            self.assertEqual([p.name for p in Path(tmp, "s.segments").iterdir()], ["000000000001.seg.xz"])
+            self.assertEqual(store.load("s"), [{"n": 0}])
+            store.close()
+
+    def test_rotation_by_another_store_loses_no_appends(self) -> None:
+        """Verify a store whose pooled descriptor was rotated away by another store reopens the file."""
+        with tempfile.TemporaryDirectory() as tmp:
+            first = JsonlMemoryStore(Path(tmp), segment_max_bytes=40)
+            second = JsonlMemoryStore(Path(tmp), segment_max_bytes=40)
+            first.append("s", {"n": 0})
+            second.append("s", {"n": 1, "pad": "x" * 20})  # rotates first's open file away
+            first.append("s", {"n": 2})
+            second.append("s", {"n": 3})
+            self.assertEqual([r["n"] for r in JsonlMemoryStore(Path(tmp)).load("s")], [0, 1, 2, 3])
+            self.assertEqual(first.count("s"), 4)
+            first.close()
+            second.close()
+
+    def test_concurrent_stores_append_and_rotate_safely(self) -> None:
+        """Verify appends from several stores on one directory all survive concurrent rotations."""
+        with tempfile.TemporaryDirectory() as tmp:
+            stores = [JsonlMemoryStore(Path(tmp), segment_max_bytes=300) for _ in range(3)]
+
+            def write(worker: int) -> None:
+                for i in range(60):
+                    stores[worker].append("s", {"w": worker, "i": i})
+
+            threads = [threading.Thread(target=write, args=(w,)) for w in range(len(stores))]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            records = JsonlMemoryStore(Path(tmp)).load("s")
+            self.assertEqual(len(records), 180)
+            for worker in range(len(stores)):
+                self.assertEqual([r["i"] for r in records if r["w"] == worker], list(range(60)))
+            for store in stores:
+                store.close()
+
+    def test_invalid_segment_options_raise(self) -> None:
+        """Verify unknown compression names and non-positive sizes are rejected."""
+        with tempfile.TemporaryDirectory() as tmp:
+            with self.assertRaises(ValueError):
+                JsonlMemoryStore(Path(tmp), segment_max_bytes=0)
+            with self.assertRaises(ValueError):
+                JsonlMemoryStore(Path(tmp), compression="zstd")
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from agent.core import _AGENT_POOL, _session_key, run_once
+from llm.client import MockModel
+from memory.jsonl_store import JsonlMemoryStore
+from memory.retrieval import load_relevant_history
+from runtime.session import SessionContext
+
+from helpers import PooledAgentTestCase, seed_workspace
+
+TOPICS = [
+    ("帮我订周五去釜山的火车票", "已为你查询周五去釜山的 KTX 车次。"),
+    ("How do I rotate the nginx logs?", "Use logrotate with a daily rule."),
+    ("推荐一家首尔的烤肉店", "可以试试麻浦的猪排骨。"),
+    ("What's the capital of Australia?", "Canberra."),
+    ("明天提醒我交房租", "好的，明天上午提醒你交房租。"),
+    ("Summarize the meeting notes", "Release moves to Friday."),
+]
+
+
+def _turn(user: str, assistant: str) -> list[dict[str, str]]:
+    return [{"role": "user", "content": user}, {"role": "assistant", "content": assistant}]
+
+
+def _fill(store: JsonlMemoryStore, session_id: str, user_id: str = "default") -> None:
+    for user, assistant in TOPICS:
+        store.append_many(session_id, _turn(user, assistant), user_id=user_id)
+
+
+class LoadRelevantHistoryTests(unittest.TestCase):
+    def test_relevant_turns_precede_recent_window(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = JsonlMemoryStore(Path(tmp))
+            _fill(store, "s")
+            history = load_relevant_history(store, "s", "釜山的火车几点？", top_k=1, recent_turns=2)
+            self.assertEqual(history[0]["role"], "system")
+            self.assertEqual(history[0]["name"], "retrieval")
+            self.assertEqual(history[1:3], _turn(*TOPICS[0]))
+            self.assertEqual(history[3:], _turn(*TOPICS[4]) + _turn(*TOPICS[5]))
+
+    def test_recent_turns_are_not_retrieved_twice(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = JsonlMemoryStore(Path(tmp))
+            _fill(store, "s")
+            history = load_relevant_history(store, "s", "meeting notes", top_k=2, recent_turns=1)
+            self.assertEqual(history, _turn(*TOPICS[5]))
+            self.assertEqual(load_relevant_history(store, "s", "釜山", top_k=0, recent_turns=1), _turn(*TOPICS[5]))
+
+    def test_cross_session_retrieval_lists_other_sessions_first(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = JsonlMemoryStore(Path(tmp))
+            _fill(store, "old", user_id="alice")
+            store.append_many("new", _turn("首尔烤肉和釜山火车", "好的"), user_id="alice")
+            store.append_many("new", _turn("hello", "hi"), user_id="alice")
+            local = load_relevant_history(store, "new", "烤肉", top_k=2, recent_turns=1, user_id="alice")
+            self.assertEqual(local[1:], _turn("首尔烤肉和釜山火车", "好的") + _turn("hello", "hi"))
+            both = load_relevant_history(
+                store, "new", "烤肉", top_k=2, recent_turns=1, user_id="alice", cross_session=True
+            )
+            self.assertEqual(both[1:3], _turn(*TOPICS[2]))
+            self.assertEqual(both[3:5], _turn("首尔烤肉和釜山火车", "好的"))
+
+
+class RetrievalRunOnceTests(PooledAgentTestCase):
+    @patch("agent.core.build_model_from_env", side_effect=MockModel)
+    def test_turn_memory_holds_relevant_and_recent_turns_only(self, _: object) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            seed_workspace(Path(tmp) / "ws")
+            ctx = SessionContext(
+                session_id="retrieved",
+                enabled_skills=[],
+                memory_dir=Path(tmp) / "data",
+                workspace_base_dir=Path(tmp) / "ws",
+                retrieval_top_k=1,
+                retrieval_recent_turns=1,
+            )
+            _fill(JsonlMemoryStore(ctx.memory_dir), "retrieved")
+
+            async def two_turns() -> tuple[list, list]:
+                await run_once("房租什么时候交？", ctx)
+                session = _AGENT_POOL.get(_session_key(ctx))
+                first = await session.memory.get_memory()
+                await run_once("nginx logs again", ctx)
+                return first, await session.memory.get_memory()
+
+            first, second = asyncio.run(two_turns())
+            self.assertEqual(
+                [m.content for m in first if m.role == "user"],
+                [TOPICS[4][0], TOPICS[5][0], "房租什么时候交？"],
+            )
+            self.assertEqual(
+                [m.content for m in second if m.role == "user"],
+                [TOPICS[1][0], "房租什么时候交？", "nginx logs again"],
+            )
+
+    def test_retrieval_requires_a_searchable_backend(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            seed_workspace(Path(tmp) / "ws")
+            ctx = SessionContext(
+                session_id="s",
+                enabled_skills=[],
+                memory_dir=Path(tmp) / "data",
+                workspace_base_dir=Path(tmp) / "ws",
+                memory_backend="sqlite",
+                retrieval_top_k=2,
+            )
+            with self.assertRaisesRegex(ValueError, "search"):
+                asyncio.run(run_once("hi", ctx))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from memory.jsonl_store import JsonlMemoryStore
+from memory.search import SearchIndex, record_text, tokenize
+
+
+class TokenizeTests(unittest.TestCase):
+    def test_latin_words_and_cjk_ngrams(self) -> None:
+        self.assertEqual(tokenize("Seoul WEATHER, 2024!"), ["seoul", "weather", "2024"])
+        self.assertEqual(tokenize("首尔天气"), ["首", "尔", "天", "气", "首尔", "尔天", "天气"])
+        self.assertEqual(tokenize("用 python 写"), ["用", "python", "写"])
+
+    def test_non_ascii_words_stay_whole(self) -> None:
+        self.assertEqual(tokenize("Café naïve Привет"), ["café", "naïve", "привет"])
+        self.assertEqual(tokenize("안녕 세계"), ["안", "녕", "안녕", "세", "계", "세계"])
+
+    def test_record_text_reads_text_blocks(self) -> None:
+        record = {"content": [{"type": "text", "text": "a"}, {"type": "tool_use", "name": "x"}, {"type": "text", "text": "b"}]}
+        self.assertEqual(record_text(record), "a\nb")
+        self.assertEqual(record_text({"content": None}), "")
+
+
+class SearchIndexTests(unittest.TestCase):
+    def test_add_only_extends_the_indexed_prefix(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            index = SearchIndex(Path(tmp) / "idx.sqlite3")
+            records = [{"content": f"note {i}"} for i in range(4)]
+            self.assertEqual(index.add("s", 0, records[:2]), 2)
+            self.assertEqual(index.add("s", 1, records[1:3]), 1)
+            self.assertEqual(index.add("s", 5, records[:1]), 0)
+            self.assertEqual(index.indexed("s"), 3)
+            self.assertEqual([seq for _, seq, _ in index.search("note", limit=10)], [2, 1, 0])
+            index.drop("s")
+            self.assertEqual(index.indexed("s"), 0)
+            self.assertEqual(index.search("note"), [])
+            index.close()
+
+    def test_bm25_weights_rare_terms_and_scopes_statistics(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            index = SearchIndex(Path(tmp) / "idx.sqlite3")
+            index.add("a", 0, [{"content": "deploy the service"}, {"content": "deploy kubernetes cluster"}])
+            index.add("a", 2, [{"content": "deploy"}, {"content": "service deploy deploy"}])
+            index.add("b", 0, [{"content": "kubernetes notes"}])
+            ranked = index.search("deploy kubernetes", limit=10)
+            self.assertEqual(ranked[0][:2], ("a", 1))
+            self.assertGreater(ranked[0][2], ranked[1][2])
+            self.assertEqual({(s, seq) for s, seq, _ in index.search("kubernetes", session_id="b")}, {("b", 0)})
+            self.assertEqual(index.search("kubernetes", limit=1, session_id="a")[0][:2], ("a", 1))
+            index.close()
+
+
+    def test_index_from_another_tokenizer_version_is_rebuilt(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "idx.sqlite3"
+            index = SearchIndex(path)
+            index.add("s", 0, [{"content": "Привет"}])
+            index._db.execute("PRAGMA user_version = 1")
+            index.close()
+            index = SearchIndex(path)
+            self.assertEqual(index.indexed("s"), 0)
+            index.add("s", 0, [{"content": "Привет"}])
+            self.assertEqual([seq for _, seq, _ in index.search("привет")], [0])
+            index.close()
+
+
+class StoreSearchTests(unittest.TestCase):
+    def test_search_ranks_across_sessions(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = JsonlMemoryStore(Path(tmp), search_index=True)
+            store.append_many("trip", [
+                {"role": "user", "content": "明天首尔天气怎么样？"},
+                {"role": "assistant", "content": "首尔明天晴。"},
+            ], user_id="alice")
+            store.append("work", {"role": "user", "content": "Schedule the release meeting"}, user_id="alice")
+            store.append("other", {"role": "user", "content": "首尔天气"}, user_id="bob")
+
+            hits = store.search("alice", "首尔天气", limit=5)
+            self.assertEqual([(h.session_id, h.index) for h in hits], [("trip", 0), ("trip", 1)])
+            self.assertEqual(hits[0].record["content"], "明天首尔天气怎么样？")
+            self.assertEqual(store.search("alice", "release MEETING")[0].session_id, "work")
+            self.assertEqual(store.search("alice", "nothing here"), [])
+            self.assertEqual(len(store.search("bob", "天气")), 1)
+            self.assertEqual(store.search("alice", "release", session_id="trip"), [])
+            store.close()
+
+    def test_appends_update_the_index_without_rescanning_logs(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = JsonlMemoryStore(Path(tmp), search_index=True, segment_max_bytes=64)
+            for i in range(10):
+                store.append("s", {"role": "user", "content": f"entry {i} 记录"})
+            with patch.object(SearchIndex, "add", side_effect=AssertionError("rescanned")):
+                hits = store.search("default", "记录", limit=3)
+            self.assertEqual([h.index for h in hits], [9, 8, 7])
+            self.assertEqual(hits[0].record["content"], "entry 9 记录")
+            store.close()
+
+    def test_search_catches_up_on_unindexed_and_rewritten_logs(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            writer = JsonlMemoryStore(Path(tmp))
+            writer.append_many("s", [{"content": "alpha"}, {"content": "beta"}])
+            store = JsonlMemoryStore(Path(tmp))
+            self.assertEqual([h.index for h in store.search("default", "beta")], [1])
+            writer.append("s", {"content": "beta again"})
+            # BM25 prefers the shorter record with the same term frequency.
+            self.assertEqual([h.index for h in store.search("default", "beta")], [1, 2])
+
+            Path(tmp, "s.jsonl").write_text('{"content": "gamma"}\n', encoding="utf-8")
+            self.assertEqual(store.search("default", "beta"), [])
+            self.assertEqual(store.search("default", "gamma")[0].record, {"content": "gamma"})
+            store.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
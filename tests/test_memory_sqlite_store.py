@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import asyncio
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from agent.core import run_once
+from llm.client import MockModel
+from memory.jsonl_store import JsonlMemoryStore
+from memory.sqlite_store import SqliteMemoryStore, migrate_jsonl
+from memory.store import open_memory_store
+
+from helpers import PooledAgentTestCase, make_ctx
+
+
+def _records(count: int, prefix: str = "m") -> list[dict[str, str]]:
+    return [{"role": "user", "content": f"{prefix}{i} 你好"} for i in range(count)]
+
+
+class SqliteMemoryStoreTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.store = SqliteMemoryStore(Path(self._tmp.name) / "memory.sqlite3")
+        self.addCleanup(self.store.close)
+
+    def test_append_and_load_match_jsonl_semantics(self) -> None:
+        records = _records(6)
+        self.store.append("s", records[0])
+        self.store.append_many("s", records[1:])
+        self.assertEqual(self.store.load("s"), records)
+        self.assertEqual(self.store.load("missing"), [])
+        self.assertEqual(self.store.count("s"), 6)
+        self.assertEqual(self.store.get("s", -2), records[-2])
+        self.assertEqual(self.store.load("s", start=-3, stop=-1), records[-3:-1])
+        self.assertEqual(self.store.load_tail("s", 2), records[-2:])
+        self.assertEqual(list(self.store.iter_recent("s")), list(reversed(records)))
+        with self.assertRaises(IndexError):
+            self.store.get("s", 6)
+
+    def test_users_are_isolated_with_default_fallback(self) -> None:
+        self.store.append("shared", {"content": "legacy"})
+        self.assertEqual(self.store.load("shared", user_id="alice"), [{"content": "legacy"}])
+        self.store.append("shared", {"content": "mine"}, user_id="alice")
+        self.assertEqual(self.store.load("shared", user_id="alice"), [{"content": "mine"}])
+        self.assertEqual(self.store.load("shared"), [{"content": "legacy"}])
+        with self.assertRaises(ValueError):
+            self.store.append("shared", {"content": "x"}, user_id="../bob")
+
+    def test_concurrent_writers_keep_contiguous_sequences(self) -> None:
+        def write(prefix: str) -> None:
+            for i in range(20):
+                self.store.append_many("s", _records(2, f"{prefix}{i}-"))
+
+        threads = [threading.Thread(target=write, args=(name,)) for name in "abcd"]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.store.count("s"), 160)
+        self.assertEqual(len(self.store.load("s")), 160)
+        mode = self.store._conn().execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode, "wal")
+
+    def test_summary_round_trip(self) -> None:
+        self.assertIsNone(self.store.load_summary("s"))
+        self.store.save_summary("s", {"upto": 2, "content": "old"}, user_id="alice")
+        self.store.save_summary("s", {"upto": 4, "content": "new"}, user_id="alice")
+        self.assertEqual(self.store.load_summary("s", user_id="alice"), {"upto": 4, "content": "new"})
+
+
+class MigrateJsonlTests(unittest.TestCase):
+    def test_migrates_default_and_user_sessions_once(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            source = JsonlMemoryStore(Path(tmp) / "jsonl")
+            source.append_many("a", _records(3))
+            source.append_many("b", _records(2), user_id="alice")
+            source.save_summary("b", {"upto": 1, "content": "sum"}, user_id="alice")
+            target = SqliteMemoryStore(Path(tmp) / "memory.sqlite3")
+            self.addCleanup(target.close)
+
+            stats = migrate_jsonl(Path(tmp) / "jsonl", target)
+            self.assertEqual(stats, {"sessions": 2, "records": 5, "skipped": 0})
+            self.assertEqual(target.load("a"), _records(3))
+            self.assertEqual(target.load("b", user_id="alice"), _records(2))
+            self.assertEqual(target.load_summary("b", user_id="alice"), {"upto": 1, "content": "sum"})
+
+            again = migrate_jsonl(Path(tmp) / "jsonl", target)
+            self.assertEqual(again, {"sessions": 0, "records": 0, "skipped": 2})
+            self.assertEqual(target.count("a"), 3)
+
+
+class SqliteBackendTurnTests(PooledAgentTestCase):
+    @patch("agent.core.build_model_from_env", side_effect=MockModel)
+    def test_run_once_persists_to_sqlite_backend(self, _: object) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            ctx = make_ctx(Path(tmp), "sql", user_id="alice", memory_backend="sqlite")
+            asyncio.run(run_once("hello", ctx))
+            store = SqliteMemoryStore(Path(tmp) / "data" / "memory.sqlite3")
+            self.addCleanup(store.close)
+            self.assertEqual([r["role"] for r in store.load("sql", user_id="alice")], ["user", "assistant"])
+            self.assertFalse((Path(tmp) / "data" / "alice").exists())
+
+    def test_unknown_backend_is_rejected(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp, self.assertRaises(ValueError):
+            open_memory_store(Path(tmp), "redis")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+from agent.core import _AGENT_POOL, _session_key, flush_memory_writes, run_once
+from llm.client import MockModel
+from memory.jsonl_store import JsonlMemoryStore
+from memory.summarizer import RollingSummarizer, load_with_summary, summary_record
+from runtime.session import SessionContext
+
+from helpers import PooledAgentTestCase, make_ctx, seed_workspace
+
+
+def _turns(count: int, start: int = 0) -> list[dict[str, str]]:
+    records = []
+    for i in range(start, start + count):
+        records.append({"role": "user", "content": f"question {i}"})
+        records.append({"role": "assistant", "content": f"answer {i}"})
+    return records
+
+
+class SummaryStoreTests(unittest.TestCase):
+    def test_summary_sidecar_round_trip(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = JsonlMemoryStore(Path(tmp))
+            self.assertIsNone(store.load_summary("s", user_id="alice"))
+            store.save_summary("s", {"upto": 4, "content": "earlier"}, user_id="alice")
+            self.assertEqual(store.load_summary("s", user_id="alice"), {"upto": 4, "content": "earlier"})
+            for record in _turns(3):
+                store.append("s", record, user_id="alice")
+            summary, tail = load_with_summary(store, "s", user_id="alice")
+            self.assertEqual(summary["content"], "earlier")
+            self.assertEqual(tail, _turns(1, start=2))
+            self.assertEqual(summary_record(summary)["role"], "system")
+
+
+class RollingSummarizerTests(unittest.TestCase):
+    def test_folds_old_records_and_merges_previous_summary(self) -> None:
+        calls: list[tuple[str | None, int]] = []
+
+        async def summarize(previous: str | None, records: list[dict[str, Any]]) -> str:
+            calls.append((previous, len(records)))
+            return f"summary of {records[-1]['content']}"
+
+        with tempfile.TemporaryDirectory() as tmp:
+            store = JsonlMemoryStore(Path(tmp))
+            summarizer = RollingSummarizer(threshold=6, keep_recent=2)
+            for record in _turns(3):
+                store.append("s", record)
+            self.assertFalse(asyncio.run(summarizer.summarize_if_needed(store, "s", summarize)))
+
+            for record in _turns(2, start=3):
+                store.append("s", record)
+            self.assertTrue(asyncio.run(summarizer.summarize_if_needed(store, "s", summarize)))
+            self.assertEqual(store.load_summary("s"), {"upto": 8, "content": "summary of answer 3"})
+
+            for record in _turns(3, start=5):
+                store.append("s", record)
+            self.assertTrue(asyncio.run(summarizer.summarize_if_needed(store, "s", summarize)))
+            self.assertEqual(calls, [(None, 8), ("summary of answer 3", 6)])
+            summary, tail = load_with_summary(store, "s")
+            self.assertEqual(summary["upto"], 14)
+            self.assertEqual(tail, _turns(1, start=7))
+
+    def test_schedule_runs_one_task_per_session_and_survives_errors(self) -> None:
+        async def failing(previous: str | None, records: list[dict[str, Any]]) -> str:
+            raise RuntimeError("model down")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            store = JsonlMemoryStore(Path(tmp))
+            for record in _turns(5):
+                store.append("s", record)
+            summarizer = RollingSummarizer(threshold=4, keep_recent=2)
+
+            async def scenario() -> tuple[Any, Any]:
+                first = summarizer.schedule(store, "s", failing)
+                second = summarizer.schedule(store, "s", failing)
+                await summarizer.wait()
+                return first, second
+
+            with self.assertLogs("memory.summarizer", level="ERROR"):
+                first, second = asyncio.run(scenario())
+            self.assertIsNotNone(first)
+            self.assertIsNone(second)
+            self.assertFalse(first.result())
+            self.assertIsNone(store.load_summary("s"))
+
+    def test_rejects_threshold_not_above_keep_recent(self) -> None:
+        with self.assertRaises(ValueError):
+            RollingSummarizer(threshold=4, keep_recent=4)
+
+    def test_session_context_rejects_invalid_summary_settings(self) -> None:
+        with self.assertRaisesRegex(ValueError, "summarize_after"):
+            SessionContext(session_id="s", summarize_after=4, summary_keep_recent=4)
+        with self.assertRaisesRegex(ValueError, "summarize_after"):
+            SessionContext(session_id="s", summarize_after=4, summary_keep_recent=-1)
+        SessionContext(session_id="s", summary_keep_recent=100)
+
+
+class SummarizedRunOnceTests(PooledAgentTestCase):
+    @patch("agent.core.build_model_from_env", side_effect=MockModel)
+    def test_turn_summarizes_in_background_and_next_turn_uses_summary(self, _: object) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            seed_workspace(Path(tmp) / "ws")
+            ctx = SessionContext(
+                session_id="summarized",
+                enabled_skills=[],
+                memory_dir=Path(tmp) / "data",
+                workspace_base_dir=Path(tmp) / "ws",
+                summarize_after=10,
+                summary_keep_recent=4,
+            )
+            store = JsonlMemoryStore(ctx.memory_dir)
+            for record in _turns(5):
+                store.append("summarized", record)
+
+            async def two_turns() -> list:
+                await run_once("hello", ctx)
+                await flush_memory_writes()
+                await run_once("hello again", ctx)
+                session = _AGENT_POOL.get(_session_key(ctx))
+                return await session.memory.get_memory()
+
+            msgs = asyncio.run(two_turns())
+            summary = store.load_summary("summarized")
+            self.assertEqual(summary["upto"], 8)
+            self.assertEqual(msgs[0].role, "system")
+            self.assertEqual(
+                [m.content for m in msgs if m.role == "user"],
+                ["question 4", "hello", "hello again"],
+            )
+            self.assertEqual(len(store.load("summarized")), 14)
+
+    @patch("agent.core.build_model_from_env", side_effect=MockModel)
+    def test_summary_outlives_the_loop_of_the_turn(self, _: object) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            ctx = make_ctx(Path(tmp), "per-call", summarize_after=10, summary_keep_recent=4)
+            store = JsonlMemoryStore(ctx.memory_dir)
+            for record in _turns(5):
+                store.append("per-call", record)
+            # README/CLI pattern: a fresh loop per turn, closed as soon as the turn returns.
+            asyncio.run(run_once("hello", ctx))
+            asyncio.run(flush_memory_writes())
+            self.assertEqual(store.load_summary("per-call")["upto"], 8)
+
+    @patch("agent.core.build_model_from_env", side_effect=MockModel)
+    def test_invalid_summary_settings_fail_before_the_turn(self, _: object) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            ctx = make_ctx(Path(tmp), "mutated", summarize_after=10)
+            ctx.summary_keep_recent = 10
+            with self.assertRaises(ValueError):
+                asyncio.run(run_once("hello", ctx))
+            self.assertEqual(JsonlMemoryStore(ctx.memory_dir).load("mutated"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from agent.core import _AGENT_POOL, _session_key, run_once
+from llm.client import MockModel
+from memory.jsonl_store import JsonlMemoryStore
+from memory.window import estimate_tokens, select_window
+from runtime.session import SessionContext
+
+from helpers import PooledAgentTestCase, seed_workspace
+
+
+def _turns(count: int) -> list[dict[str, str]]:
+    records = []
+    for i in range(count):
+        records.append({"role": "user", "content": f"question {i}"})
+        records.append({"role": "assistant", "content": f"answer {i}"})
+    return records
+
+
+class EstimateTokensTests(unittest.TestCase):
+    def test_counts_cjk_per_char_and_ascii_per_four_chars(self) -> None:
+        self.assertEqual(estimate_tokens(""), 0)
+        self.assertEqual(estimate_tokens("abcd"), 1)
+        self.assertEqual(estimate_tokens("你好世界"), 4)
+        self.assertEqual(estimate_tokens("你好 abcd"), 2 + 2)
+
+
+class SelectWindowTests(unittest.TestCase):
+    def test_max_turns_keeps_last_turns(self) -> None:
+        records = _turns(5)
+        window = select_window(reversed(records), max_turns=2)
+        self.assertEqual(window, records[-4:])
+
+    def test_token_budget_never_starts_mid_turn(self) -> None:
+        records = _turns(5)
+        per_record = estimate_tokens("question 0") + 4
+        window = select_window(reversed(records), max_tokens=per_record * 3)
+        self.assertEqual(window, records[-2:])
+
+    def test_no_limits_returns_everything(self) -> None:
+        records = _turns(3)
+        self.assertEqual(select_window(reversed(records)), records)
+
+    def test_window_stops_consuming_iterator(self) -> None:
+        consumed = 0
+
+        def newest_first():
+            nonlocal consumed
+            for record in reversed(_turns(100)):
+                consumed += 1
+                yield record
+
+        select_window(newest_first(), max_turns=1)
+        self.assertEqual(consumed, 4)
+
+
+class IterRecentTests(unittest.TestCase):
+    def test_iter_recent_yields_newest_first_with_legacy_fallback(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = JsonlMemoryStore(Path(tmp))
+            for record in _turns(2):
+                store.append("legacy", record)
+            recent = list(store.iter_recent("legacy", user_id="alice"))
+            self.assertEqual(recent, list(reversed(_turns(2))))
+            self.assertEqual(list(store.iter_recent("missing")), [])
+
+
+class WindowedRunOnceTests(PooledAgentTestCase):
+    @patch("agent.core.build_model_from_env", side_effect=MockModel)
+    def test_history_window_limits_hydration_and_pooled_memory(self, _: object) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            seed_workspace(Path(tmp) / "ws")
+            ctx = SessionContext(
+                session_id="windowed",
+                enabled_skills=[],
+                memory_dir=Path(tmp) / "data",
+                workspace_base_dir=Path(tmp) / "ws",
+                history_max_turns=2,
+            )
+            store = JsonlMemoryStore(ctx.memory_dir)
+            for record in _turns(10):
+                store.append("windowed", record)
+
+            asyncio.run(run_once("hello", ctx))
+            session = _AGENT_POOL.get(_session_key(ctx))
+            msgs = asyncio.run(session.memory.get_memory())
+            self.assertEqual(
+                [m.content for m in msgs if m.role == "user"], ["question 9", "hello"]
+            )
+            self.assertEqual(len(store.load("windowed")), 22)
+
+
+if __name__ == "__main__":
+    unittest.main()
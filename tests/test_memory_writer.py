@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import asyncio
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import Future
+from pathlib import Path
+from unittest.mock import patch
+
+from agent.core import _AGENT_POOL, _MEMORY_WRITER, _session_key, flush_memory_writes, run_once
+from llm.client import MockModel
+from memory.jsonl_store import JsonlMemoryStore
+from memory.writer import MemoryWriter, flush_interval_from_env
+from runtime.session import SessionContext
+
+from helpers import make_ctx, seed_workspace
+
+
+class MemoryWriterTests(unittest.TestCase):
+    def test_batches_appends_per_session_in_order(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = JsonlMemoryStore(Path(tmp))
+            writer = MemoryWriter(flush_interval=0.05)
+            original = JsonlMemoryStore.append_many
+            calls: list[tuple[str, int]] = []
+
+            def recording_append_many(self: JsonlMemoryStore, session_id: str, records: list, user_id: str = "default") -> None:
+                calls.append((session_id, len(records)))
+                original(self, session_id, records, user_id=user_id)
+
+            with patch.object(JsonlMemoryStore, "append_many", recording_append_many):
+                futures = [
+                    writer.submit(store, "a", [{"i": 1}]),
+                    writer.submit(store, "b", [{"i": 1}]),
+                    writer.submit(store, "a", [{"i": 2}, {"i": 3}]),
+                ]
+                for future in futures:
+                    future.result(timeout=2)
+            writer.close()
+
+            self.assertEqual(sorted(calls), [("a", 3), ("b", 1)])
+            self.assertEqual([r["i"] for r in store.load("a")], [1, 2, 3])
+            self.assertEqual(writer.records_written, 4)
+
+    def test_commits_without_waiting_and_batches_what_queued_meanwhile(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = JsonlMemoryStore(Path(tmp))
+            writer = MemoryWriter()
+            original = JsonlMemoryStore.append_many
+            release = threading.Event()
+            calls: list[int] = []
+
+            def blocking_append_many(self: JsonlMemoryStore, session_id: str, records: list, user_id: str = "default") -> None:
+                calls.append(len(records))
+                release.wait(2)
+                original(self, session_id, records, user_id=user_id)
+
+            with patch.object(JsonlMemoryStore, "append_many", blocking_append_many):
+                first = writer.submit(store, "s", [{"i": 0}])
+                while not calls:
+                    time.sleep(0.001)
+                queued = [writer.submit(store, "s", [{"i": i}]) for i in range(1, 4)]
+                release.set()
+                for future in (first, *queued):
+                    future.result(timeout=2)
+            writer.close()
+            self.assertEqual(calls, [1, 3])
+            self.assertEqual([r["i"] for r in store.load("s")], [0, 1, 2, 3])
+
+    def test_flush_interval_from_env(self) -> None:
+        self.assertEqual(flush_interval_from_env({}), 0.0)
+        self.assertEqual(flush_interval_from_env({"AGENTSCOPE_MEMORY_FLUSH_INTERVAL": " 0.02 "}), 0.02)
+        for bad in ("-1", "soon", "nan"):
+            with self.assertRaises(ValueError):
+                flush_interval_from_env({"AGENTSCOPE_MEMORY_FLUSH_INTERVAL": bad})
+
+    def test_flush_waits_for_queued_appends(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = JsonlMemoryStore(Path(tmp))
+            writer = MemoryWriter(flush_interval=0.2)
+            writer.submit(store, "s", [{"role": "user", "content": "hi"}], user_id="alice")
+            writer.flush(timeout=2)
+            self.assertEqual(store.load("s", user_id="alice"), [{"role": "user", "content": "hi"}])
+            asyncio.run(writer.aflush())
+            writer.close()
+
+    def test_close_flushes_and_rejects_new_appends(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = JsonlMemoryStore(Path(tmp))
+            writer = MemoryWriter(flush_interval=0.5)
+            writer.submit(store, "s", [{"n": 1}])
+            writer.close(timeout=2)
+            self.assertEqual(store.load("s"), [{"n": 1}])
+            with self.assertRaises(RuntimeError):
+                writer.submit(store, "s", [{"n": 2}])
+
+    def test_write_errors_reach_the_future(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = JsonlMemoryStore(Path(tmp))
+            writer = MemoryWriter()
+            with patch.object(JsonlMemoryStore, "append_many", side_effect=OSError("disk full")):
+                future = writer.submit(store, "s", [{"n": 1}])
+                with self.assertRaises(OSError):
+                    future.result(timeout=2)
+            ok = writer.submit(store, "s", [{"n": 2}])
+            ok.result(timeout=2)
+            writer.close()
+            self.assertEqual(store.load("s"), [{"n": 2}])
+
+    def test_invalid_user_id_is_rejected_on_submit(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            writer = MemoryWriter()
+            with self.assertRaises(ValueError):
+                writer.submit(JsonlMemoryStore(Path(tmp)), "s", [{"n": 1}], user_id="../x")
+            writer.close()
+
+
+class BackgroundPersistTests(unittest.TestCase):
+    @patch("agent.core.build_model_from_env", side_effect=MockModel)
+    def test_run_once_can_return_before_persist(self, _: object) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            seed_workspace(Path(tmp) / "ws")
+            ctx = SessionContext(
+                session_id="bg",
+                enabled_skills=[],
+                memory_dir=Path(tmp) / "data",
+                workspace_base_dir=Path(tmp) / "ws",
+                await_persist=False,
+            )
+
+            async def turn_then_flush() -> None:
+                await run_once("hello", ctx)
+                await flush_memory_writes()
+
+            asyncio.run(turn_then_flush())
+            records = JsonlMemoryStore(ctx.memory_dir).load("bg")
+            self.assertEqual([r["role"] for r in records], ["user", "assistant"])
+
+    @patch("agent.core.build_model_from_env", side_effect=MockModel)
+    def test_turn_cancelled_after_submit_rehydrates_next_turn(self, _: object) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            ctx = make_ctx(Path(tmp), "cancelled", timeout=0.5)
+            real_submit = _MEMORY_WRITER.submit
+
+            def slow_submit(*args: object, **kwargs: object) -> Future:
+                real_submit(*args, **kwargs)
+                return Future()  # the caller times out waiting for it
+
+            with patch.object(_MEMORY_WRITER, "submit", side_effect=slow_submit):
+                with self.assertRaises(TimeoutError):
+                    asyncio.run(run_once("hello", ctx))
+            session = _AGENT_POOL.get(_session_key(ctx))
+            self.assertFalse(session.hydrated)
+
+            asyncio.run(run_once("again", ctx))
+            msgs = asyncio.run(session.memory.get_memory())
+            self.assertEqual([m.content for m in msgs][::2], ["hello", "again"])
+
+
+if __name__ == "__main__":
+    unittest.main()
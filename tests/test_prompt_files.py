@@ -1,15 +1,19 @@
 from __future__ import annotations
 
+import os
 import tempfile
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 
 import sys
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
 
 from agent.prompt_builder import build_sys_prompt
-from agent.prompt_files import PROMPT_FILE_NAMES, compose_prompt_context, ensure_prompt_files
+from agent.prompt_files import PROMPT_FILE_NAMES, PromptCache, compose_prompt_context, ensure_prompt_files
+
+from helpers import seed_workspace
 
 
 class PromptFilesTests(unittest.TestCase):
@@ -47,5 +51,34 @@ class PromptFilesTests(unittest.TestCase):
         self.assertIn("AVAILABLE TOOLS", rendered)
 
 
+class PromptCacheTests(unittest.TestCase):
+    def test_hit_reads_no_files_and_returns_identical_prompt(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            workspace = seed_workspace(Path(tmp), "alice")
+            cache = PromptCache()
+            first = cache.get(workspace, "tools")
+            with patch.object(Path, "read_text", side_effect=AssertionError("read")), patch.object(
+                Path, "write_text", side_effect=AssertionError("write")
+            ):
+                second = cache.get(workspace, "tools")
+            self.assertIs(second, first)
+            self.assertEqual((cache.hits, cache.misses), (1, 1))
+            self.assertIn("AVAILABLE TOOLS:\ntools", first)
+
+    def test_file_change_or_deletion_recomposes(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            workspace = seed_workspace(Path(tmp))
+            cache = PromptCache()
+            cache.get(workspace)
+            soul = workspace / "SOUL.md"
+            soul.write_text("a different soul", encoding="utf-8")
+            os.utime(soul, ns=(1, 1))
+            self.assertIn("a different soul", cache.get(workspace))
+            soul.unlink()
+            self.assertNotIn("a different soul", cache.get(workspace))
+            self.assertTrue(soul.exists())
+            self.assertEqual((cache.hits, cache.misses), (0, 3))
+
+
 if __name__ == "__main__":
     unittest.main()
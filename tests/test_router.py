@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from agent.core import _AGENT_POOL, _FAST_PATH, _session_key, chat_stream, run_once
+from agent.router import FastPathRouter, RouteResult, default_router, math_route, time_route
+from llm.client import MockModel
+from memory.jsonl_store import JsonlMemoryStore
+from runtime.session import SessionContext
+
+from helpers import PooledAgentTestCase, make_ctx
+
+
+class RouteTests(unittest.TestCase):
+    def test_time_route_only_claims_bare_time_questions(self) -> None:
+        ctx = SessionContext(session_id="r", timezone="UTC")
+        answer = time_route("What time is it?", ctx)
+        self.assertEqual(answer.route, "time")
+        self.assertIn("(UTC)", answer.text)
+        self.assertIn("UTC", time_route("现在几点了？", ctx).text)
+        self.assertIsNone(time_route("what time does the museum open", ctx))
+        self.assertIsNone(time_route("I know it", ctx))
+        self.assertIsNone(time_route("what time is it", SessionContext(session_id="r", enabled_skills=[])))
+
+    def test_math_route_only_claims_plain_arithmetic(self) -> None:
+        ctx = SessionContext(session_id="r")
+        self.assertEqual(math_route("What is 2+3*4?", ctx), RouteResult("math", "2+3*4 = 14"))
+        self.assertEqual(math_route("计算 (1+2)/3", ctx).text, "(1+2)/3 = 1.0")
+        self.assertIsNone(math_route("I paid 3+4 dollars twice, is that fair?", ctx))
+        self.assertIsNone(math_route("1/0", ctx))
+        self.assertIsNone(math_route("hello", ctx))
+
+    def test_math_route_ignores_dates_and_phone_numbers(self) -> None:
+        ctx = SessionContext(session_id="r")
+        for text in ("2024-1-5", "2024/1/5", "555-1234", "010-1234-5678", "what is 2024-1-5?"):
+            with self.subTest(text=text):
+                self.assertIsNone(math_route(text, ctx))
+        self.assertEqual(math_route("5 - 3", ctx).text, "5 - 3 = 2")
+        self.assertEqual(math_route("what is 5-3?", ctx).text, "5-3 = 2")
+
+    def test_router_uses_first_matching_route(self) -> None:
+        router = FastPathRouter({"never": lambda text, ctx: None})
+        router.register("echo", lambda text, ctx: RouteResult("echo", text))
+        self.assertEqual(router.route("hi", SessionContext(session_id="r")).route, "echo")
+        router.unregister("echo")
+        self.assertIsNone(router.route("hi", SessionContext(session_id="r")))
+        self.assertEqual(list(default_router().routes), ["time", "math"])
+
+
+class FastPathTurnTests(PooledAgentTestCase):
+    @patch("agent.core.build_model_from_env", side_effect=AssertionError("model used"))
+    def test_fast_path_skips_the_model_and_persists_the_turn(self, _: object) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            ctx = make_ctx(Path(tmp), "fast", enabled_skills=None, fast_path=True)
+            text, timings = asyncio.run(run_once("2 + 2", ctx, with_timings=True))
+            self.assertEqual(text, "2 + 2 = 4")
+            self.assertEqual(timings.path, "fast:math")
+            self.assertNotIn("setup", timings.steps)
+            self.assertEqual(
+                JsonlMemoryStore(ctx.memory_dir).load("fast"),
+                [{"role": "user", "content": "2 + 2"}, {"role": "assistant", "content": "2 + 2 = 4"}],
+            )
+
+    @patch("agent.core.build_model_from_env", side_effect=MockModel)
+    def test_stream_reports_path_and_warm_memory_stays_in_step(self, _: object) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            ctx = make_ctx(Path(tmp), "fast-stream", enabled_skills=None, fast_path=True)
+
+            async def scenario() -> tuple[list, list, int]:
+                model_turn = [event async for event in chat_stream("hello", ctx)]
+                fast_turn = [event async for event in chat_stream("what time is it", ctx)]
+                session = _AGENT_POOL.get(_session_key(ctx))
+                return model_turn, fast_turn, await session.memory.size()
+
+            model_turn, fast_turn, size = asyncio.run(scenario())
+        self.assertEqual(model_turn[-1].metadata["path"], "model")
+        self.assertEqual(fast_turn[-1].metadata["path"], "fast:time")
+        self.assertEqual([e.type for e in fast_turn], ["text", "done"])
+        self.assertEqual(size, 4)
+
+    def test_fast_path_is_opt_in(self) -> None:
+        with patch.object(_FAST_PATH, "route", side_effect=AssertionError("routed")), patch(
+            "agent.core.build_model_from_env", side_effect=MockModel
+        ), tempfile.TemporaryDirectory() as tmp:
+            text = asyncio.run(run_once("hello", make_ctx(Path(tmp), "slow", enabled_skills=[])))
+        self.assertTrue(text)
+
+
+if __name__ == "__main__":
+    unittest.main()
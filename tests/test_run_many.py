@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+from agent.core import BatchResult, run_many
+from llm.client import MockModel
+from memory.jsonl_store import JsonlMemoryStore
+from mcp_support.registry import MCPRegistrationManager
+from runtime.session import SessionContext
+
+from helpers import PooledAgentTestCase, make_ctx
+
+
+async def _collect(items: Any, concurrency: int) -> list[BatchResult]:
+    return [result async for result in run_many(items, concurrency=concurrency)]
+
+
+class RunManyTests(PooledAgentTestCase):
+    def test_concurrency_is_bounded_and_failures_are_reported(self) -> None:
+        in_flight = 0
+        peak = 0
+
+        async def fake_turn(user_text: str, ctx: SessionContext, **_: Any) -> str:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if user_text == "bad":
+                raise RuntimeError("boom")
+            return user_text.upper()
+
+        items = [(text, SessionContext(session_id=f"s{i}")) for i, text in enumerate(["a", "b", "bad", "c", "d"])]
+        with patch("agent.core._run_turn", fake_turn):
+            results = asyncio.run(_collect(items, concurrency=2))
+
+        self.assertEqual(peak, 2)
+        self.assertEqual(sorted(r.index for r in results), [0, 1, 2, 3, 4])
+        by_index = {r.index: r for r in results}
+        self.assertEqual(by_index[3].text, "C")
+        self.assertIsInstance(by_index[2].error, RuntimeError)
+        self.assertIsNone(by_index[2].text)
+
+    def test_rejects_non_positive_concurrency(self) -> None:
+        with self.assertRaises(ValueError):
+            asyncio.run(_collect([], concurrency=0))
+
+    @patch("agent.core.build_model_from_env", side_effect=MockModel)
+    def test_batch_persists_turns_and_connects_mcp_once(self, _: object) -> None:
+        connects = 0
+
+        async def fake_mcp(toolkit: object) -> MCPRegistrationManager:
+            nonlocal connects
+            connects += 1
+            return MCPRegistrationManager(client_names=[], _stateful_clients=[])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            items = [
+                ("hello", make_ctx(Path(tmp), "a")),
+                ("hello again", make_ctx(Path(tmp), "a")),
+                ("hi", make_ctx(Path(tmp), "b")),
+            ]
+            with patch("agent.core.auto_register_mcp_clients", fake_mcp):
+                results = asyncio.run(_collect(items, concurrency=3))
+
+            self.assertTrue(all(r.error is None for r in results))
+            store = JsonlMemoryStore(Path(tmp) / "data")
+            self.assertEqual(len(store.load("a")), 4)
+            self.assertEqual(len(store.load("b")), 2)
+        self.assertEqual(connects, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from agent.core import _AGENT_POOL, _session_key, run_once
+from agent.session_pool import SessionAgentPool
+from llm.client import MockModel
+from memory.jsonl_store import JsonlMemoryStore
+
+from helpers import PooledAgentTestCase, make_ctx
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _Session:
+    last_used = 0.0
+    busy = False
+
+
+class SessionAgentPoolTests(unittest.TestCase):
+    def test_lru_evicts_least_recently_used(self) -> None:
+        pool = SessionAgentPool(max_sessions=2, idle_ttl=0)
+        pool.put("a", _Session())  # type: ignore[arg-type]
+        pool.put("b", _Session())  # type: ignore[arg-type]
+        pool.get("a")
+        pool.put("c", _Session())  # type: ignore[arg-type]
+        self.assertIn("a", pool)
+        self.assertNotIn("b", pool)
+        self.assertIn("c", pool)
+
+    def test_idle_ttl_expires_sessions(self) -> None:
+        clock = _FakeClock()
+        pool = SessionAgentPool(max_sessions=8, idle_ttl=10, clock=clock)
+        pool.put("a", _Session())  # type: ignore[arg-type]
+        clock.now = 5
+        self.assertIsNotNone(pool.get("a"))
+        clock.now = 16
+        self.assertIsNone(pool.get("a"))
+        self.assertEqual(len(pool), 0)
+
+    def test_busy_sessions_are_never_evicted(self) -> None:
+        clock = _FakeClock()
+        pool = SessionAgentPool(max_sessions=1, idle_ttl=10, clock=clock)
+        busy = _Session()
+        busy.busy = True
+        pool.put("busy", busy)  # type: ignore[arg-type]
+        pool.put("b", _Session())  # type: ignore[arg-type]
+        self.assertIn("busy", pool)
+        self.assertIn("b", pool)
+        pool.put("c", _Session())  # type: ignore[arg-type]
+        self.assertNotIn("b", pool)
+        clock.now = 30
+        self.assertEqual(pool.evict_idle(), 1)
+        self.assertIs(pool.get("busy"), busy)
+        self.assertEqual(len(pool), 1)
+
+
+class RunOncePoolingTests(PooledAgentTestCase):
+    @patch("agent.core.build_model_from_env", side_effect=MockModel)
+    def test_follow_up_turn_reuses_memory_without_reloading(self, _: object) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            ctx = make_ctx(Path(tmp), "pooled")
+
+            async def two_turns() -> None:
+                await run_once("hello", ctx)
+                await run_once("tell me a joke", ctx)
+
+            with patch.object(JsonlMemoryStore, "load", autospec=True, side_effect=JsonlMemoryStore.load) as load:
+                asyncio.run(two_turns())
+            self.assertEqual(load.call_count, 1)
+
+            session = _AGENT_POOL.get(_session_key(ctx))
+            self.assertIsNotNone(session)
+            msgs = asyncio.run(session.memory.get_memory())
+            persisted = JsonlMemoryStore(ctx.memory_dir).load(ctx.session_id)
+            self.assertEqual(
+                [(m.role, m.content) for m in msgs],
+                [(r["role"], r["content"]) for r in persisted],
+            )
+            self.assertEqual(len(persisted), 4)
+
+    @patch("agent.core.build_model_from_env", side_effect=MockModel)
+    def test_external_writes_rehydrate_a_warm_session(self, _: object) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            ctx = make_ctx(Path(tmp), "pooled")
+            other_process = JsonlMemoryStore(ctx.memory_dir)
+
+            async def turns() -> list:
+                await run_once("hello", ctx)
+                other_process.append_many(ctx.session_id, [
+                    {"role": "user", "content": "from elsewhere"},
+                    {"role": "assistant", "content": "noted"},
+                ])
+                await run_once("again", ctx)
+                return await _AGENT_POOL.get(_session_key(ctx)).memory.get_memory()
+
+            msgs = asyncio.run(turns())
+            self.assertEqual([m.content for m in msgs][::2], ["hello", "from elsewhere", "again"])
+            other_process.close()
+
+    @patch("agent.core.build_model_from_env", side_effect=MockModel)
+    def test_turn_failing_before_hydration_still_reloads_external_writes(self, _: object) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            ctx = make_ctx(Path(tmp), "pooled")
+            other_process = JsonlMemoryStore(ctx.memory_dir)
+
+            async def turns() -> list:
+                await run_once("hello", ctx)
+                other_process.append_many(ctx.session_id, [
+                    {"role": "user", "content": "EXTERNAL"},
+                    {"role": "assistant", "content": "noted"},
+                ])
+                with patch("agent.core._bind_turn", side_effect=RuntimeError("bind failed")):
+                    with self.assertRaises(RuntimeError):
+                        await run_once("lost", ctx)
+                await run_once("again", ctx)
+                return await _AGENT_POOL.get(_session_key(ctx)).memory.get_memory()
+
+            msgs = asyncio.run(turns())
+            self.assertEqual([m.content for m in msgs][::2], ["hello", "EXTERNAL", "again"])
+            other_process.close()
+
+    @patch("agent.core.build_model_from_env", side_effect=MockModel)
+    def test_evicted_session_is_rehydrated_from_store(self, _: object) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            ctx = make_ctx(Path(tmp), "pooled")
+            asyncio.run(run_once("hello", ctx))
+            _AGENT_POOL.clear()
+            asyncio.run(run_once("again", ctx))
+            session = _AGENT_POOL.get(_session_key(ctx))
+            msgs = asyncio.run(session.memory.get_memory())
+            self.assertEqual([m.content for m in msgs][::2], ["hello", "again"])
+
+
+if __name__ == "__main__":
+    unittest.main()
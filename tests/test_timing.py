@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import asyncio
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from agent.core import _AGENT_POOL, _checkout_session, _prepare_turn, _session_key, chat_stream, run_once
+from agent.timing import StepTimer, TurnDeadline, TurnTimings
+from llm.client import MockModel, ModelResponse
+from memory.jsonl_store import JsonlMemoryStore
+from mcp_support.registry import MCPRegistrationManager
+from runtime.session import SessionContext
+
+from helpers import PooledAgentTestCase, make_ctx, seed_workspace
+
+
+class StepTimerTests(unittest.TestCase):
+    def test_step_records_duration_even_on_error(self) -> None:
+        ticks = iter([1.0, 3.5])
+        timer = StepTimer(clock=lambda: next(ticks))
+        with self.assertRaises(RuntimeError):
+            with timer.step("boom"):
+                raise RuntimeError("x")
+        self.assertEqual(timer.steps, {"boom": 2.5})
+
+    def test_run_times_awaitable(self) -> None:
+        timer = StepTimer()
+
+        async def work() -> int:
+            await asyncio.sleep(0.01)
+            return 7
+
+        self.assertEqual(asyncio.run(timer.run("work", work())), 7)
+        self.assertGreater(timer.steps["work"], 0)
+
+
+class TurnTimingsTests(unittest.TestCase):
+    def test_hooks_record_model_and_tool_calls(self) -> None:
+        ticks = iter([0.0, 1.0, 2.0, 2.5, 3.0, 4.5])
+        timings = TurnTimings(clock=lambda: next(ticks))
+        timings.pre_reasoning(None, {})
+        timings.post_reasoning(None, {}, None)
+        call_a = {"tool_call": {"id": "a", "name": "view_text_file"}}
+        call_b = {"tool_call": {"id": "b", "name": "write_text_file"}}
+        timings.pre_acting(None, call_a)
+        timings.pre_acting(None, call_b)
+        timings.post_acting(None, call_a, None)
+        timings.post_acting(None, call_b, None)
+        self.assertEqual(timings.model_calls, [1.0])
+        self.assertEqual(
+            timings.to_dict()["tool_calls"],
+            [{"name": "view_text_file", "seconds": 1.0}, {"name": "write_text_file", "seconds": 2.0}],
+        )
+
+
+class TurnLatencyBreakdownTests(PooledAgentTestCase):
+    @patch("agent.core.build_model_from_env", side_effect=MockModel)
+    def test_run_once_returns_timings_when_requested(self, _: object) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            ctx = make_ctx(Path(tmp), "timed", enabled_skills=["time_skill"])
+            text, timings = asyncio.run(run_once("hello", ctx, with_timings=True))
+            plain = asyncio.run(run_once("hello", ctx))
+        self.assertIsInstance(text, str)
+        self.assertIsInstance(plain, str)
+        for step in ("total", "setup", "component_build", "mcp_connect", "history_load", "memory_persist"):
+            self.assertIn(step, timings.steps)
+        self.assertEqual(len(timings.model_calls), 1)
+
+    @patch("agent.core.build_model_from_env", side_effect=MockModel)
+    def test_chat_stream_done_event_carries_timings(self, _: object) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            ctx = make_ctx(Path(tmp), "timed-stream", enabled_skills=["time_skill"])
+
+            async def collect() -> list:
+                return [event async for event in chat_stream("hello", ctx)]
+
+            events = asyncio.run(collect())
+        done = events[-1]
+        self.assertEqual(done.type, "done")
+        self.assertIn("memory_persist", done.metadata["timings"]["steps"])
+        self.assertTrue(done.metadata["timings"]["model_calls"])
+
+
+class PrepareTurnTests(PooledAgentTestCase):
+    def test_setup_steps_overlap(self) -> None:
+        delay = 0.2
+
+        async def slow_mcp(toolkit: object) -> MCPRegistrationManager:
+            await asyncio.sleep(delay)
+            return MCPRegistrationManager(client_names=[], _stateful_clients=[])
+
+        def slow_load(self: JsonlMemoryStore, session_id: str, user_id: str = "default") -> list:
+            time.sleep(delay)
+            return [{"role": "user", "content": "earlier"}]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            seed_workspace(Path(tmp) / "ws")
+            ctx = SessionContext(
+                session_id="setup",
+                enabled_skills=["time_skill"],
+                memory_dir=Path(tmp) / "data",
+                workspace_base_dir=Path(tmp) / "ws",
+            )
+            store = JsonlMemoryStore(ctx.memory_dir)
+            timer = StepTimer()
+
+            async def prepare() -> tuple:
+                session = _checkout_session(ctx)
+                with timer.step("setup"):
+                    return await _prepare_turn(ctx, session, store, timer)
+
+            with patch("agent.core.auto_register_mcp_clients", slow_mcp), patch.object(
+                JsonlMemoryStore, "load", slow_load
+            ):
+                components, _, toolkit, _, history = asyncio.run(prepare())
+
+        self.assertEqual(history, [{"role": "user", "content": "earlier"}])
+        self.assertIn("view_text_file", toolkit.tools)
+        self.assertIsNot(toolkit, components.toolkit)
+        self.assertGreaterEqual(timer.steps["mcp_connect"], delay)
+        self.assertGreaterEqual(timer.steps["history_load"], delay)
+        self.assertIn("component_build", timer.steps)
+        self.assertLess(timer.steps["setup"], 2 * delay)
+
+
+class TurnDeadlineTests(unittest.TestCase):
+    def test_remaining_and_expiry_follow_the_clock(self) -> None:
+        now = [10.0]
+        deadline = TurnDeadline(2.0, clock=lambda: now[0])
+        self.assertEqual(deadline.remaining(), 2.0)
+        now[0] = 13.0
+        self.assertEqual(deadline.remaining(), 0.0)
+        self.assertTrue(deadline.expired)
+        with self.assertRaises(TimeoutError):
+            deadline.check()
+        self.assertIsNone(TurnDeadline(None).remaining())
+        with self.assertRaises(ValueError):
+            TurnDeadline(0)
+
+    def test_run_cancels_work_past_the_budget(self) -> None:
+        cleaned_up = []
+
+        async def slow() -> None:
+            try:
+                await asyncio.sleep(5)
+            finally:
+                cleaned_up.append(True)
+
+        with self.assertRaises(TimeoutError):
+            asyncio.run(TurnDeadline(0.05).run(slow()))
+        self.assertEqual(cleaned_up, [True])
+
+
+class _SlowModel:
+    stream = False
+    model_name = "slow"
+    cancelled = 0
+
+    async def __call__(self, prompt: object, **kwargs: object) -> ModelResponse:
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            type(self).cancelled += 1
+            raise
+        return ModelResponse([{"type": "text", "text": "late"}])
+
+
+class TurnCancellationTests(PooledAgentTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        _SlowModel.cancelled = 0
+
+    def _fake_mcp(self, closed: list[bool]):
+        async def connect(toolkit: object) -> MCPRegistrationManager:
+            manager = MCPRegistrationManager(client_names=[], _stateful_clients=[])
+
+            async def close() -> None:
+                closed.append(True)
+
+            manager.close = close  # type: ignore[method-assign]
+            return manager
+
+        return connect
+
+    @patch("agent.core.build_model_from_env", side_effect=_SlowModel)
+    def test_run_once_times_out_without_persisting(self, _: object) -> None:
+        closed: list[bool] = []
+        with tempfile.TemporaryDirectory() as tmp:
+            ctx = make_ctx(Path(tmp), "deadline", enabled_skills=["time_skill"])
+            ctx.timeout = 0.2
+            start = time.perf_counter()
+            with patch("agent.core.auto_register_mcp_clients", self._fake_mcp(closed)):
+                with self.assertRaises(TimeoutError):
+                    asyncio.run(run_once("hello", ctx))
+            self.assertLess(time.perf_counter() - start, 2)
+            self.assertEqual(JsonlMemoryStore(ctx.memory_dir).load("deadline"), [])
+        self.assertEqual(_SlowModel.cancelled, 1)
+        self.assertEqual(closed, [True])
+
+    @patch("agent.core.build_model_from_env", side_effect=_SlowModel)
+    def test_abandoned_stream_cancels_the_turn(self, _: object) -> None:
+        closed: list[bool] = []
+        with tempfile.TemporaryDirectory() as tmp:
+            ctx = make_ctx(Path(tmp), "abandoned", enabled_skills=["time_skill"])
+
+            async def first_event_then_stop() -> str:
+                stream = chat_stream("hello", ctx)
+                event = await stream.__anext__()
+                await stream.aclose()
+                return event.type
+
+            with patch("agent.core.auto_register_mcp_clients", self._fake_mcp(closed)):
+                self.assertEqual(asyncio.run(first_event_then_stop()), "thinking")
+            self.assertEqual(JsonlMemoryStore(ctx.memory_dir).load("abandoned"), [])
+            session = _AGENT_POOL.get(_session_key(ctx))
+            self.assertEqual(asyncio.run(session.memory.size()), 0)
+        self.assertEqual(_SlowModel.cancelled, 1)
+        self.assertEqual(closed, [True])
+
+
+if __name__ == "__main__":
+    unittest.main()
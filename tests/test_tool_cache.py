@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from agentscope.message import TextBlock
+from agentscope.tool import ToolResponse, Toolkit, view_text_file
+
+from agent.tool_cache import ToolResultCache, file_args_key
+
+
+def _toolkit(cache: ToolResultCache, calls: list[str]) -> Toolkit:
+    def double(value: int) -> ToolResponse:
+        """Double a number.
+
+        Args:
+            value (int): The number.
+        """
+        calls.append("double")
+        return ToolResponse(content=[TextBlock(type="text", text=str(value * 2))])
+
+    toolkit = Toolkit()
+    toolkit.register_tool_function(double)
+    toolkit.register_tool_function(view_text_file)
+    toolkit.register_middleware(cache.middleware)
+    return toolkit
+
+
+async def _call(toolkit: Toolkit, name: str, **args: object) -> str:
+    last = None
+    async for chunk in await toolkit.call_tool_function(
+        {"type": "tool_use", "id": "1", "name": name, "input": args}
+    ):
+        last = chunk
+    return last.content[0]["text"]
+
+
+class ToolResultCacheTests(unittest.TestCase):
+    def test_only_marked_tools_are_cached_and_shared_across_toolkits(self) -> None:
+        cache = ToolResultCache()
+        calls: list[str] = []
+        first, second = _toolkit(cache, calls), _toolkit(cache, calls)
+
+        self.assertEqual(asyncio.run(_call(first, "double", value=2)), "4")
+        self.assertEqual(asyncio.run(_call(second, "double", value=2)), "4")
+        self.assertEqual(calls, ["double", "double"])
+
+        cache.mark_cacheable("double")
+        asyncio.run(_call(first, "double", value=3))
+        self.assertEqual(asyncio.run(_call(second, "double", value=3)), "6")
+        self.assertEqual(calls, ["double", "double", "double"])
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_ttl_and_lru_bound(self) -> None:
+        now = [0.0]
+        cache = ToolResultCache(max_entries=2, ttl=10.0, clock=lambda: now[0])
+        cache.mark_cacheable("double")
+        calls: list[str] = []
+        toolkit = _toolkit(cache, calls)
+        for value in (1, 2, 3):
+            asyncio.run(_call(toolkit, "double", value=value))
+        self.assertEqual(len(cache), 2)
+        asyncio.run(_call(toolkit, "double", value=1))
+        self.assertEqual(len(calls), 4)
+
+        now[0] = 11.0
+        asyncio.run(_call(toolkit, "double", value=1))
+        self.assertEqual(len(calls), 5)
+
+    def test_file_reads_are_keyed_by_mtime(self) -> None:
+        cache = ToolResultCache()
+        cache.mark_cacheable("view_text_file", file_args_key("file_path"))
+        toolkit = _toolkit(cache, [])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "note.txt"
+            path.write_text("v1", encoding="utf-8")
+            self.assertIn("v1", asyncio.run(_call(toolkit, "view_text_file", file_path=str(path))))
+            self.assertIn("v1", asyncio.run(_call(toolkit, "view_text_file", file_path=str(path))))
+            self.assertEqual(cache.hits, 1)
+
+            path.write_text("v2!", encoding="utf-8")
+            os.utime(path, ns=(1, 1))
+            self.assertIn("v2", asyncio.run(_call(toolkit, "view_text_file", file_path=str(path))))
+            self.assertEqual(cache.hits, 1)
+
+            missing = str(Path(tmp) / "missing.txt")
+            asyncio.run(_call(toolkit, "view_text_file", file_path=missing))
+            asyncio.run(_call(toolkit, "view_text_file", file_path=missing))
+            self.assertEqual(len(cache), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import asyncio
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+from agentscope.agent import ReActAgent
+from agentscope.formatter import OpenAIChatFormatter
+from agentscope.memory import InMemoryMemory
+from agentscope.message import Msg, TextBlock
+from agentscope.tool import ToolResponse, Toolkit
+
+from agent.core import _AGENT_POOL, _session_key, run_once
+from agent.tool_concurrency import concurrency_limiter, offload_sync_tools, order_tool_results
+from llm.client import MockModel, ModelResponse
+
+from helpers import make_ctx
+
+
+class _ScriptedModel:
+    stream = False
+
+    def __init__(self, calls: list[str]) -> None:
+        self.calls = calls
+        self.model_name = "scripted"
+        self.steps = 0
+
+    async def __call__(self, prompt: Any, **kwargs: Any) -> ModelResponse:
+        self.steps += 1
+        if self.steps == 1:
+            return ModelResponse(
+                [
+                    {"type": "tool_use", "id": f"call-{i}", "name": name, "input": {}}
+                    for i, name in enumerate(self.calls)
+                ]
+            )
+        return ModelResponse([{"type": "text", "text": "done"}])
+
+
+async def slow_async() -> ToolResponse:
+    """Slow async lookup."""
+    await asyncio.sleep(0.2)
+    return ToolResponse(content=[TextBlock(type="text", text="async")])
+
+
+def slow_sync() -> ToolResponse:
+    """Slow blocking lookup."""
+    time.sleep(0.2)
+    return ToolResponse(content=[TextBlock(type="text", text=threading.current_thread().name)])
+
+
+async def fast_async() -> ToolResponse:
+    """Fast lookup."""
+    return ToolResponse(content=[TextBlock(type="text", text="fast")])
+
+
+def _agent(limit: int) -> ReActAgent:
+    toolkit = Toolkit()
+    for fn in (slow_async, slow_sync, fast_async):
+        toolkit.register_tool_function(fn)
+    offload_sync_tools(toolkit)
+    toolkit.register_middleware(concurrency_limiter(limit))
+    agent = ReActAgent(
+        name="Tilo",
+        sys_prompt="test",
+        model=_ScriptedModel(["slow_async", "slow_sync", "fast_async"]),
+        formatter=OpenAIChatFormatter(),
+        toolkit=toolkit,
+        memory=InMemoryMemory(),
+        parallel_tool_calls=limit > 1,
+    )
+    agent.register_instance_hook("pre_reasoning", "tool_order", order_tool_results)
+    return agent
+
+
+def _result_ids(memory: InMemoryMemory) -> list[str]:
+    ids = []
+    for msg, _ in memory.content:
+        for block in msg.get_content_blocks("tool_result"):
+            ids.append(block["id"])
+    return ids
+
+
+class ToolConcurrencyTests(unittest.TestCase):
+    def _run(self, limit: int) -> tuple[float, ReActAgent]:
+        agent = _agent(limit)
+        start = time.perf_counter()
+        asyncio.run(agent(Msg(name="user", content="go", role="user")))
+        return time.perf_counter() - start, agent
+
+    def test_tool_calls_overlap_and_results_keep_call_order(self) -> None:
+        elapsed, agent = self._run(limit=4)
+        self.assertLess(elapsed, 0.35)
+        self.assertEqual(_result_ids(agent.memory), ["call-0", "call-1", "call-2"])
+        sync_output = [
+            block["output"][0]["text"]
+            for msg, _ in agent.memory.content
+            for block in msg.get_content_blocks("tool_result")
+            if block["name"] == "slow_sync"
+        ]
+        self.assertNotEqual(sync_output, ["MainThread"])
+
+    def test_limit_of_one_runs_sequentially(self) -> None:
+        elapsed, agent = self._run(limit=1)
+        self.assertGreaterEqual(elapsed, 0.4)
+        self.assertEqual(_result_ids(agent.memory), ["call-0", "call-1", "call-2"])
+
+    @patch("agent.core.build_model_from_env", side_effect=MockModel)
+    def test_pooled_agents_call_tools_in_parallel_only_when_opted_in(self, _: object) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            for session_id, kwargs, parallel in (("default", {}, False), ("opted-in", {"tool_concurrency": 3}, True)):
+                ctx = make_ctx(Path(tmp), session_id, **kwargs)
+                asyncio.run(run_once("hello", ctx))
+                self.assertIs(_AGENT_POOL.get(_session_key(ctx)).agent.parallel_tool_calls, parallel)
+
+    def test_limiter_rejects_non_positive_limit(self) -> None:
+        with self.assertRaises(ValueError):
+            concurrency_limiter(0)
+
+
+if __name__ == "__main__":
+    unittest.main()